@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authentication'
+
+    def ready(self):
+        import apps.authentication.signals
+        from .tokens import check_stateless_auth_settings
+
+        check_stateless_auth_settings()
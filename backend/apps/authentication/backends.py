@@ -0,0 +1,213 @@
+"""
+JWT authentication that loads the user with its staff profile and role,
+or, with JWT_STATELESS_AUTH, authorizes from the token claims alone.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .tokens import (
+    PERMISSIONS_CLAIM,
+    ROLE_CLAIM,
+    STAFF_ROLE_CLAIM,
+    TOKEN_VERSION_CLAIM,
+    cached_token_version,
+    publish_token_versions,
+)
+
+
+# What request.user needs for authorization checks; other fields of a
+# cached user load from the database on first use.
+CACHED_USER_FIELDS = ('id', 'email', 'role', 'is_active', 'is_staff', 'is_superuser', 'token_version')
+CACHED_STAFF_FIELDS = ('id', 'user_id', 'role_id', 'is_active')
+CACHED_ROLE_FIELDS = ('id', 'name', 'is_active')
+
+
+def user_cache_key(user_id, token_version):
+    return f'auth-user:{user_id}:{token_version}'
+
+
+def invalidate_cached_users(versions):
+    """Drop cached users, given as {user_id: token_version}, now and again once the transaction commits."""
+    keys = [user_cache_key(user_id, token_version) for user_id, token_version in versions.items()]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _field_values(instance, fields):
+    return [getattr(instance, field) for field in fields]
+
+
+def dump_cached_user(user):
+    """Reduce a user loaded with staff_profile__role to plain values."""
+    try:
+        staff = user.staff_profile
+    except ObjectDoesNotExist:
+        staff = None
+    role = staff.role if staff is not None else None
+    return (
+        _field_values(user, CACHED_USER_FIELDS),
+        _field_values(staff, CACHED_STAFF_FIELDS) if staff is not None else None,
+        _field_values(role, CACHED_ROLE_FIELDS) if role is not None else None,
+    )
+
+
+def _from_values(model, fields, values):
+    # from_db() expects the loaded fields in model field order.
+    data = dict(zip(fields, values))
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in data]
+    return model.from_db(None, names, [data[name] for name in names])
+
+
+def load_cached_user(user_model, values):
+    """Rebuild a user from dump_cached_user() output, as if loaded with .only()."""
+    from apps.users.models import Role, StaffUser
+
+    user_values, staff_values, role_values = values
+    user = _from_values(user_model, CACHED_USER_FIELDS, user_values)
+    staff = None
+    if staff_values is not None:
+        staff = _from_values(StaffUser, CACHED_STAFF_FIELDS, staff_values)
+        StaffUser.user.field.set_cached_value(staff, user)
+        StaffUser.role.field.set_cached_value(
+            staff, _from_values(Role, CACHED_ROLE_FIELDS, role_values) if role_values is not None else None
+        )
+    user_model.staff_profile.related.set_cached_value(user, staff)
+    return user
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    request.user built from token claims.
+
+    Identity, role and staff permissions come from the token. Anything
+    else, including using it in a query or comparing it to a model,
+    loads the real user on first use.
+    """
+    is_authenticated = True
+    is_anonymous = False
+    # Only built while the token's version is current, and deactivating a
+    # user bumps the version.
+    is_active = True
+
+    def __init__(self, token, load_user):
+        super().__init__(load_user)
+        self.__dict__['_token'] = token
+
+    def __bool__(self):
+        return True
+
+    @property
+    def pk(self):
+        return self._token[api_settings.USER_ID_CLAIM]
+
+    id = pk
+
+    @property
+    def role(self):
+        return self._token[ROLE_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == 'ADMIN'
+
+    @property
+    def is_wholesaler(self):
+        return self.role == 'WHOLESALER'
+
+    @property
+    def is_consumer(self):
+        return self.role == 'CONSUMER'
+
+    @property
+    def staff_role(self):
+        return self._token.get(STAFF_ROLE_CLAIM)
+
+    @property
+    def token_permissions(self):
+        return frozenset(self._token.get(PERMISSIONS_CLAIM, ()))
+
+
+class PreloadedUserJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that fetches the user, staff_profile and role in one
+    joined query, so role and staff checks later in the request are free.
+
+    With AUTH_USER_CACHE_SECONDS > 0 the fields authorization needs
+    (CACHED_USER_FIELDS and the staff profile's role, never the password
+    hash) are also cached by user id and token version, so tokens issued
+    after a version bump never read an entry built for older ones. Bumping
+    the version and saving or deleting a User drop the affected entries;
+    other changes made with queryset.update() show up once the TTL runs
+    out.
+
+    Tokens whose version (see apps.authentication.tokens) is older than
+    the user's are refused. With JWT_STATELESS_AUTH, tokens that carry
+    authorization claims give a ClaimsUser and skip the user lookup when
+    the shared cache confirms their version; when it does not know the
+    version, the user is loaded from the database as usual.
+    """
+
+    def get_user(self, validated_token):
+        if getattr(settings, 'JWT_STATELESS_AUTH', False) and TOKEN_VERSION_CLAIM in validated_token:
+            current = cached_token_version(validated_token)
+            if current is None:
+                user = self.get_database_user(validated_token)
+                publish_token_versions({user.pk: user.token_version}, only_missing=True)
+                return user
+            if current != validated_token[TOKEN_VERSION_CLAIM]:
+                raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+            return ClaimsUser(validated_token, lambda: self.get_database_user(validated_token))
+
+        return self.get_database_user(validated_token)
+
+    def get_database_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        user = self.load_user(user_id, validated_token.get(TOKEN_VERSION_CLAIM))
+        if user is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if getattr(api_settings, 'CHECK_REVOKE_TOKEN', False):
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+        token_version = validated_token.get(TOKEN_VERSION_CLAIM)
+        if token_version is not None and token_version != user.token_version:
+            raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+        return user
+
+    def load_user(self, user_id, token_version=None):
+        timeout = getattr(settings, 'AUTH_USER_CACHE_SECONDS', 0)
+        # Keyed by token version too, so a revoked token never finds an entry.
+        use_cache = timeout > 0 and token_version is not None
+        key = user_cache_key(user_id, token_version)
+        if use_cache:
+            values = cache.get(key)
+            if values is not None:
+                return load_cached_user(self.user_model, values)
+
+        user = (
+            self.user_model.objects
+            .select_related('staff_profile__role')
+            .filter(**{api_settings.USER_ID_FIELD: user_id})
+            .first()
+        )
+        if user is not None and use_cache and user.token_version == token_version:
+            cache.set(key, dump_cached_user(user), timeout)
+        return user
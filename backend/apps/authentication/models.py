@@ -46,3 +46,17 @@ class OTP(TimeStampedModel):
     def is_valid(self):
         """Check if OTP is still valid."""
         return not self.is_used and timezone.now() < self.expires_at
+
+
+class RevokedToken(models.Model):
+    """Refresh token (by jti) that must not be used again before it expires."""
+    
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'revoked_tokens'
+    
+    def __str__(self):
+        return self.jti
@@ -1,8 +1,12 @@
 """Authentication serializers."""
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 from core.utils import format_phone_number
+from .tokens import TOKEN_VERSION_CLAIM, add_authorization_claims, is_refresh_token_revoked, revoke_refresh_token
 
 User = get_user_model()
 
@@ -10,6 +14,10 @@ User = get_user_model()
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Custom JWT token serializer with user details."""
     
+    @classmethod
+    def get_token(cls, user):
+        return add_authorization_claims(super().get_token(user), user)
+    
     def validate(self, attrs):
         data = super().validate(attrs)
         
@@ -27,6 +35,56 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer that rejects revoked or outdated refresh tokens and
+    issues tokens carrying the user's current authorization claims.
+    """
+    
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if is_refresh_token_revoked(refresh):
+            raise TokenError('Token has been revoked')
+        
+        user = (
+            User.objects
+            .select_related('staff_profile__role')
+            .filter(**{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)})
+            .first()
+        )
+        if user is None or not user.is_active:
+            raise TokenError('User not found or inactive')
+        if refresh.get(TOKEN_VERSION_CLAIM, user.token_version) != user.token_version:
+            raise TokenError('Token has been revoked')
+        
+        data = super().validate(attrs)
+        
+        access = refresh.access_token_class(data['access'])
+        data['access'] = str(add_authorization_claims(access, user))
+        if 'refresh' in data:
+            rotated = RefreshToken(data['refresh'])
+            data['refresh'] = str(add_authorization_claims(rotated, user))
+            revoke_refresh_token(refresh)
+        
+        return data
+
+
+class LogoutSerializer(serializers.Serializer):
+    """Serializer for the refresh token a client logs out with."""
+    
+    refresh = serializers.CharField(required=True)
+    
+    def validate_refresh(self, value):
+        try:
+            refresh = RefreshToken(value)
+        except TokenError:
+            raise serializers.ValidationError("Invalid or expired refresh token")
+        user = self.context['request'].user
+        if str(refresh.get(api_settings.USER_ID_CLAIM)) != str(getattr(user, api_settings.USER_ID_FIELD)):
+            raise serializers.ValidationError("Refresh token belongs to another user")
+        return refresh
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     """Serializer for user registration."""
     
@@ -0,0 +1,62 @@
+"""
+Signals that drop cached authenticated users when their data changes and
+bump token versions when what a user may do changes.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.users.models import Permission, Role, StaffUser, User
+from .backends import invalidate_cached_users
+from .tokens import bump_token_versions
+
+AUTHORIZATION_FIELDS = ('role', 'is_active')
+
+
+def _role_user_ids(role_id):
+    return list(StaffUser.objects.filter(role_id=role_id).values_list('user_id', flat=True))
+
+
+@receiver(pre_save, sender=User)
+def remember_user_authorization(sender, instance, update_fields=None, **kwargs):
+    instance._previous_authorization = None
+    if instance.pk is None:
+        return
+    if update_fields is not None and not set(AUTHORIZATION_FIELDS) & set(update_fields):
+        return
+    instance._previous_authorization = (
+        User.objects.filter(pk=instance.pk).values_list(*AUTHORIZATION_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    invalidate_cached_users({instance.pk: instance.token_version})
+
+
+@receiver(post_save, sender=User)
+def bump_user_token_version(sender, instance, created=False, **kwargs):
+    previous = getattr(instance, '_previous_authorization', None)
+    if created or previous is None:
+        return
+    if previous != tuple(getattr(instance, field) for field in AUTHORIZATION_FIELDS):
+        versions = bump_token_versions([instance.pk])
+        instance.token_version = versions.get(instance.pk, instance.token_version)
+
+
+@receiver(post_save, sender=StaffUser)
+@receiver(post_delete, sender=StaffUser)
+def invalidate_staff_user(sender, instance, **kwargs):
+    bump_token_versions([instance.user_id])
+
+
+@receiver(post_save, sender=Role)
+@receiver(pre_delete, sender=Role)
+def invalidate_role_staff(sender, instance, **kwargs):
+    bump_token_versions(_role_user_ids(instance.pk))
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def invalidate_permission_staff(sender, instance, **kwargs):
+    bump_token_versions(_role_user_ids(instance.role_id))
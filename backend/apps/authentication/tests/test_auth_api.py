@@ -1,8 +1,18 @@
 import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-from apps.users.models import User
+from apps.users.models import User, Role, Permission, StaffUser
+from apps.authentication.backends import ClaimsUser, PreloadedUserJWTAuthentication, user_cache_key
+from apps.authentication.tokens import check_stateless_auth_settings, tokens_for_user
+from core.permissions import has_resource_permission
 from apps.authentication.models import OTP
 
 
@@ -84,3 +94,264 @@ def test_password_reset(api_client):
     }
     response = api_client.post(confirm_url, payload, format='json')
     assert response.status_code == 200
+
+
+@pytest.fixture()
+def staff_user(db):
+    user = User.objects.create_user(email='staff@test.com', password='staffpass123', first_name='Staff')
+    StaffUser.objects.create(user=user, role=Role.objects.create(name='SUPPORT'))
+    # Creating the staff profile bumped the token version.
+    user.refresh_from_db()
+    return user
+
+
+@pytest.mark.django_db
+def test_jwt_authentication_preloads_staff_profile_and_role(staff_user, django_assert_num_queries):
+    backend = PreloadedUserJWTAuthentication()
+    consumer = User.objects.create_user(email='plain@test.com', first_name='Plain')
+
+    with django_assert_num_queries(1):
+        user = backend.get_user(AccessToken.for_user(staff_user))
+    with django_assert_num_queries(0):
+        assert user.staff_profile.role.name == 'SUPPORT'
+
+    with django_assert_num_queries(1):
+        user = backend.get_user(AccessToken.for_user(consumer))
+    with django_assert_num_queries(0):
+        assert not hasattr(user, 'staff_profile')
+
+
+@pytest.mark.django_db
+@override_settings(AUTH_USER_CACHE_SECONDS=60)
+def test_jwt_authentication_user_cache_is_invalidated_on_save(staff_user, django_assert_num_queries):
+    cache.clear()
+    backend = PreloadedUserJWTAuthentication()
+    token = tokens_for_user(staff_user).access_token
+
+    backend.get_user(token)
+    with django_assert_num_queries(0):
+        assert backend.get_user(token).staff_profile.role.name == 'SUPPORT'
+
+    staff_user.first_name = 'Renamed'
+    staff_user.save()
+    with django_assert_num_queries(1):
+        backend.get_user(token)
+
+    staff_user.is_active = False
+    staff_user.save()
+    with pytest.raises(AuthenticationFailed):
+        backend.get_user(token)
+
+
+@pytest.mark.django_db
+@override_settings(AUTH_USER_CACHE_SECONDS=60)
+def test_jwt_authentication_user_cache_holds_only_authorization_fields(staff_user, django_assert_num_queries):
+    cache.clear()
+    backend = PreloadedUserJWTAuthentication()
+    token = tokens_for_user(staff_user).access_token
+    backend.get_user(token)
+
+    cached = cache.get(user_cache_key(staff_user.pk, staff_user.token_version))
+    assert cached is not None
+    assert staff_user.password not in repr(cached)
+
+    with django_assert_num_queries(0):
+        user = backend.get_user(token)
+        assert (user.pk, user.role, user.is_active) == (staff_user.pk, staff_user.role, True)
+        assert user.staff_profile.role.name == 'SUPPORT'
+    # The remaining fields load together, on first use.
+    with django_assert_num_queries(1):
+        assert (user.first_name, user.phone, user.check_password('staffpass123')) == ('Staff', None, True)
+
+    # Bumping the token version drops the entry its tokens would read.
+    StaffUser.objects.filter(user=staff_user).delete()
+    with django_assert_num_queries(1), pytest.raises(AuthenticationFailed):
+        backend.get_user(token)
+
+
+@pytest.mark.django_db
+def test_bearer_token_authenticates_api_requests(api_client):
+    admin = User.objects.create_superuser(email='admin@test.com', password='adminpass123', first_name='Admin')
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(admin)}')
+    response = api_client.get(reverse('user-list'))
+    assert response.status_code == 200
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(email='admin@test.com', password='adminpass123', first_name='Admin')
+
+
+def users_table_queries(queries):
+    return [query['sql'] for query in queries if 'FROM "users"' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_login_tokens_carry_authorization_claims(api_client, staff_user):
+    Permission.objects.create(role=staff_user.staff_profile.role, resource='ORDERS', action='VIEW')
+
+    response = api_client.post(
+        reverse('token_obtain_pair'), {'email': 'staff@test.com', 'password': 'staffpass123'}, format='json'
+    )
+    assert response.status_code == 200
+    token = AccessToken(response.data['access'])
+    assert token['role'] == 'CONSUMER'
+    assert token['staff_role'] == 'SUPPORT'
+    assert token['perms'] == ['ORDERS:VIEW']
+    assert token['tv'] == User.objects.get(pk=staff_user.pk).token_version
+
+
+@pytest.mark.django_db
+@override_settings(JWT_STATELESS_AUTH=True)
+def test_stateless_auth_authorizes_from_claims_without_loading_user(api_client, admin_user, staff_user):
+    cache.clear()
+    Permission.objects.create(role=staff_user.staff_profile.role, resource='ORDERS', action='VIEW')
+    staff_user.refresh_from_db()
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(admin_user).access_token}')
+    # The first request misses the cache, loads the user and publishes its token version.
+    assert api_client.get(reverse('role-list')).status_code == 200
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse('role-list'))
+    assert response.status_code == 200
+    assert users_table_queries(queries.captured_queries) == []
+
+    staff_token = tokens_for_user(staff_user).access_token
+    PreloadedUserJWTAuthentication().get_user(staff_token)
+    staff = PreloadedUserJWTAuthentication().get_user(staff_token)
+    assert isinstance(staff, ClaimsUser)
+    with CaptureQueriesContext(connection) as queries:
+        assert has_resource_permission(staff, 'ORDERS', 'VIEW')
+        assert not has_resource_permission(staff, 'ORDERS', 'DELETE')
+    assert queries.captured_queries == []
+    # Anything beyond the claims loads the real user.
+    assert staff.email == 'staff@test.com'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('stateless', [False, True])
+def test_deactivation_and_role_changes_revoke_issued_tokens(api_client, admin_user, stateless):
+    cache.clear()
+    wholesaler = User.objects.create_user(
+        email='wholesaler@test.com', password='wholesalerpass123', first_name='Whole', role='WHOLESALER'
+    )
+    old_access = str(tokens_for_user(wholesaler).access_token)
+    api_client.force_authenticate(admin_user)
+
+    with override_settings(JWT_STATELESS_AUTH=stateless):
+        response = api_client.post(reverse('user-toggle-active', args=[wholesaler.pk]))
+        assert response.status_code == 200
+        assert response.data['is_active'] is False
+        api_client.post(reverse('user-toggle-active', args=[wholesaler.pk]))
+
+        api_client.force_authenticate(None)
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {old_access}')
+        assert api_client.get(reverse('user-me')).status_code == 401
+
+        wholesaler.refresh_from_db()
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(wholesaler).access_token}')
+        assert api_client.get(reverse('user-me')).status_code == 200
+
+        wholesaler.role = 'CONSUMER'
+        wholesaler.save()
+        assert api_client.get(reverse('user-me')).status_code == 401
+
+
+@pytest.mark.django_db
+def test_logout_revokes_only_the_presented_refresh_token(api_client, staff_user):
+    refresh = tokens_for_user(staff_user)
+    other_session = tokens_for_user(staff_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    response = api_client.post(reverse('logout'), {'refresh': str(other_session)[:-2]}, format='json')
+    assert response.status_code == 400
+    assert api_client.post(reverse('logout'), {'refresh': str(refresh)}, format='json').status_code == 200
+
+    api_client.credentials()
+    response = api_client.post(reverse('token_refresh'), {'refresh': str(refresh)}, format='json')
+    assert response.status_code == 401
+    response = api_client.post(reverse('token_refresh'), {'refresh': str(other_session)}, format='json')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_logout_rejects_another_users_refresh_token(api_client, staff_user, admin_user):
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(staff_user).access_token}')
+    victim = tokens_for_user(admin_user)
+    response = api_client.post(reverse('logout'), {'refresh': str(victim)}, format='json')
+    assert response.status_code == 400
+
+    api_client.credentials()
+    response = api_client.post(reverse('token_refresh'), {'refresh': str(victim)}, format='json')
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('stateless', [False, True])
+def test_logout_all_revokes_every_token_of_the_user(api_client, staff_user, stateless):
+    cache.clear()
+    refresh = tokens_for_user(staff_user)
+    other_session = tokens_for_user(staff_user).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    with override_settings(JWT_STATELESS_AUTH=stateless):
+        assert api_client.get(reverse('user-me')).status_code == 200
+        assert api_client.post(reverse('logout_all')).status_code == 200
+        assert api_client.get(reverse('user-me')).status_code == 401
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {other_session}')
+        assert api_client.get(reverse('user-me')).status_code == 401
+
+    api_client.credentials()
+    response = api_client.post(reverse('token_refresh'), {'refresh': str(refresh)}, format='json')
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+@override_settings(JWT_STATELESS_AUTH=True)
+def test_stateless_auth_falls_back_to_database_on_a_cold_cache(
+    api_client, admin_user, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens_for_user(admin_user).access_token}')
+    assert api_client.get(reverse('role-list')).status_code == 200
+
+    # Another worker demotes the admin; this worker's cache never hears of it.
+    with django_capture_on_commit_callbacks(execute=True):
+        admin_user.role = 'CONSUMER'
+        admin_user.save()
+    cache.clear()
+
+    assert api_client.get(reverse('role-list')).status_code == 401
+
+
+def test_stateless_auth_requires_a_shared_cache():
+    with override_settings(JWT_STATELESS_AUTH=True):
+        with pytest.raises(ImproperlyConfigured):
+            check_stateless_auth_settings()
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}):
+            check_stateless_auth_settings()
+    check_stateless_auth_settings()
+
+
+@pytest.mark.django_db
+def test_refresh_reissues_current_claims_and_rejects_outdated_tokens(api_client, staff_user):
+    cache.clear()
+    refresh = str(tokens_for_user(staff_user))
+    Permission.objects.create(role=staff_user.staff_profile.role, resource='REPORTS', action='VIEW')
+
+    # Granting the permission bumped the version, so the old refresh token is refused.
+    response = api_client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+    assert response.status_code == 401
+
+    staff_user.refresh_from_db()
+    refresh = str(tokens_for_user(staff_user))
+    response = api_client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+    assert response.status_code == 200
+    access = AccessToken(response.data['access'])
+    assert access['perms'] == ['REPORTS:VIEW']
+    assert access['tv'] == staff_user.token_version
+    assert RefreshToken(response.data['refresh'])['perms'] == ['REPORTS:VIEW']
+
+    # With rotation on, the refresh token just used cannot be used again.
+    response = api_client.post(reverse('token_refresh'), {'refresh': refresh}, format='json')
+    assert response.status_code == 401
@@ -0,0 +1,145 @@
+"""
+Authorization claims, per-user token versions and token revocation.
+
+Tokens carry the user's role, staff role, staff permissions and token
+version, so JWT_STATELESS_AUTH can authorize requests without loading
+the user. Changing a user's role, active flag or staff grants, or
+logging out everywhere, bumps User.token_version, which is the source of truth.
+The current version is also kept in the shared cache for one
+access-token lifetime; stateless checks that miss the cache load the
+user from the database instead of trusting the token. Refresh tokens
+rotated out are recorded in the database and refused by the refresh
+endpoint, as are refresh tokens a client logs out with.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.permissions import get_permission_matrix
+
+ROLE_CLAIM = 'role'
+STAFF_ROLE_CLAIM = 'staff_role'
+PERMISSIONS_CLAIM = 'perms'
+TOKEN_VERSION_CLAIM = 'tv'
+
+
+def authorization_claims(user):
+    """Claims describing what `user` may do, as embedded in its tokens."""
+    try:
+        staff_profile = user.staff_profile
+    except ObjectDoesNotExist:
+        staff_profile = None
+
+    staff_role = None
+    permissions = []
+    if staff_profile is not None and staff_profile.is_active and staff_profile.role_id:
+        staff_role = staff_profile.role.name
+        grants = get_permission_matrix().grants.get(staff_profile.role_id, ())
+        permissions = sorted(f'{resource}:{action}' for resource, action in grants)
+
+    return {
+        ROLE_CLAIM: user.role,
+        STAFF_ROLE_CLAIM: staff_role,
+        PERMISSIONS_CLAIM: permissions,
+        TOKEN_VERSION_CLAIM: user.token_version,
+    }
+
+
+def add_authorization_claims(token, user):
+    for claim, value in authorization_claims(user).items():
+        token[claim] = value
+    return token
+
+
+def tokens_for_user(user):
+    """RefreshToken for `user` with authorization claims; its access token inherits them."""
+    return add_authorization_claims(RefreshToken.for_user(user), user)
+
+
+def _token_version_key(user_id):
+    return f'token-version:{user_id}'
+
+
+def publish_token_versions(versions, only_missing=False):
+    """
+    Make token versions visible to stateless checks for one access-token lifetime.
+
+    only_missing fills in versions read from the database without
+    overwriting a newer one a concurrent bump has just published.
+    """
+    timeout = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    if only_missing:
+        for user_id, version in versions.items():
+            cache.add(_token_version_key(user_id), version, timeout)
+        return
+    cache.set_many({_token_version_key(user_id): version for user_id, version in versions.items()}, timeout)
+
+
+def bump_token_versions(user_ids):
+    """Invalidate every token issued so far to these users."""
+    from apps.users.models import User
+    from .backends import invalidate_cached_users
+
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+    users = User.objects.filter(pk__in=user_ids)
+    users.update(token_version=F('token_version') + 1)
+    versions = dict(users.values_list('pk', 'token_version'))
+    # Cached users are keyed by the version their token carries.
+    invalidate_cached_users({user_id: version - 1 for user_id, version in versions.items()})
+    # Forget the old versions now and publish the new ones on commit; until
+    # then stateless checks miss the cache and fall back to the database.
+    cache.delete_many([_token_version_key(user_id) for user_id in user_ids])
+    transaction.on_commit(lambda: publish_token_versions(versions))
+    return versions
+
+
+def cached_token_version(token):
+    """The user's current token version as published in the cache, or None if it is not there."""
+    return cache.get(_token_version_key(token.get(api_settings.USER_ID_CLAIM)))
+
+
+def shared_cache_configured():
+    """True unless the default cache lives in process memory (or nowhere)."""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def check_stateless_auth_settings():
+    """
+    Refuse JWT_STATELESS_AUTH without a shared cache.
+
+    Stateless checks learn about bumped token versions through the cache,
+    so with a per-process cache a user demoted or deactivated in one worker
+    would keep using old tokens in the others.
+    """
+    if getattr(settings, 'JWT_STATELESS_AUTH', False) and not shared_cache_configured():
+        raise ImproperlyConfigured('JWT_STATELESS_AUTH needs a shared cache; set CACHE_URL.')
+
+
+def revoke_refresh_token(token):
+    """Refuse `token` at the refresh endpoint from now until it expires."""
+    from .models import RevokedToken
+
+    now = timezone.now()
+    RevokedToken.objects.filter(expires_at__lte=now).delete()
+    RevokedToken.objects.get_or_create(
+        jti=token[api_settings.JTI_CLAIM],
+        defaults={'expires_at': datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)}
+    )
+
+
+def is_refresh_token_revoked(token):
+    from .models import RevokedToken
+
+    jti = token.get(api_settings.JTI_CLAIM)
+    return jti is not None and RevokedToken.objects.filter(jti=jti).exists()
@@ -1,18 +1,18 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
-    CustomTokenObtainPairView, RegisterView,
+    CustomTokenObtainPairView, CustomTokenRefreshView, RegisterView,
     send_otp, verify_otp,
     password_reset_request, password_reset_confirm,
-    logout
+    logout, logout_all
 )
 
 urlpatterns = [
     # JWT Authentication
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('register/', RegisterView.as_view(), name='register'),
     path('logout/', logout, name='logout'),
+    path('logout/all/', logout_all, name='logout_all'),
     
     # OTP Authentication
     path('otp/send/', send_otp, name='send_otp'),
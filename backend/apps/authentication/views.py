@@ -4,15 +4,16 @@ from rest_framework import status, generics
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import get_user_model
 
 from .serializers import (
-    CustomTokenObtainPairSerializer, RegisterSerializer,
+    CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer, LogoutSerializer, RegisterSerializer,
     OTPSendSerializer, OTPVerifySerializer,
     PasswordResetSerializer, PasswordResetConfirmSerializer
 )
 from .models import OTP
+from .tokens import bump_token_versions, revoke_refresh_token, tokens_for_user
 from core.utils import format_phone_number
 from apps.notifications.models import NotificationLog
 from apps.notifications.services import log_and_send
@@ -26,6 +27,11 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class CustomTokenRefreshView(TokenRefreshView):
+    """Token refresh that re-checks the user and refreshes authorization claims."""
+    serializer_class = CustomTokenRefreshSerializer
+
+
 class RegisterView(generics.CreateAPIView):
     """User registration endpoint."""
     queryset = User.objects.all()
@@ -172,8 +178,7 @@ def verify_otp(request):
         user.save(update_fields=updated_fields)
     
     # Generate JWT tokens
-    from rest_framework_simplejwt.tokens import RefreshToken
-    refresh = RefreshToken.for_user(user)
+    refresh = tokens_for_user(user)
     
     return Response({
         'access': str(refresh.access_token),
@@ -272,5 +277,28 @@ def password_reset_confirm(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    """Logout user (client should delete tokens)."""
+    """
+    Logout the current session.
+
+    Revokes the presented refresh token so it can no longer be refreshed;
+    the session's access token expires on its own. Other devices stay
+    logged in.
+    """
+    serializer = LogoutSerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    revoke_refresh_token(serializer.validated_data['refresh'])
     return Response({'message': 'Logged out successfully'})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_all(request):
+    """
+    Logout user everywhere.
+
+    Bumps the user's token version, so every access and refresh token
+    issued so far is refused, in all workers and without relying on the
+    cache.
+    """
+    bump_token_versions([request.user.pk])
+    return Response({'message': 'Logged out on all devices'})
@@ -1,8 +1,21 @@
 import pytest
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from apps.users.models import User
+from apps.inventory.models import BatteryModel, SerialNumber
+from apps.orders.models import Order
+from apps.notifications.models import NotificationLog
+from core.tasks import refresh_admin_metrics_task
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
 
 
 @pytest.fixture()
@@ -26,3 +39,77 @@ def test_admin_metrics(api_client, admin_user):
     response = api_client.get(url)
     assert response.status_code == 200
     assert 'users_by_role' in response.data
+
+
+@pytest.mark.django_db
+def test_admin_metrics_uses_one_grouped_query_per_table(api_client, admin_user, django_assert_num_queries):
+    api_client.force_authenticate(user=admin_user)
+    User.objects.create_user(email='w@test.com', first_name='W', role='WHOLESALER')
+    model = BatteryModel.objects.create(name='Lithovolt 12V 100Ah', sku='LV-12V-100')
+    SerialNumber.create_batch(model, 3)
+    Order.objects.create(consumer=admin_user, status=Order.Status.ACCEPTED)
+    Order.objects.create(consumer=admin_user, status=Order.Status.ACCEPTED)
+    NotificationLog.objects.create(channel='EMAIL', status='FAILED', message='x')
+
+    # users, battery models, serial summary, orders, warranties, notifications
+    with django_assert_num_queries(6):
+        response = api_client.get(reverse('admin-metrics'))
+
+    assert response.status_code == 200
+    assert response.data['users_by_role'] == {'ADMIN': 1, 'WHOLESALER': 1, 'CONSUMER': 0}
+    assert response.data['serials_by_status'] == {'AVAILABLE': 3, 'ALLOCATED': 0, 'SOLD': 0}
+    assert response.data['orders_by_status'][Order.Status.ACCEPTED] == 2
+    assert response.data['orders_by_status'][Order.Status.PENDING] == 0
+    assert response.data['warranties_by_status'] == dict.fromkeys(response.data['warranties_by_status'], 0)
+    assert response.data['notifications_by_status']['FAILED'] == 1
+
+
+@pytest.mark.django_db
+def test_admin_metrics_are_cached_until_data_changes(
+    api_client, admin_user, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    api_client.force_authenticate(user=admin_user)
+    url = reverse('admin-metrics')
+    first = api_client.get(url)
+    assert 'generated_at' in first.data
+
+    with django_assert_num_queries(0):
+        cached = api_client.get(url)
+    assert cached.data == first.data
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Order.objects.create(consumer=admin_user)
+    fresh = api_client.get(url)
+    assert fresh.data['orders_by_status'][Order.Status.PENDING] == 1
+    assert fresh.data['generated_at'] >= first.data['generated_at']
+
+
+@pytest.mark.django_db
+def test_logins_and_notifications_keep_metrics_cached(
+    api_client, admin_user, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    api_client.force_authenticate(user=admin_user)
+    url = reverse('admin-metrics')
+    api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        update_last_login(None, admin_user)
+        NotificationLog.objects.create(
+            channel='EMAIL', recipient_email='someone@test.com', message='Hello', status='SENT'
+        )
+    with django_assert_num_queries(0):
+        api_client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.create_user(email='new@test.com', first_name='New', role='CONSUMER')
+    assert api_client.get(url).data['users_by_role']['CONSUMER'] == 1
+
+
+@pytest.mark.django_db
+def test_refresh_task_repopulates_metrics_cache(api_client, admin_user, django_assert_num_queries):
+    api_client.force_authenticate(user=admin_user)
+    generated_at = refresh_admin_metrics_task()
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse('admin-metrics'))
+    assert response.data['generated_at'] == generated_at
@@ -0,0 +1,71 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.inventory.models import SerialNumber
+from apps.orders.models import Order
+from core.benchmarks import compare_to_baseline, percentile
+
+
+def run_benchmarks(tmp_path, *args):
+    output = tmp_path / 'results.json'
+    call_command(
+        'run_benchmarks', '--force', '--scale', '400',
+        '--iterations', '2', '--warmup', '0', '--output', str(output), *args
+    )
+    return json.loads(output.read_text())
+
+
+def test_percentile_uses_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile([7], 95) == 7
+
+
+def test_compare_to_baseline_flags_latency_and_query_growth():
+    baseline = {'list_orders': {'p95_ms': 10.0, 'queries_per_request': 2.0}}
+    assert compare_to_baseline({'list_orders': {'p95_ms': 11.0, 'queries_per_request': 2.0}}, baseline) == []
+
+    regressions = compare_to_baseline(
+        {'list_orders': {'p95_ms': 13.0, 'queries_per_request': 3.0}, 'new_scenario': {'p95_ms': 1.0}},
+        baseline,
+    )
+    assert len(regressions) == 2
+    assert all(message.startswith('list_orders') for message in regressions)
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_seeds_and_rolls_back_writes(tmp_path):
+    call_command('seed_data', scale=400, stdout=StringIO())
+    orders_seeded = Order.objects.count()
+    sold_seeded = SerialNumber.objects.filter(status=SerialNumber.Status.SOLD).count()
+
+    report = run_benchmarks(tmp_path)
+
+    results = report['scales']['400']
+    assert {'verify_warranty', 'verify_warranty_bulk', 'warranty_issue', 'stock_allocation', 'order_create', 'export_orders'} <= set(results)
+    for name, result in results.items():
+        assert result['iterations'] == 2
+        assert all(200 <= status < 300 for status in result['statuses']), name
+        assert result['p95_ms'] >= result['p50_ms']
+
+    # Writes are rolled back, so the seeded volumes are unchanged.
+    assert Order.objects.count() == orders_seeded
+    assert SerialNumber.objects.filter(status=SerialNumber.Status.SOLD).count() == sold_seeded
+
+
+@pytest.mark.django_db
+def test_run_benchmarks_fails_on_regression_against_baseline(tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    report = run_benchmarks(tmp_path, '--only', 'list_orders')
+    # Only the query count regresses; a generous p95 keeps timing noise out of it.
+    report['scales']['400']['list_orders']['queries_per_request'] = 0
+    report['scales']['400']['list_orders']['p95_ms'] = 60000
+    baseline.write_text(json.dumps(report))
+
+    with pytest.raises(CommandError, match='1 benchmark regression'):
+        run_benchmarks(tmp_path, '--skip-seed', '--only', 'list_orders', '--baseline', str(baseline), '--fail-on-regression')
@@ -0,0 +1,83 @@
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.models import User
+from apps.notifications.services import log_and_send
+from core import prometheus
+from core.prometheus import task_postrun_handler, task_prerun_handler
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='adminpass123',
+        first_name='Admin'
+    )
+
+
+def _sample(body, name, **labels):
+    selector = ','.join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f'{name}{{{selector}}} ' if selector else f'{name} '
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.split()[-1])
+    return 0.0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exposes_request_task_and_notification_metrics(client, admin_user, settings):
+    settings.NOTIFICATIONS_EMAIL_ENABLED = False
+    settings.PROMETHEUS_METRICS_ALLOWED_IPS = ['127.0.0.1']
+    before = _sample(client.get('/metrics').content.decode(), 'lithovolt_notifications_total',
+                     channel='EMAIL', status='SKIPPED')
+
+    token = RefreshToken.for_user(admin_user).access_token
+    client.get(reverse('battery-model-list'), HTTP_AUTHORIZATION=f'Bearer {token}')
+    log_and_send('EMAIL', 'someone@test.com', None, 'Hi', 'Hello')
+
+    class FakeTask:
+        name = 'apps.notifications.tasks.send_notification_task'
+
+    task_prerun_handler(task_id='abc', task=FakeTask())
+    task_postrun_handler(task_id='abc', task=FakeTask(), state='SUCCESS')
+
+    response = client.get('/metrics')
+    body = response.content.decode()
+    assert response.status_code == 200
+    assert _sample(
+        body, 'lithovolt_http_request_duration_seconds_count',
+        method='GET', status='200', view='BatteryModelViewSet.list'
+    ) >= 1
+    assert _sample(body, 'lithovolt_notifications_total', channel='EMAIL', status='SKIPPED') == before + 1
+    assert _sample(
+        body, 'lithovolt_celery_task_duration_seconds_count',
+        state='SUCCESS', task='apps.notifications.tasks.send_notification_task'
+    ) >= 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_closed_unless_token_or_address_is_configured(client, settings):
+    settings.PROMETHEUS_METRICS_TOKEN = ''
+    settings.PROMETHEUS_METRICS_ALLOWED_IPS = []
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer ').status_code == 403
+
+    settings.PROMETHEUS_METRICS_TOKEN = 'scrape-secret'
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code == 200
+
+    settings.PROMETHEUS_METRICS_ALLOWED_IPS = ['10.0.0.5']
+    assert client.get('/metrics', REMOTE_ADDR='10.0.0.5').status_code == 200
+    assert client.get('/metrics', HTTP_X_FORWARDED_FOR='10.0.0.5').status_code == 403
+
+
+def test_task_start_times_are_bounded(monkeypatch):
+    monkeypatch.setattr(prometheus, 'MAX_TRACKED_TASKS', 3)
+    monkeypatch.setattr(prometheus, '_task_started_at', {})
+
+    for task_id in range(5):
+        task_prerun_handler(task_id=task_id)
+
+    assert list(prometheus._task_started_at) == [2, 3, 4]
@@ -0,0 +1,181 @@
+"""
+Query budget regression tests for the list endpoints.
+
+Each endpoint is listed once with N rows and once with 10N rows; the
+number of queries must not change. A difference means a serializer is
+reaching through a relation per row that the viewset does not
+select_related/prefetch_related.
+"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.users.models import User, WholesalerApplication, Role, Permission, StaffUser
+from apps.inventory.models import BatteryModel, Accessory, Product, ProductCategory, SerialNumber
+from apps.orders.models import Order, OrderItem
+from apps.warranty.models import Warranty, WarrantyClaim, WarrantyClaimAttachment, ClaimStatusHistory
+from apps.notifications.models import NotificationLog
+
+
+# Both sizes fit on the default 20-row page so every seeded row is serialized.
+N = 2
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='adminpass123',
+        first_name='Admin'
+    )
+
+
+def make_user(prefix, idx, role='CONSUMER'):
+    return User.objects.create_user(
+        email=f'{prefix}{idx}@test.com',
+        first_name=f'{prefix.title()}{idx}',
+        last_name='Test',
+        role=role
+    )
+
+
+def make_battery_model(idx):
+    return BatteryModel.objects.create(name=f'Lithovolt 12V {idx}Ah', sku=f'LV-QB-{idx}')
+
+
+def seed_battery_models(admin, start, count):
+    for idx in range(start, start + count):
+        SerialNumber.create_batch(make_battery_model(idx), 2)
+
+
+def seed_orders(admin, start, count):
+    category, _ = ProductCategory.objects.get_or_create(name='Chargers', slug='chargers')
+    for idx in range(start, start + count):
+        order = Order.objects.create(consumer=make_user('buyer', idx), wholesaler=make_user('seller', idx, 'WHOLESALER'))
+        OrderItem.objects.create(
+            order=order,
+            product_type=OrderItem.ProductType.BATTERY_MODEL,
+            battery_model=make_battery_model(idx)
+        )
+        OrderItem.objects.create(
+            order=order,
+            product_type=OrderItem.ProductType.ACCESSORY,
+            accessory=Accessory.objects.create(name=f'Clamp {idx}', sku=f'ACC-QB-{idx}')
+        )
+        OrderItem.objects.create(
+            order=order,
+            product_type=OrderItem.ProductType.PRODUCT,
+            product=Product.objects.create(name=f'Charger {idx}', sku=f'PRD-QB-{idx}', category=category)
+        )
+
+
+def make_warranty(admin, idx):
+    battery_model = make_battery_model(idx)
+    SerialNumber.create_batch(battery_model, 1)
+    serial = battery_model.serial_numbers.get()
+    return Warranty.objects.create(serial_number=serial, consumer=make_user('owner', idx), issued_by=admin)
+
+
+def seed_warranties(admin, start, count):
+    for idx in range(start, start + count):
+        make_warranty(admin, idx)
+
+
+def seed_claims(admin, start, count):
+    for idx in range(start, start + count):
+        warranty = make_warranty(admin, idx)
+        claim = WarrantyClaim.objects.create(
+            warranty=warranty,
+            consumer=warranty.consumer,
+            assigned_to=admin,
+            reviewed_by=admin
+        )
+        WarrantyClaimAttachment.objects.create(claim=claim, file=f'warranties/claims/{idx}.jpg')
+        ClaimStatusHistory.objects.create(
+            claim=claim,
+            from_status=WarrantyClaim.Status.PENDING,
+            to_status=WarrantyClaim.Status.UNDER_REVIEW,
+            changed_by=admin
+        )
+
+
+def seed_roles(admin, start, count):
+    for idx in range(start, start + count):
+        role = Role.objects.create(name=f'ROLE{idx}')
+        Permission.objects.create(role=role, resource='ORDERS', action='VIEW')
+        StaffUser.objects.create(user=make_user('staff', idx), role=role)
+
+
+def seed_staff_users(admin, start, count):
+    for idx in range(start, start + count):
+        StaffUser.objects.create(
+            user=make_user('staff', idx),
+            role=Role.objects.create(name=f'ROLE{idx}'),
+            supervisor=make_user('lead', idx)
+        )
+
+
+def seed_wholesaler_applications(admin, start, count):
+    for idx in range(start, start + count):
+        WholesalerApplication.objects.create(
+            user=make_user('applicant', idx),
+            business_name=f'Business {idx}',
+            registration_number=f'REG-{idx}',
+            address='1 Battery Road',
+            city='Sydney',
+            state='NSW',
+            pincode='2000',
+            reviewed_by=admin
+        )
+
+
+def seed_notifications(admin, start, count):
+    NotificationLog.objects.bulk_create([
+        NotificationLog(channel='EMAIL', recipient_email=f'user{idx}@test.com', message='hello')
+        for idx in range(start, start + count)
+    ])
+
+
+LIST_ENDPOINTS = [
+    ('battery-model-list', seed_battery_models),
+    ('order-list', seed_orders),
+    ('warranty-list', seed_warranties),
+    ('warranty-claim-list', seed_claims),
+    ('role-list', seed_roles),
+    ('staff-user-list', seed_staff_users),
+    ('wholesaler-application-list', seed_wholesaler_applications),
+    ('notification-list', seed_notifications),
+]
+
+
+def count_list_queries(api_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(url)
+    assert response.status_code == 200
+    results = response.data['results'] if isinstance(response.data, dict) else response.data
+    return len(context.captured_queries), len(results)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url_name,seed', LIST_ENDPOINTS, ids=[name for name, _ in LIST_ENDPOINTS])
+def test_list_query_count_does_not_grow_with_rows(api_client, admin_user, url_name, seed):
+    api_client.force_authenticate(user=admin_user)
+    url = reverse(url_name)
+
+    seed(admin_user, 0, N)
+    small_queries, small_rows = count_list_queries(api_client, url)
+    seed(admin_user, N, 9 * N)
+    large_queries, large_rows = count_list_queries(api_client, url)
+
+    assert large_rows > small_rows
+    assert large_queries == small_queries, (
+        f'{url_name}: {small_queries} queries for {small_rows} rows, '
+        f'{large_queries} queries for {large_rows} rows'
+    )
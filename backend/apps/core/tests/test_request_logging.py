@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.models import User
+from apps.inventory.models import BatteryModel
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='adminpass123',
+        first_name='Admin'
+    )
+
+
+@pytest.fixture()
+def request_log(caplog):
+    # The request logger does not propagate to the root logger caplog hooks into.
+    request_logger = logging.getLogger('lithovolt.request')
+    request_logger.addHandler(caplog.handler)
+    caplog.set_level(logging.INFO, logger='lithovolt.request')
+    yield caplog
+    request_logger.removeHandler(caplog.handler)
+
+
+def _get(client, user, url):
+    token = RefreshToken.for_user(user).access_token
+    return client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+
+@pytest.mark.django_db
+def test_request_log_includes_query_and_serializer_stats(client, admin_user, request_log):
+    BatteryModel.objects.create(name='Lithovolt 12V 100Ah', sku='LV-12V-100')
+
+    response = _get(client, admin_user, reverse('battery-model-list'))
+
+    assert response.status_code == 200
+    record = request_log.records[-1]
+    assert record.levelno == logging.INFO
+    message = record.getMessage()
+    assert '/api/inventory/models/ 200' in message
+    queries = int(message.split('queries=')[1].split()[0])
+    assert queries >= 2
+    assert 'serializer=' in message and 'serializer=0.00ms' not in message
+    assert f'size={len(response.content)}' in message
+
+
+@pytest.mark.django_db
+def test_request_over_query_budget_logs_slowest_queries(client, admin_user, request_log, settings):
+    settings.REQUEST_LOG_MAX_QUERIES = 1
+
+    _get(client, admin_user, reverse('battery-model-list'))
+
+    record = request_log.records[-1]
+    assert record.levelno == logging.WARNING
+    assert 'SELECT' in record.getMessage().split('\n', 1)[1]
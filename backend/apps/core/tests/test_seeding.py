@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.users.models import User, UserProfile
+from apps.inventory.models import SerialNumber, SerialSequence, StockAllocationRange, StockSummary
+from apps.inventory.services import rebuild_stock_summaries
+from apps.orders.models import Order
+from apps.notifications.models import NotificationLog
+from apps.warranty.models import ClaimStatusHistory, Warranty, WarrantyClaim
+
+
+def seed(scale, **options):
+    call_command('seed_data', scale=scale, stdout=StringIO(), **options)
+
+
+def serial_snapshot():
+    return list(SerialNumber.objects.order_by('id').values_list('status', 'allocated_to__email', 'sold_at'))
+
+
+@pytest.mark.django_db
+def test_seed_data_scale_generates_consistent_volumes():
+    seed(600, seed=3, batch_size=100)
+
+    assert SerialNumber.objects.count() == 600
+    statuses = set(SerialNumber.objects.values_list('status', flat=True))
+    assert statuses == {'AVAILABLE', 'ALLOCATED', 'SOLD'}
+
+    sold = SerialNumber.objects.filter(status=SerialNumber.Status.SOLD)
+    assert Warranty.objects.count() == sold.count()
+    assert not sold.filter(warranty__isnull=True).exists()
+    assert NotificationLog.objects.count() == sold.count()
+    assert ClaimStatusHistory.objects.count() >= WarrantyClaim.objects.exclude(status='PENDING').count()
+
+    held = SerialNumber.objects.exclude(status=SerialNumber.Status.AVAILABLE).count()
+    assert StockAllocationRange.objects.aggregate(total=Sum('serial_count'))['total'] == held
+
+    assert User.objects.filter(role='WHOLESALER').count() == 6
+    assert User.objects.filter(role='CONSUMER').count() == 30
+    assert UserProfile.objects.count() == User.objects.count()
+    assert Order.objects.count() == 18
+    assert StockSummary.objects.filter(wholesaler__isnull=True).aggregate(total=Sum('total_count'))['total'] == 600
+    assert rebuild_stock_summaries(dry_run=True) == []
+
+    # Seeded users can log in with the documented passwords.
+    assert User.objects.filter(role='CONSUMER').first().check_password('Consumer@123')
+
+
+@pytest.mark.django_db
+def test_seed_data_scale_is_idempotent_and_tops_up():
+    seed(300, seed=5)
+    first = serial_snapshot()
+    seed(300, seed=5)
+    assert serial_snapshot() == first
+
+    seed(450, seed=5)
+    assert SerialNumber.objects.count() == 450
+    assert serial_snapshot()[:300] == first
+
+
+@pytest.mark.django_db
+def test_seed_data_scale_does_not_depend_on_the_current_day(monkeypatch):
+    def seeded_rows():
+        with transaction.atomic():
+            seed(100, seed=7, until=date(2025, 6, 30))
+            rows = (
+                list(SerialNumber.objects.order_by('serial_number').values_list(
+                    'serial_number', 'created_at', 'updated_at', 'sold_at'
+                )),
+                list(Order.objects.order_by('created_at').values_list('status', 'created_at', 'updated_at')),
+            )
+            transaction.set_rollback(True)
+        return rows
+
+    first = seeded_rows()
+    later = timezone.now() + timedelta(days=40)
+    monkeypatch.setattr(timezone, 'now', lambda: later)
+    assert seeded_rows() == first
+
+    serial_number, created_at, _, _ = first[0][0]
+    assert serial_number.startswith('LVS7-0000000')
+    assert created_at < timezone.make_aware(datetime(2025, 6, 30))
+    assert not SerialSequence.objects.exists()
+
+
+@pytest.mark.django_db
+def test_seed_data_writes_timestamps_in_the_insert():
+    with CaptureQueriesContext(connection) as queries:
+        seed(100, seed=9)
+
+    updates = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+    assert not [sql for sql in updates if '"created_at" = CASE' in sql]
+    created_at = SerialNumber._meta.get_field('created_at')
+    updated_at = SerialNumber._meta.get_field('updated_at')
+    assert created_at.auto_now_add and updated_at.auto_now
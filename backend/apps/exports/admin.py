@@ -0,0 +1,42 @@
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
+
+from .models import ExportJob
+from .views import export_file_response
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'file_format', 'status', 'rows_written', 'total_rows', 'requested_by', 'created_at']
+    list_filter = ['kind', 'file_format', 'status']
+    # Private storage has no public URL, so the file widget would fail to render.
+    exclude = ['file']
+    readonly_fields = ['download_link', 'params_hash', 'created_at', 'updated_at', 'started_at', 'completed_at']
+
+    def get_urls(self):
+        return [
+            path(
+                '<path:object_id>/download/',
+                self.admin_site.admin_view(self.download_view),
+                name='exports_exportjob_download'
+            ),
+        ] + super().get_urls()
+
+    def download_view(self, request, object_id):
+        job = get_object_or_404(ExportJob, pk=object_id)
+        if not self.has_view_permission(request, job):
+            raise PermissionDenied
+        return export_file_response(job)
+
+    @admin.display(description='File')
+    def download_link(self, obj):
+        if not obj.file:
+            return '-'
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse('admin:exports_exportjob_download', args=[obj.pk]),
+            obj.file.name.rsplit('/', 1)[-1]
+        )
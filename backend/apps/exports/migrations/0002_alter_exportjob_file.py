@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:50
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="exportjob",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=core.storage.private_storage,
+                upload_to="exports/",
+            ),
+        ),
+    ]
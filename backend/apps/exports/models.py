@@ -0,0 +1,62 @@
+"""Export job models."""
+from django.db import models
+from django.contrib.auth import get_user_model
+
+from core.models import TimeStampedModel
+from core.storage import private_storage
+
+User = get_user_model()
+
+
+class ExportJob(TimeStampedModel):
+	"""A CSV export produced in the background and kept for download."""
+
+	class Kind(models.TextChoices):
+		ORDERS = 'ORDERS', 'Orders'
+		WARRANTIES = 'WARRANTIES', 'Warranties'
+
+	class Format(models.TextChoices):
+		CSV = 'CSV', 'CSV'
+		CSV_GZ = 'CSV_GZ', 'Gzip-compressed CSV'
+
+	class Status(models.TextChoices):
+		PENDING = 'PENDING', 'Pending'
+		RUNNING = 'RUNNING', 'Running'
+		COMPLETED = 'COMPLETED', 'Completed'
+		FAILED = 'FAILED', 'Failed'
+
+	kind = models.CharField(max_length=20, choices=Kind.choices)
+	file_format = models.CharField(max_length=10, choices=Format.choices, default=Format.CSV)
+	params = models.JSONField(default=dict, blank=True)
+	params_hash = models.CharField(max_length=64, db_index=True)
+	status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+	total_rows = models.PositiveIntegerField(null=True, blank=True)
+	rows_written = models.PositiveIntegerField(default=0)
+	# Exports contain consumer PII; they are only served by the download action.
+	file = models.FileField(upload_to='exports/', storage=private_storage, null=True, blank=True)
+	error_message = models.TextField(blank=True)
+	requested_by = models.ForeignKey(
+		User,
+		on_delete=models.SET_NULL,
+		null=True,
+		blank=True,
+		related_name='export_jobs'
+	)
+	started_at = models.DateTimeField(null=True, blank=True)
+	completed_at = models.DateTimeField(null=True, blank=True)
+
+	class Meta:
+		db_table = 'export_jobs'
+		ordering = ['-created_at']
+
+	def __str__(self):
+		return f'{self.kind} export {self.id} ({self.status})'
+
+	@property
+	def progress(self):
+		"""Percentage of rows written, or None before the row count is known."""
+		if self.status == self.Status.COMPLETED:
+			return 100
+		if not self.total_rows:
+			return None if self.total_rows is None else 0
+		return min(100, int(self.rows_written * 100 / self.total_rows))
@@ -0,0 +1,51 @@
+"""Serializers for export jobs."""
+from django.urls import reverse
+from rest_framework import serializers
+
+from .models import ExportJob
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+    """Serializer for export job status."""
+
+    progress = serializers.IntegerField(read_only=True)
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'kind', 'file_format', 'params', 'status', 'total_rows',
+            'rows_written', 'progress', 'download_url', 'error_message',
+            'requested_by', 'created_at', 'started_at', 'completed_at'
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != ExportJob.Status.COMPLETED or not obj.file:
+            return None
+        url = reverse('export-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+
+class ExportJobCreateSerializer(serializers.Serializer):
+    """Serializer for requesting an export."""
+
+    kind = serializers.ChoiceField(choices=ExportJob.Kind.choices)
+    file_format = serializers.ChoiceField(choices=ExportJob.Format.choices, default=ExportJob.Format.CSV)
+    status = serializers.CharField(required=False, allow_blank=True)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    reuse = serializers.BooleanField(default=True)
+
+    def get_params(self):
+        """Export filters in the shape the export modules read."""
+        data = self.validated_data
+        params = {}
+        if data.get('status'):
+            params['status'] = data['status']
+        if data.get('date_from'):
+            params['from'] = data['date_from'].isoformat()
+        if data.get('date_to'):
+            params['to'] = data['date_to'].isoformat()
+        return params
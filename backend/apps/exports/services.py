@@ -0,0 +1,161 @@
+"""Export job creation, reuse and file writing."""
+import csv
+import gzip
+import hashlib
+import io
+import json
+import tempfile
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.orders.exports import ORDER_EXPORT_HEADER, filter_orders_for_export, order_export_rows
+from apps.warranty.exports import (
+	WARRANTY_EXPORT_HEADER,
+	filter_warranties_for_export,
+	warranty_export_rows,
+)
+from core.background import dispatch_task
+
+from .models import ExportJob
+from .tasks import run_export_job_task
+
+ExportKind = namedtuple('ExportKind', ['header', 'filter_queryset', 'rows', 'filename'])
+
+EXPORT_KINDS = {
+	ExportJob.Kind.ORDERS: ExportKind(
+		ORDER_EXPORT_HEADER, filter_orders_for_export, order_export_rows, 'orders'
+	),
+	ExportJob.Kind.WARRANTIES: ExportKind(
+		WARRANTY_EXPORT_HEADER, filter_warranties_for_export, warranty_export_rows, 'warranties'
+	),
+}
+
+# Rows written between progress updates on the job row.
+EXPORT_PROGRESS_INTERVAL = 2000
+
+
+def export_params_hash(kind, file_format, params):
+	"""Stable hash identifying identical export requests."""
+	payload = json.dumps(
+		{'kind': kind, 'format': file_format, 'params': params},
+		sort_keys=True,
+		default=str
+	)
+	return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def find_reusable_job(params_hash):
+	"""Return a recent identical job that is finished or still making progress.
+
+	Pending and running jobs whose last update is older than
+	EXPORT_JOB_STALE_SECONDS are treated as lost and not reused.
+	"""
+	reuse_seconds = getattr(settings, 'EXPORT_JOB_REUSE_SECONDS', 0)
+	if reuse_seconds <= 0:
+		return None
+	now = timezone.now()
+	stale_seconds = getattr(settings, 'EXPORT_JOB_STALE_SECONDS', 120)
+	in_progress = Q(
+		status__in=[ExportJob.Status.PENDING, ExportJob.Status.RUNNING],
+		updated_at__gte=now - timedelta(seconds=stale_seconds)
+	)
+	return ExportJob.objects.filter(
+		Q(status=ExportJob.Status.COMPLETED) | in_progress,
+		params_hash=params_hash,
+		created_at__gte=now - timedelta(seconds=reuse_seconds)
+	).order_by('-created_at').first()
+
+
+def request_export(kind, file_format, params, requested_by, reuse=True):
+	"""Create an export job (or reuse a recent identical one).
+
+	Returns (job, reused). New jobs are dispatched once the surrounding
+	transaction commits, to Celery or to the in-process thread pool.
+	"""
+	params_hash = export_params_hash(kind, file_format, params)
+	if reuse:
+		job = find_reusable_job(params_hash)
+		if job:
+			return job, True
+
+	job = ExportJob.objects.create(
+		kind=kind,
+		file_format=file_format,
+		params=params,
+		params_hash=params_hash,
+		requested_by=requested_by
+	)
+	transaction.on_commit(lambda: dispatch_task(run_export_job_task, job.id))
+	return job, False
+
+
+def _write_rows(stream, header, rows, on_progress):
+	text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+	writer = csv.writer(text)
+	writer.writerow(header)
+	written = 0
+	for row in rows:
+		writer.writerow(row)
+		written += 1
+		if written % EXPORT_PROGRESS_INTERVAL == 0:
+			on_progress(written)
+	text.flush()
+	text.detach()
+	return written
+
+
+def run_export_job(job_id):
+	"""Write an export job's file to the default storage."""
+	started_at = timezone.now()
+	claimed = ExportJob.objects.filter(id=job_id, status=ExportJob.Status.PENDING).update(
+		status=ExportJob.Status.RUNNING,
+		started_at=started_at,
+		updated_at=started_at
+	)
+	if not claimed:
+		return None
+	job = ExportJob.objects.get(id=job_id)
+	export_kind = EXPORT_KINDS[job.kind]
+	queryset = export_kind.filter_queryset(job.params)
+	ExportJob.objects.filter(id=job.id).update(total_rows=queryset.count(), updated_at=timezone.now())
+
+	def on_progress(written):
+		# updated_at doubles as the heartbeat find_reusable_job checks.
+		ExportJob.objects.filter(id=job.id).update(rows_written=written, updated_at=timezone.now())
+
+	try:
+		with tempfile.TemporaryFile() as buffer:
+			if job.file_format == ExportJob.Format.CSV_GZ:
+				with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed:
+					written = _write_rows(compressed, export_kind.header, export_kind.rows(queryset), on_progress)
+				extension = 'csv.gz'
+			else:
+				written = _write_rows(buffer, export_kind.header, export_kind.rows(queryset), on_progress)
+				extension = 'csv'
+			buffer.seek(0)
+			job.file.save(f'{export_kind.filename}-{job.id}.{extension}', File(buffer), save=False)
+	except Exception as exc:
+		failed_at = timezone.now()
+		ExportJob.objects.filter(id=job.id).update(
+			status=ExportJob.Status.FAILED,
+			error_message=str(exc),
+			completed_at=failed_at,
+			updated_at=failed_at
+		)
+		raise
+
+	completed_at = timezone.now()
+	ExportJob.objects.filter(id=job.id).update(
+		status=ExportJob.Status.COMPLETED,
+		file=job.file.name,
+		rows_written=written,
+		completed_at=completed_at,
+		updated_at=completed_at
+	)
+	return job.id
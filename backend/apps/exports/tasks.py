@@ -0,0 +1,9 @@
+"""Celery tasks for export jobs."""
+from celery import shared_task
+
+
+@shared_task
+def run_export_job_task(job_id):
+    from .services import run_export_job
+
+    return run_export_job(job_id)
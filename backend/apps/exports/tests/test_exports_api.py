@@ -0,0 +1,127 @@
+import gzip
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.orders.models import Order
+from apps.exports.models import ExportJob
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='adminpass123',
+        first_name='Admin'
+    )
+
+
+@pytest.fixture()
+def run_inline(monkeypatch, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / 'media'
+    settings.PRIVATE_MEDIA_ROOT = tmp_path / 'private'
+    settings.ASYNC_TASKS_ENABLED = False
+    monkeypatch.setattr('core.background.run_in_background', lambda func, *args, **kwargs: func(*args, **kwargs))
+
+
+@pytest.mark.django_db
+def test_export_job_writes_gzip_file(api_client, admin_user, run_inline, settings, django_capture_on_commit_callbacks):
+    api_client.force_authenticate(user=admin_user)
+    for _ in range(3):
+        Order.objects.create(consumer=admin_user, status=Order.Status.PENDING)
+    Order.objects.create(consumer=admin_user, status=Order.Status.ACCEPTED)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse('export-job-list'),
+            {'kind': 'ORDERS', 'file_format': 'CSV_GZ', 'status': 'PENDING'},
+            format='json'
+        )
+    assert response.status_code == 202
+    assert response.data['reused'] is False
+
+    status_response = api_client.get(reverse('export-job-detail', args=[response.data['id']]))
+    assert status_response.data['status'] == ExportJob.Status.COMPLETED
+    assert status_response.data['progress'] == 100
+    assert status_response.data['total_rows'] == 3
+    assert status_response.data['download_url'].endswith(f"/api/exports/{response.data['id']}/download/")
+
+    job = ExportJob.objects.get(pk=response.data['id'])
+    assert job.file.path.startswith(str(settings.PRIVATE_MEDIA_ROOT))
+
+    download = api_client.get(status_response.data['download_url'])
+    assert download.status_code == 200
+    lines = gzip.decompress(b''.join(download.streaming_content)).decode().splitlines()
+    assert len(lines) == 4
+    assert lines[0].startswith('id,consumer_email')
+
+
+@pytest.mark.django_db
+def test_identical_export_reuses_recent_job(api_client, admin_user, run_inline, django_capture_on_commit_callbacks):
+    api_client.force_authenticate(user=admin_user)
+    url = reverse('export-job-list')
+    payload = {'kind': 'WARRANTIES', 'date_from': '2026-01-01'}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = api_client.post(url, payload, format='json')
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        again = api_client.post(url, payload, format='json')
+    assert again.status_code == 200
+    assert again.data['reused'] is True
+    assert again.data['id'] == first.data['id']
+    assert callbacks == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        forced = api_client.post(url, {**payload, 'reuse': False}, format='json')
+    assert forced.data['id'] != first.data['id']
+    assert ExportJob.objects.get(id=forced.data['id']).status == ExportJob.Status.COMPLETED
+
+
+
+@pytest.mark.django_db
+def test_stale_pending_job_is_not_reused(api_client, admin_user, settings):
+    settings.EXPORT_JOB_STALE_SECONDS = 60
+    api_client.force_authenticate(user=admin_user)
+    url = reverse('export-job-list')
+    payload = {'kind': 'WARRANTIES', 'date_from': '2026-01-01'}
+
+    first = api_client.post(url, payload, format='json')
+    assert first.status_code == 202
+    again = api_client.post(url, payload, format='json')
+    assert again.data['reused'] is True
+
+    # The worker died: the job was never picked up and its heartbeat is old.
+    ExportJob.objects.filter(id=first.data['id']).update(updated_at=timezone.now() - timedelta(seconds=61))
+    retry = api_client.post(url, payload, format='json')
+    assert retry.status_code == 202
+    assert retry.data['reused'] is False
+    assert retry.data['id'] != first.data['id']
+
+@pytest.mark.django_db
+def test_admin_renders_completed_job_with_download_link(client, admin_user, run_inline, django_capture_on_commit_callbacks):
+    Order.objects.create(consumer=admin_user, status=Order.Status.PENDING)
+    api_client = APIClient()
+    api_client.force_authenticate(user=admin_user)
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(reverse('export-job-list'), {'kind': 'ORDERS'}, format='json')
+    job = ExportJob.objects.get(pk=response.data['id'])
+    assert job.status == ExportJob.Status.COMPLETED
+
+    client.force_login(admin_user)
+    change = client.get(reverse('admin:exports_exportjob_change', args=[job.pk]))
+    assert change.status_code == 200
+    download_url = reverse('admin:exports_exportjob_download', args=[job.pk])
+    assert download_url in change.content.decode()
+
+    download = client.get(download_url)
+    assert download.status_code == 200
+    assert b''.join(download.streaming_content).decode().startswith('id,consumer_email')
@@ -0,0 +1,60 @@
+"""Export job API views."""
+from django.http import FileResponse, Http404
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.permissions import IsAdmin
+from .models import ExportJob
+from .serializers import ExportJobCreateSerializer, ExportJobSerializer
+from .services import request_export
+
+
+def export_file_response(job):
+    """Stream a completed export file as an attachment."""
+    if job.status != ExportJob.Status.COMPLETED or not job.file:
+        raise Http404('Export is not ready')
+    filename = job.file.name.rsplit('/', 1)[-1]
+    content_type = 'application/gzip' if job.file_format == ExportJob.Format.CSV_GZ else 'text/csv'
+    return FileResponse(job.file.open('rb'), as_attachment=True, filename=filename, content_type=content_type)
+
+
+class ExportJobViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """Request background exports, poll their progress and download them (admin)."""
+
+    queryset = ExportJob.objects.all()
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    filterset_fields = ['kind', 'status']
+    ordering_fields = ['created_at']
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return ExportJobCreateSerializer
+        return ExportJobSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job, reused = request_export(
+            kind=serializer.validated_data['kind'],
+            file_format=serializer.validated_data['file_format'],
+            params=serializer.get_params(),
+            requested_by=request.user,
+            reuse=serializer.validated_data['reuse']
+        )
+        data = ExportJobSerializer(job, context={'request': request}).data
+        data['reused'] = reused
+        return Response(data, status=status.HTTP_200_OK if reused else status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download a completed export file."""
+        return export_file_response(self.get_object())
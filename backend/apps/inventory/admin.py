@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import BatteryModel, Accessory, SerialNumber, StockAllocation
+from .models import (
+    BatteryModel,
+    Accessory,
+    SerialNumber,
+    StockAllocation,
+    StockAllocationRange,
+    StockSummary,
+)
 
 
 @admin.register(BatteryModel)
@@ -27,9 +34,28 @@ class SerialNumberAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at', 'allocated_at', 'sold_at']
 
 
+class StockAllocationRangeInline(admin.TabularInline):
+    model = StockAllocationRange
+    extra = 0
+    readonly_fields = ['start_serial_id', 'end_serial_id', 'serial_count']
+    can_delete = False
+
+
 @admin.register(StockAllocation)
 class StockAllocationAdmin(admin.ModelAdmin):
     list_display = ['battery_model', 'wholesaler', 'quantity', 'allocated_by', 'created_at']
     list_filter = ['battery_model']
     search_fields = ['battery_model__name', 'wholesaler__email']
     readonly_fields = ['created_at', 'updated_at']
+    inlines = [StockAllocationRangeInline]
+
+
+@admin.register(StockSummary)
+class StockSummaryAdmin(admin.ModelAdmin):
+    list_display = [
+        'battery_model', 'wholesaler', 'total_count', 'available_count',
+        'allocated_count', 'sold_count', 'updated_at'
+    ]
+    list_filter = ['battery_model']
+    search_fields = ['battery_model__name', 'battery_model__sku', 'wholesaler__email']
+    readonly_fields = ['created_at', 'updated_at']
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class InventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.inventory'
+
+    def ready(self):
+        """Register signals when app is ready."""
+        import apps.inventory.signals  # noqa
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.models import BatteryModel
+from apps.inventory.services import SERIAL_GENERATION_CHUNK_SIZE, generate_serials
+
+
+class Command(BaseCommand):
+    help = 'Generate serial numbers for a battery model (factory runs).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('battery_model_id', type=int)
+        parser.add_argument('quantity', type=int)
+        parser.add_argument('--prefix', default='LV')
+        parser.add_argument('--chunk-size', type=int, default=SERIAL_GENERATION_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        battery_model = BatteryModel.objects.filter(id=options['battery_model_id']).first()
+        if not battery_model:
+            raise CommandError('Battery model not found')
+        if options['quantity'] < 1 or options['chunk_size'] < 1:
+            raise CommandError('quantity and --chunk-size must be positive')
+
+        quantity = options['quantity']
+
+        def report(created):
+            self.stdout.write(f'{created}/{quantity} serials created')
+
+        created = generate_serials(
+            battery_model,
+            quantity,
+            prefix=options['prefix'],
+            chunk_size=options['chunk_size'],
+            on_chunk=report
+        )
+        self.stdout.write(self.style.SUCCESS(f'Generated {created} serials for {battery_model.sku}'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from apps.inventory.services import rebuild_stock_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild denormalized stock summary counters from serial numbers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--battery-model',
+            type=int,
+            action='append',
+            dest='battery_models',
+            help='Limit the rebuild to a battery model id (repeatable).'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted counters without writing them.'
+        )
+
+    def handle(self, *args, **options):
+        drifted = rebuild_stock_summaries(
+            battery_model_ids=options['battery_models'],
+            dry_run=options['dry_run']
+        )
+        for battery_model_id, wholesaler_id in drifted:
+            scope = f'wholesaler {wholesaler_id}' if wholesaler_id else 'all wholesalers'
+            self.stdout.write(f'Drift: battery model {battery_model_id} ({scope})')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{len(drifted)} summary rows out of date'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Stock summaries rebuilt ({len(drifted)} rows corrected)'))
@@ -0,0 +1,73 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0004_product_category_and_product"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("total_count", models.IntegerField(default=0)),
+                ("available_count", models.IntegerField(default=0)),
+                ("allocated_count", models.IntegerField(default=0)),
+                ("sold_count", models.IntegerField(default=0)),
+                (
+                    "battery_model",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_summaries",
+                        to="inventory.batterymodel",
+                    ),
+                ),
+                (
+                    "wholesaler",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_summaries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "stock_summaries",
+                "ordering": ["battery_model", "wholesaler"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="stocksummary",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("wholesaler__isnull", True)),
+                fields=("battery_model",),
+                name="stock_summary_unique_model_total",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="stocksummary",
+            constraint=models.UniqueConstraint(
+                fields=("battery_model", "wholesaler"),
+                name="stock_summary_unique_model_wholesaler",
+            ),
+        ),
+    ]
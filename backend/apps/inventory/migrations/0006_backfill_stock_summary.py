@@ -0,0 +1,50 @@
+from collections import defaultdict
+
+from django.db import migrations
+from django.db.models import Count
+
+
+STATUS_FIELDS = {
+    "AVAILABLE": "available_count",
+    "ALLOCATED": "allocated_count",
+    "SOLD": "sold_count",
+}
+
+
+def backfill_stock_summary(apps, schema_editor):
+    SerialNumber = apps.get_model("inventory", "SerialNumber")
+    StockSummary = apps.get_model("inventory", "StockSummary")
+
+    serials = SerialNumber.objects.order_by()
+    counts = defaultdict(lambda: defaultdict(int))
+    for row in serials.values("battery_model_id", "status").annotate(count=Count("id")):
+        summary = counts[(row["battery_model_id"], None)]
+        summary["total_count"] += row["count"]
+        summary[STATUS_FIELDS[row["status"]]] += row["count"]
+
+    held = serials.filter(
+        allocated_to__isnull=False, status__in=["ALLOCATED", "SOLD"]
+    ).values("battery_model_id", "allocated_to_id", "status").annotate(count=Count("id"))
+    for row in held:
+        summary = counts[(row["battery_model_id"], row["allocated_to_id"])]
+        summary["total_count"] += row["count"]
+        summary[STATUS_FIELDS[row["status"]]] += row["count"]
+
+    StockSummary.objects.bulk_create(
+        [
+            StockSummary(battery_model_id=model_id, wholesaler_id=wholesaler_id, **values)
+            for (model_id, wholesaler_id), values in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0005_stocksummary"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stock_summary, migrations.RunPython.noop),
+    ]
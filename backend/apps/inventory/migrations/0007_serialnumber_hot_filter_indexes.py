@@ -0,0 +1,44 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:36
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0006_backfill_stock_summary"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                condition=models.Q(("status", "AVAILABLE")),
+                fields=["battery_model", "created_at"],
+                name="serial_available_fifo_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                fields=["battery_model", "status", "created_at"],
+                name="serial_model_status_idx",
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                fields=["allocated_to", "-created_at"], name="serial_allocated_to_idx"
+            ),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                fields=["status", "-created_at"], name="serial_status_created_idx"
+            ),
+        ),
+    ]
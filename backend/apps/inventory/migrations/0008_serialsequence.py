@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0007_serialnumber_hot_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SerialSequence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("prefix", models.CharField(max_length=10, unique=True)),
+                ("last_value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "serial_sequences",
+                "ordering": ["prefix"],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0008_serialsequence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockAllocationRange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_serial_id", models.BigIntegerField()),
+                ("end_serial_id", models.BigIntegerField()),
+                ("serial_count", models.PositiveIntegerField()),
+                (
+                    "allocation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="serial_ranges",
+                        to="inventory.stockallocation",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "stock_allocation_ranges",
+                "ordering": ["allocation", "start_serial_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["allocation", "start_serial_id"],
+                        name="allocation_range_start_idx",
+                    )
+                ],
+            },
+        ),
+    ]
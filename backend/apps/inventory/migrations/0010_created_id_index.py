@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0009_stockallocationrange"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                fields=["created_at", "id"], name="serial_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0010_created_id_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            index=models.Index(
+                condition=models.Q(("sold_at__isnull", False)),
+                fields=["sold_at"],
+                name="serial_sold_at_idx",
+            ),
+        ),
+    ]
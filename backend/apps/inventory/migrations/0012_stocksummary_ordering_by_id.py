@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:04
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0011_serial_sold_at_index"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="stocksummary",
+            options={"ordering": ["battery_model_id", "wholesaler_id"]},
+        ),
+    ]
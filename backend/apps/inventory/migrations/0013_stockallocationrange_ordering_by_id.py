@@ -0,0 +1,17 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0012_stocksummary_ordering_by_id"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="stockallocationrange",
+            options={"ordering": ["allocation_id", "start_serial_id"]},
+        ),
+    ]
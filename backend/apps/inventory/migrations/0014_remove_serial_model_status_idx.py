@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-18 16:40
+
+from django.db import migrations
+
+from core.migration_operations import RemoveIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0013_stockallocationrange_ordering_by_id"),
+    ]
+
+    operations = [
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name="serialnumber",
+            name="serial_model_status_idx",
+        ),
+    ]
@@ -1,14 +1,50 @@
 """Inventory models for battery tracking and allocation."""
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, FilteredRelation, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from core.models import TimeStampedModel
-from core.utils import generate_serial_number
 
 User = get_user_model()
 
 
+class BatteryModelQuerySet(models.QuerySet):
+	"""Query helpers for battery models."""
+
+	def with_stock_counts(self):
+		"""Annotate total/available/allocated/sold serial counts in one grouped query."""
+		return self.annotate(
+			total_count=Count('serial_numbers'),
+			available_count=Count(
+				'serial_numbers',
+				filter=Q(serial_numbers__status=SerialNumber.Status.AVAILABLE)
+			),
+			allocated_count=Count(
+				'serial_numbers',
+				filter=Q(serial_numbers__status=SerialNumber.Status.ALLOCATED)
+			),
+			sold_count=Count(
+				'serial_numbers',
+				filter=Q(serial_numbers__status=SerialNumber.Status.SOLD)
+			),
+		)
+
+	def with_stock_summary(self):
+		"""Annotate the same counts from the denormalized StockSummary row."""
+		return self.annotate(
+			model_summary=FilteredRelation(
+				'stock_summaries',
+				condition=Q(stock_summaries__wholesaler__isnull=True)
+			),
+			total_count=Coalesce(F('model_summary__total_count'), Value(0)),
+			available_count=Coalesce(F('model_summary__available_count'), Value(0)),
+			allocated_count=Coalesce(F('model_summary__allocated_count'), Value(0)),
+			sold_count=Coalesce(F('model_summary__sold_count'), Value(0)),
+		)
+
+
 class BatteryModel(TimeStampedModel):
 	"""Battery model master data."""
 
@@ -22,6 +58,8 @@ class BatteryModel(TimeStampedModel):
 	description = models.TextField(blank=True)
 	is_active = models.BooleanField(default=True)
 
+	objects = BatteryModelQuerySet.as_manager()
+
 	class Meta:
 		db_table = 'battery_models'
 		ordering = ['-created_at']
@@ -29,20 +67,31 @@ class BatteryModel(TimeStampedModel):
 	def __str__(self):
 		return f'{self.name} ({self.sku})'
 
+	# Stock properties prefer the counts annotated by with_stock_counts()
+	# and only fall back to a COUNT query when the annotation is absent.
+
 	@property
 	def total_stock(self):
+		if hasattr(self, 'total_count'):
+			return self.total_count
 		return self.serial_numbers.count()
 
 	@property
 	def available_stock(self):
+		if hasattr(self, 'available_count'):
+			return self.available_count
 		return self.serial_numbers.filter(status=SerialNumber.Status.AVAILABLE).count()
 
 	@property
 	def allocated_stock(self):
+		if hasattr(self, 'allocated_count'):
+			return self.allocated_count
 		return self.serial_numbers.filter(status=SerialNumber.Status.ALLOCATED).count()
 
 	@property
 	def sold_stock(self):
+		if hasattr(self, 'sold_count'):
+			return self.sold_count
 		return self.serial_numbers.filter(status=SerialNumber.Status.SOLD).count()
 
 
@@ -148,36 +197,94 @@ class SerialNumber(TimeStampedModel):
 	class Meta:
 		db_table = 'battery_serial_numbers'
 		ordering = ['-created_at']
+		indexes = [
+			# Keyset pagination walks (created_at, id) newest first.
+			models.Index(fields=['created_at', 'id'], name='serial_created_id_idx'),
+			# Sales rollups scan sold serials by sale time.
+			models.Index(
+				fields=['sold_at'],
+				condition=Q(sold_at__isnull=False),
+				name='serial_sold_at_idx'
+			),
+			# Allocation picks the oldest AVAILABLE serials of a model.
+			models.Index(
+				fields=['battery_model', 'created_at'],
+				condition=Q(status='AVAILABLE'),
+				name='serial_available_fifo_idx'
+			),
+			# Wholesaler serial listing, newest first.
+			models.Index(
+				fields=['allocated_to', '-created_at'],
+				name='serial_allocated_to_idx'
+			),
+			models.Index(fields=['status', '-created_at'], name='serial_status_created_idx'),
+		]
 
 	def __str__(self):
 		return self.serial_number
 
 	@classmethod
 	def create_batch(cls, battery_model, quantity, prefix='LV'):
-		"""Create a batch of serial numbers for a battery model."""
-		serials = []
-		for _ in range(quantity):
-			serials.append(
-				cls(
-					battery_model=battery_model,
-					serial_number=generate_serial_number(prefix=prefix)
-				)
-			)
-		return cls.objects.bulk_create(serials)
+		"""Create a batch of serial numbers for a battery model.
+
+		Returns the number of serials created rather than the serials
+		themselves, so large batches are never held in memory; query the
+		model's serial_numbers to work with them.
+		"""
+		from .services import generate_serials
+
+		return generate_serials(battery_model, quantity, prefix=prefix)
 
 	def allocate_to(self, wholesaler):
 		"""Mark this serial as allocated to a wholesaler."""
+		from .services import record_serial_transition
+
+		previous_status = self.status
+		previous_wholesaler_id = self.allocated_to_id
 		self.status = self.Status.ALLOCATED
 		self.allocated_to = wholesaler
 		self.allocated_at = timezone.now()
-		self.save(update_fields=['status', 'allocated_to', 'allocated_at'])
+		with transaction.atomic():
+			self.save(update_fields=['status', 'allocated_to', 'allocated_at'])
+			record_serial_transition(
+				self.battery_model_id,
+				previous_status,
+				self.status,
+				from_wholesaler_id=previous_wholesaler_id,
+				to_wholesaler_id=self.allocated_to_id
+			)
 
 	def mark_sold(self, consumer):
 		"""Mark this serial as sold to a consumer."""
+		from .services import record_serial_transition
+
+		previous_status = self.status
 		self.status = self.Status.SOLD
 		self.sold_to = consumer
 		self.sold_at = timezone.now()
-		self.save(update_fields=['status', 'sold_to', 'sold_at'])
+		with transaction.atomic():
+			self.save(update_fields=['status', 'sold_to', 'sold_at'])
+			record_serial_transition(
+				self.battery_model_id,
+				previous_status,
+				self.status,
+				from_wholesaler_id=self.allocated_to_id,
+				to_wholesaler_id=self.allocated_to_id
+			)
+
+
+class SerialSequence(TimeStampedModel):
+	"""Monotonic counter backing generated serial numbers for a prefix."""
+
+	prefix = models.CharField(max_length=10, unique=True)
+	last_value = models.BigIntegerField(default=0)
+
+	class Meta:
+		db_table = 'serial_sequences'
+		ordering = ['prefix']
+
+	def __str__(self):
+		return f'{self.prefix} ({self.last_value})'
 
 
 class StockAllocation(TimeStampedModel):
@@ -209,3 +316,78 @@ class StockAllocation(TimeStampedModel):
 
 	def __str__(self):
 		return f'{self.battery_model} -> {self.wholesaler} ({self.quantity})'
+
+
+class StockAllocationRange(models.Model):
+	"""Contiguous run of serial ids taken by a stock allocation.
+
+	Allocations take the oldest serials of a model, which were generated in
+	bulk with consecutive ids, so a whole allocation usually fits in one or
+	a few rows.
+	"""
+
+	allocation = models.ForeignKey(
+		StockAllocation,
+		on_delete=models.CASCADE,
+		related_name='serial_ranges'
+	)
+	start_serial_id = models.BigIntegerField()
+	end_serial_id = models.BigIntegerField()
+	serial_count = models.PositiveIntegerField()
+
+	class Meta:
+		db_table = 'stock_allocation_ranges'
+		ordering = ['allocation_id', 'start_serial_id']
+		indexes = [
+			models.Index(fields=['allocation', 'start_serial_id'], name='allocation_range_start_idx'),
+		]
+
+	def __str__(self):
+		return f'{self.allocation_id}: {self.start_serial_id}-{self.end_serial_id}'
+
+
+class StockSummary(TimeStampedModel):
+	"""Denormalized serial counts per battery model, optionally per wholesaler.
+
+	The row with an empty wholesaler holds the totals for the battery model.
+	Wholesaler rows track the serials allocated to (and later sold by) that
+	wholesaler, so their available_count is always zero. Rows are maintained
+	by apps.inventory.services.record_serial_transition and can be rebuilt
+	with the rebuild_stock_summary management command.
+	"""
+
+	battery_model = models.ForeignKey(
+		BatteryModel,
+		on_delete=models.CASCADE,
+		related_name='stock_summaries'
+	)
+	wholesaler = models.ForeignKey(
+		User,
+		on_delete=models.CASCADE,
+		null=True,
+		blank=True,
+		related_name='stock_summaries'
+	)
+	total_count = models.IntegerField(default=0)
+	available_count = models.IntegerField(default=0)
+	allocated_count = models.IntegerField(default=0)
+	sold_count = models.IntegerField(default=0)
+
+	class Meta:
+		db_table = 'stock_summaries'
+		ordering = ['battery_model_id', 'wholesaler_id']
+		constraints = [
+			models.UniqueConstraint(
+				fields=['battery_model'],
+				condition=Q(wholesaler__isnull=True),
+				name='stock_summary_unique_model_total'
+			),
+			models.UniqueConstraint(
+				fields=['battery_model', 'wholesaler'],
+				name='stock_summary_unique_model_wholesaler'
+			),
+		]
+
+	def __str__(self):
+		scope = self.wholesaler_id or 'all'
+		return f'{self.battery_model_id}/{scope}: {self.available_count} available'
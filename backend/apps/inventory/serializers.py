@@ -1,4 +1,5 @@
 """Serializers for inventory models."""
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
@@ -103,14 +104,18 @@ class StockAllocationSerializer(serializers.ModelSerializer):
         read_only_fields = ['allocated_by', 'created_at']
 
 
-class StockAllocationCreateSerializer(serializers.Serializer):
-    """Serializer for allocating stock to wholesalers."""
+class StockAllocationLineSerializer(serializers.Serializer):
+    """A single allocation line; ids are checked by the caller."""
 
     battery_model_id = serializers.IntegerField()
     wholesaler_id = serializers.IntegerField()
     quantity = serializers.IntegerField(min_value=1)
     notes = serializers.CharField(required=False, allow_blank=True)
 
+
+class StockAllocationCreateSerializer(StockAllocationLineSerializer):
+    """Serializer for allocating stock to wholesalers."""
+
     def validate_battery_model_id(self, value):
         if not BatteryModel.objects.filter(id=value).exists():
             raise serializers.ValidationError('Battery model not found')
@@ -120,3 +125,13 @@ class StockAllocationCreateSerializer(serializers.Serializer):
         if not User.objects.filter(id=value, role='WHOLESALER', is_active=True).exists():
             raise serializers.ValidationError('Wholesaler not found or inactive')
         return value
+
+
+class StockAllocationBulkCreateSerializer(serializers.Serializer):
+    """Serializer for allocating many lines in one request."""
+
+    allocations = StockAllocationLineSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.STOCK_ALLOCATION_BULK_MAX_LINES
+    )
@@ -0,0 +1,651 @@
+"""Inventory service helpers for serial generation and stock bookkeeping."""
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+
+from core.dashboard import invalidate_admin_metrics
+from core.utils import format_serial_number, generate_serial_suffix
+
+from .models import (
+	BatteryModel,
+	SerialNumber,
+	SerialSequence,
+	StockAllocation,
+	StockAllocationRange,
+	StockSummary,
+)
+
+User = get_user_model()
+
+
+STATUS_COUNT_FIELDS = {
+	SerialNumber.Status.AVAILABLE: 'available_count',
+	SerialNumber.Status.ALLOCATED: 'allocated_count',
+	SerialNumber.Status.SOLD: 'sold_count',
+}
+
+# Wholesaler rows only track serials held by the wholesaler.
+WHOLESALER_STATUSES = (SerialNumber.Status.ALLOCATED, SerialNumber.Status.SOLD)
+
+SERIAL_NUMBER_DIGITS = 10
+SERIAL_SUFFIX_LENGTH = 6
+SERIAL_GENERATION_CHUNK_SIZE = 2000
+
+
+class InsufficientStockError(Exception):
+	"""Raised when fewer serials are available than an allocation requests."""
+
+
+def _status_deltas(from_status, to_status, count):
+	"""Return counter deltas for moving `count` serials between statuses.
+
+	A status of None means the serial enters (or leaves) the scope of the row.
+	"""
+	deltas = defaultdict(int)
+	if from_status is None:
+		deltas['total_count'] += count
+	else:
+		deltas[STATUS_COUNT_FIELDS[from_status]] -= count
+	if to_status is None:
+		deltas['total_count'] -= count
+	else:
+		deltas[STATUS_COUNT_FIELDS[to_status]] += count
+	return {field: delta for field, delta in deltas.items() if delta}
+
+
+def _wholesaler_status(status):
+	return status if status in WHOLESALER_STATUSES else None
+
+
+def adjust_stock_summary(battery_model_id, wholesaler_id=None, deltas=None, create_missing=True):
+	"""Apply counter deltas to a summary row, creating it on first use."""
+	if not deltas:
+		return
+	if wholesaler_id is None:
+		invalidate_admin_metrics()
+	updates = {field: F(field) + delta for field, delta in deltas.items()}
+	summary_rows = StockSummary.objects.filter(
+		battery_model_id=battery_model_id,
+		wholesaler_id=wholesaler_id
+	)
+	if summary_rows.update(updated_at=timezone.now(), **updates) or not create_missing:
+		return
+	try:
+		with transaction.atomic():
+			StockSummary.objects.create(
+				battery_model_id=battery_model_id,
+				wholesaler_id=wholesaler_id,
+				**deltas
+			)
+	except IntegrityError:
+		# Another transaction created the row first; apply the delta to it.
+		summary_rows.update(updated_at=timezone.now(), **updates)
+
+
+def record_serial_transition(
+	battery_model_id,
+	from_status,
+	to_status,
+	count=1,
+	from_wholesaler_id=None,
+	to_wholesaler_id=None,
+	create_missing=True
+):
+	"""Keep StockSummary rows in step with serial status changes.
+
+	Use from_status=None for newly created serials and to_status=None for
+	deleted ones. Wholesaler ids are the serial's allocated_to before and
+	after the change.
+	"""
+	if not count:
+		return
+	with transaction.atomic():
+		adjust_stock_summary(
+			battery_model_id,
+			deltas=_status_deltas(from_status, to_status, count),
+			create_missing=create_missing
+		)
+
+		from_held = _wholesaler_status(from_status) if from_wholesaler_id else None
+		to_held = _wholesaler_status(to_status) if to_wholesaler_id else None
+		if from_wholesaler_id and from_wholesaler_id == to_wholesaler_id:
+			if from_held != to_held:
+				adjust_stock_summary(
+					battery_model_id,
+					from_wholesaler_id,
+					_status_deltas(from_held, to_held, count),
+					create_missing=create_missing
+				)
+			return
+		if from_held:
+			adjust_stock_summary(
+				battery_model_id,
+				from_wholesaler_id,
+				_status_deltas(from_held, None, count),
+				create_missing=create_missing
+			)
+		if to_held:
+			adjust_stock_summary(
+				battery_model_id,
+				to_wholesaler_id,
+				_status_deltas(None, to_held, count),
+				create_missing=create_missing
+			)
+
+
+def compute_stock_summaries(battery_model_ids=None):
+	"""Compute summary counts from battery_serial_numbers.
+
+	Returns a dict keyed by (battery_model_id, wholesaler_id) with the
+	counter values each StockSummary row should hold.
+	"""
+	serials = SerialNumber.objects.order_by()
+	if battery_model_ids is not None:
+		serials = serials.filter(battery_model_id__in=battery_model_ids)
+
+	expected = defaultdict(lambda: defaultdict(int))
+	for row in serials.values('battery_model_id', 'status').annotate(count=Count('id')):
+		counts = expected[(row['battery_model_id'], None)]
+		counts['total_count'] += row['count']
+		counts[STATUS_COUNT_FIELDS[row['status']]] += row['count']
+
+	held = serials.filter(
+		allocated_to__isnull=False,
+		status__in=WHOLESALER_STATUSES
+	).values('battery_model_id', 'allocated_to_id', 'status').annotate(count=Count('id'))
+	for row in held:
+		counts = expected[(row['battery_model_id'], row['allocated_to_id'])]
+		counts['total_count'] += row['count']
+		counts[STATUS_COUNT_FIELDS[row['status']]] += row['count']
+	return expected
+
+
+def _lock_stock_summaries():
+	"""Block summary writes, including row creation, until the transaction ends."""
+	if connection.vendor == 'postgresql':
+		with connection.cursor() as cursor:
+			cursor.execute(
+				f'LOCK TABLE {StockSummary._meta.db_table} IN SHARE ROW EXCLUSIVE MODE'
+			)
+
+
+@transaction.atomic
+def rebuild_stock_summaries(battery_model_ids=None, dry_run=False):
+	"""Reconcile StockSummary rows with the serial table.
+
+	Returns the list of (battery_model_id, wholesaler_id) keys whose stored
+	counts differed from the recomputed ones.
+	"""
+	counter_fields = ['total_count', 'available_count', 'allocated_count', 'sold_count']
+	existing_rows = StockSummary.objects.all()
+	if battery_model_ids is not None:
+		existing_rows = existing_rows.filter(battery_model_id__in=battery_model_ids)
+	if not dry_run:
+		# Lock before aggregating: transitions committed earlier are then in
+		# the counts, and later ones wait and apply their deltas on top.
+		_lock_stock_summaries()
+		existing_rows = existing_rows.select_for_update()
+	existing = {(row.battery_model_id, row.wholesaler_id): row for row in existing_rows}
+	expected = compute_stock_summaries(battery_model_ids)
+
+	drifted = []
+	to_create = []
+	to_update = []
+	for key, counts in expected.items():
+		row = existing.pop(key, None)
+		values = {field: counts.get(field, 0) for field in counter_fields}
+		if row is None:
+			drifted.append(key)
+			to_create.append(
+				StockSummary(battery_model_id=key[0], wholesaler_id=key[1], **values)
+			)
+			continue
+		if any(getattr(row, field) != value for field, value in values.items()):
+			drifted.append(key)
+			for field, value in values.items():
+				setattr(row, field, value)
+			row.updated_at = timezone.now()
+			to_update.append(row)
+
+	stale_ids = [row.id for row in existing.values() if any(getattr(row, f) for f in counter_fields)]
+	drifted.extend(key for key, row in existing.items() if row.id in stale_ids)
+
+	if not dry_run:
+		StockSummary.objects.bulk_create(to_create, batch_size=1000)
+		StockSummary.objects.bulk_update(to_update, counter_fields + ['updated_at'], batch_size=1000)
+		StockSummary.objects.filter(id__in=[row.id for row in existing.values()]).delete()
+	return drifted
+
+
+def reserve_serial_values(prefix, size):
+	"""Reserve `size` consecutive sequence values for a prefix.
+
+	Returns the first reserved value. The sequence row is locked only for
+	the duration of the increment, so concurrent batches do not serialize
+	on their inserts.
+	"""
+	with transaction.atomic():
+		sequence, _ = SerialSequence.objects.select_for_update().get_or_create(prefix=prefix)
+		first_value = sequence.last_value + 1
+		sequence.last_value += size
+		sequence.save(update_fields=['last_value', 'updated_at'])
+	return first_value
+
+
+def generate_serials(
+	battery_model,
+	quantity,
+	prefix='LV',
+	chunk_size=SERIAL_GENERATION_CHUNK_SIZE,
+	on_chunk=None
+):
+	"""Create `quantity` AVAILABLE serials for a battery model.
+
+	Serial numbers come from the per-prefix SerialSequence, so a batch never
+	collides with itself, followed by SERIAL_SUFFIX_LENGTH random characters
+	so that knowing one serial does not reveal its neighbours to the public
+	verification endpoint. Each chunk is checked against existing serials
+	(for example legacy random ones) in a single query; taken values are
+	skipped and made up from the next chunk. Inserts use ignore_conflicts so
+	a concurrent writer cannot abort the batch, and memory stays bounded by
+	chunk_size regardless of quantity.
+
+	Returns the number of serials created. on_chunk, if given, is called
+	with the running total after each chunk.
+	"""
+	created = 0
+	while created < quantity:
+		size = min(chunk_size, quantity - created)
+		first_value = reserve_serial_values(prefix, size)
+		candidates = [
+			format_serial_number(
+				prefix, value, SERIAL_NUMBER_DIGITS, generate_serial_suffix(SERIAL_SUFFIX_LENGTH)
+			)
+			for value in range(first_value, first_value + size)
+		]
+		taken = set(
+			SerialNumber.objects.filter(serial_number__in=candidates)
+			.values_list('serial_number', flat=True)
+		)
+		fresh = [candidate for candidate in candidates if candidate not in taken]
+		if not fresh:
+			continue
+
+		with transaction.atomic():
+			SerialNumber.objects.bulk_create(
+				[SerialNumber(battery_model=battery_model, serial_number=value) for value in fresh],
+				ignore_conflicts=True
+			)
+			inserted = SerialNumber.objects.filter(
+				battery_model=battery_model,
+				serial_number__in=fresh
+			).count()
+			record_serial_transition(
+				battery_model.id,
+				None,
+				SerialNumber.Status.AVAILABLE,
+				count=inserted
+			)
+		created += inserted
+		if on_chunk:
+			on_chunk(created)
+	return created
+
+
+def _allocate_with_update_returning(battery_model_id, wholesaler_id, quantity, allocated_at):
+	"""Postgres: lock and allocate the oldest unlocked serials in one statement.
+
+	The candidates are picked in a CTE, which Postgres evaluates exactly
+	once. In an IN (...) subquery the planner may rescan the LIMIT for every
+	outer row, and since rows it already updated are no longer AVAILABLE,
+	each rescan would claim further serials.
+	"""
+	table = SerialNumber._meta.db_table
+	with connection.cursor() as cursor:
+		cursor.execute(
+			f"""
+			WITH picked AS (
+				SELECT id FROM {table}
+				WHERE battery_model_id = %s AND status = %s
+				ORDER BY created_at
+				LIMIT %s
+				FOR UPDATE SKIP LOCKED
+			)
+			UPDATE {table} AS serial
+			SET status = %s, allocated_to_id = %s, allocated_at = %s
+			FROM picked
+			WHERE serial.id = picked.id
+			RETURNING serial.id
+			""",
+			[
+				battery_model_id,
+				SerialNumber.Status.AVAILABLE,
+				quantity,
+				SerialNumber.Status.ALLOCATED,
+				wholesaler_id,
+				allocated_at,
+			]
+		)
+		return [row[0] for row in cursor.fetchall()]
+
+
+def _allocate_with_recheck(battery_model_id, wholesaler_id, quantity, allocated_at):
+	"""Portable fallback: claim candidates with a status-guarded UPDATE.
+
+	Backends that support it (MySQL) still skip locked rows; on SQLite the
+	row lock is a no-op and writers serialize on the database lock, so the
+	status guard makes a lost race retry with fresh candidates instead of
+	double-allocating.
+	"""
+	available = SerialNumber.objects.filter(
+		battery_model_id=battery_model_id,
+		status=SerialNumber.Status.AVAILABLE
+	).order_by('created_at')
+
+	allocated_ids = []
+	while len(allocated_ids) < quantity:
+		candidate_ids = list(
+			available.select_for_update(skip_locked=True)
+			.values_list('id', flat=True)[:quantity - len(allocated_ids)]
+		)
+		if not candidate_ids:
+			break
+		SerialNumber.objects.filter(
+			id__in=candidate_ids,
+			status=SerialNumber.Status.AVAILABLE
+		).update(
+			status=SerialNumber.Status.ALLOCATED,
+			allocated_to_id=wholesaler_id,
+			allocated_at=allocated_at
+		)
+		allocated_ids.extend(
+			SerialNumber.objects.filter(
+				id__in=candidate_ids,
+				status=SerialNumber.Status.ALLOCATED,
+				allocated_to_id=wholesaler_id,
+				allocated_at=allocated_at
+			).values_list('id', flat=True)
+		)
+	return allocated_ids
+
+
+def allocate_serials(battery_model_id, wholesaler_id, quantity, record_transition=True):
+	"""Allocate the oldest `quantity` AVAILABLE serials of a model to a wholesaler.
+
+	Only the rows being taken are locked (FOR UPDATE SKIP LOCKED), so
+	concurrent allocations of the same model proceed in parallel and never
+	receive the same serial. The StockSummary counter update is the only
+	shared row lock and is taken last, so it is held just until commit.
+
+	Runs in a savepoint: if fewer than `quantity` serials can be taken,
+	nothing is allocated and InsufficientStockError is raised. Returns the
+	allocated serial ids. Pass record_transition=False when the caller
+	applies the counter deltas itself.
+	"""
+	allocated_at = timezone.now()
+	with transaction.atomic():
+		if connection.vendor == 'postgresql':
+			allocated_ids = _allocate_with_update_returning(
+				battery_model_id, wholesaler_id, quantity, allocated_at
+			)
+		else:
+			allocated_ids = _allocate_with_recheck(
+				battery_model_id, wholesaler_id, quantity, allocated_at
+			)
+		if len(allocated_ids) < quantity:
+			raise InsufficientStockError(
+				f'Only {len(allocated_ids)} of {quantity} serials available to allocate'
+			)
+		if record_transition:
+			record_serial_transition(
+				battery_model_id,
+				SerialNumber.Status.AVAILABLE,
+				SerialNumber.Status.ALLOCATED,
+				count=len(allocated_ids),
+				to_wholesaler_id=wholesaler_id
+			)
+	return allocated_ids
+
+
+def serial_id_ranges(serial_ids):
+	"""Collapse serial ids into sorted (start_id, end_id, count) runs."""
+	ranges = []
+	for serial_id in sorted(serial_ids):
+		if ranges and ranges[-1][1] == serial_id - 1:
+			start_id, _, count = ranges[-1]
+			ranges[-1] = (start_id, serial_id, count + 1)
+		else:
+			ranges.append((serial_id, serial_id, 1))
+	return ranges
+
+
+def record_allocation_ranges(allocated):
+	"""Write the serial ledger for (allocation, serial_ids) pairs in one insert."""
+	StockAllocationRange.objects.bulk_create([
+		StockAllocationRange(
+			allocation=allocation,
+			start_serial_id=start_id,
+			end_serial_id=end_id,
+			serial_count=count
+		)
+		for allocation, serial_ids in allocated
+		for start_id, end_id, count in serial_id_ranges(serial_ids)
+	])
+
+
+class AllocatedSerials:
+	"""Sliceable view of an allocation's serials, ordered by id.
+
+	Pagination only reads the ledger rows and the serials on the requested
+	page, so listing a large allocation never scans battery_serial_numbers.
+	"""
+
+	def __init__(self, allocation):
+		self.ranges = list(
+			allocation.serial_ranges.order_by('start_serial_id')
+			.values_list('start_serial_id', 'serial_count')
+		)
+
+	def count(self):
+		return sum(count for _, count in self.ranges)
+
+	def __len__(self):
+		return self.count()
+
+	def __getitem__(self, key):
+		if not isinstance(key, slice):
+			raise TypeError('AllocatedSerials only supports slicing')
+		start, stop, _ = key.indices(self.count())
+		serial_ids = []
+		offset = 0
+		for start_id, count in self.ranges:
+			if offset >= stop:
+				break
+			if offset + count > start:
+				first = max(start - offset, 0)
+				last = min(stop - offset, count)
+				serial_ids.extend(range(start_id + first, start_id + last))
+			offset += count
+		return list(
+			SerialNumber.objects.filter(id__in=serial_ids)
+			.select_related('battery_model')
+			.order_by('id')
+		)
+
+
+def _lock_available_serial_ids(battery_model_id, quantity):
+	"""Lock and return the ids of the oldest `quantity` AVAILABLE serials of a model.
+
+	Rows held by concurrent allocations are skipped rather than waited on.
+	"""
+	return list(
+		SerialNumber.objects
+		.select_for_update(skip_locked=True)
+		.filter(battery_model_id=battery_model_id, status=SerialNumber.Status.AVAILABLE)
+		.order_by('created_at')
+		.values_list('id', flat=True)[:quantity]
+	)
+
+
+def _claim_serials(serial_ids_by_wholesaler, allocated_at):
+	"""Allocate locked serials to their wholesalers with a single UPDATE.
+
+	Returns the number of rows updated.
+	"""
+	if connection.vendor == 'postgresql':
+		serial_ids = []
+		wholesaler_ids = []
+		for wholesaler_id, ids in serial_ids_by_wholesaler.items():
+			serial_ids.extend(ids)
+			wholesaler_ids.extend([wholesaler_id] * len(ids))
+		table = SerialNumber._meta.db_table
+		with connection.cursor() as cursor:
+			# Arrays keep the statement at five parameters however many serials move.
+			cursor.execute(
+				f"""
+				UPDATE {table} AS serial
+				SET status = %s, allocated_to_id = claim.wholesaler_id, allocated_at = %s
+				FROM unnest(%s::bigint[], %s::bigint[]) AS claim(id, wholesaler_id)
+				WHERE serial.id = claim.id AND serial.status = %s
+				""",
+				[
+					SerialNumber.Status.ALLOCATED,
+					allocated_at,
+					serial_ids,
+					wholesaler_ids,
+					SerialNumber.Status.AVAILABLE,
+				]
+			)
+			return cursor.rowcount
+
+	if len(serial_ids_by_wholesaler) == 1:
+		allocated_to = next(iter(serial_ids_by_wholesaler))
+	else:
+		allocated_to = Case(*[
+			When(id__in=ids, then=Value(wholesaler_id))
+			for wholesaler_id, ids in serial_ids_by_wholesaler.items()
+		])
+	return SerialNumber.objects.filter(
+		id__in=[serial_id for ids in serial_ids_by_wholesaler.values() for serial_id in ids],
+		status=SerialNumber.Status.AVAILABLE
+	).update(
+		status=SerialNumber.Status.ALLOCATED,
+		allocated_to_id=allocated_to,
+		allocated_at=allocated_at
+	)
+
+
+def allocate_stock_lines(lines, allocated_by):
+	"""Allocate many (battery_model_id, wholesaler_id, quantity) lines at once.
+
+	Models and wholesalers are validated with one query each. Per battery
+	model, the serials for all its lines are locked with one SELECT and
+	handed out with one UPDATE, so the query count depends on the number of
+	models and (model, wholesaler) pairs, not on the number of lines. Lines
+	take the oldest remaining serials in input order; a line that asks for
+	more than is left is reported without undoing the others. Models are
+	processed in id order to keep lock acquisition consistent between
+	concurrent batches; counter deltas, StockAllocation rows and their
+	serial ranges are written once for the whole batch.
+
+	Returns one result dict per input line, in input order.
+	"""
+	model_ids = {line['battery_model_id'] for line in lines}
+	wholesaler_ids = {line['wholesaler_id'] for line in lines}
+	known_models = set(
+		BatteryModel.objects.filter(id__in=model_ids).values_list('id', flat=True)
+	)
+	known_wholesalers = set(
+		User.objects.filter(
+			id__in=wholesaler_ids,
+			role='WHOLESALER',
+			is_active=True
+		).values_list('id', flat=True)
+	)
+
+	results = [None] * len(lines)
+	lines_per_model = defaultdict(list)
+	for index, line in enumerate(lines):
+		result = {
+			'line': index,
+			'battery_model_id': line['battery_model_id'],
+			'wholesaler_id': line['wholesaler_id'],
+			'quantity': line['quantity'],
+		}
+		results[index] = result
+		if line['battery_model_id'] not in known_models:
+			result.update(status='error', error='Battery model not found')
+		elif line['wholesaler_id'] not in known_wholesalers:
+			result.update(status='error', error='Wholesaler not found or inactive')
+		else:
+			lines_per_model[line['battery_model_id']].append(index)
+
+	allocations = []
+	allocated_per_model = defaultdict(int)
+	allocated_per_holder = defaultdict(int)
+	allocated_at = timezone.now()
+
+	with transaction.atomic():
+		for battery_model_id in sorted(lines_per_model):
+			indexes = lines_per_model[battery_model_id]
+			available_ids = _lock_available_serial_ids(
+				battery_model_id,
+				sum(lines[index]['quantity'] for index in indexes)
+			)
+			taken = 0
+			serial_ids_by_wholesaler = defaultdict(list)
+			for index in indexes:
+				line = lines[index]
+				quantity = line['quantity']
+				if len(available_ids) - taken < quantity:
+					results[index].update(status='error', error='Not enough available stock to allocate')
+					continue
+				serial_ids = available_ids[taken:taken + quantity]
+				taken += quantity
+				serial_ids_by_wholesaler[line['wholesaler_id']].extend(serial_ids)
+
+				results[index]['status'] = 'allocated'
+				allocated_per_model[battery_model_id] += quantity
+				allocated_per_holder[(battery_model_id, line['wholesaler_id'])] += quantity
+				allocations.append((index, StockAllocation(
+					battery_model_id=battery_model_id,
+					wholesaler_id=line['wholesaler_id'],
+					allocated_by=allocated_by,
+					quantity=quantity,
+					notes=line.get('notes', '')
+				), serial_ids))
+
+			if taken and _claim_serials(serial_ids_by_wholesaler, allocated_at) != taken:
+				# Only possible without row locks (SQLite), where writers serialize anyway.
+				raise InsufficientStockError('Serials were allocated concurrently; retry the batch')
+
+		for battery_model_id in sorted(allocated_per_model):
+			adjust_stock_summary(
+				battery_model_id,
+				deltas=_status_deltas(
+					SerialNumber.Status.AVAILABLE,
+					SerialNumber.Status.ALLOCATED,
+					allocated_per_model[battery_model_id]
+				)
+			)
+		for (battery_model_id, wholesaler_id) in sorted(allocated_per_holder):
+			adjust_stock_summary(
+				battery_model_id,
+				wholesaler_id,
+				_status_deltas(
+					None,
+					SerialNumber.Status.ALLOCATED,
+					allocated_per_holder[(battery_model_id, wholesaler_id)]
+				)
+			)
+
+		StockAllocation.objects.bulk_create([allocation for _, allocation, _ in allocations])
+		record_allocation_ranges(
+			(allocation, serial_ids) for _, allocation, serial_ids in allocations
+		)
+		for index, allocation, _ in allocations:
+			results[index]['allocation_id'] = allocation.id
+	return results
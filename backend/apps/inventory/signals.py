@@ -0,0 +1,22 @@
+"""
+Signals for inventory app to keep stock summaries in step with serials.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import SerialNumber
+from .services import record_serial_transition
+
+
+@receiver(post_save, sender=SerialNumber)
+def count_created_serial(sender, instance, created, raw=False, **kwargs):
+    """Count serials created one at a time (admin, fixtures)."""
+    if not created or raw:
+        return
+    record_serial_transition(
+        instance.battery_model_id,
+        None,
+        instance.status,
+        to_wholesaler_id=instance.allocated_to_id
+    )
+
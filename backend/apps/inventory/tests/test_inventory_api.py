@@ -1,9 +1,21 @@
+import re
+import threading
+
 import pytest
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 
 from apps.users.models import User
-from apps.inventory.models import BatteryModel, SerialNumber, StockAllocation
+from apps.inventory.models import (
+    BatteryModel, SerialNumber, SerialSequence, StockAllocation, StockSummary
+)
+from apps.inventory.services import (
+    InsufficientStockError, allocate_serials, compute_stock_summaries, generate_serials,
+    rebuild_stock_summaries
+)
 
 
 @pytest.fixture()
@@ -131,3 +143,367 @@ def test_low_stock(api_client, admin_user):
 
     assert response.status_code == 200
     assert len(response.data) == 1
+
+
+@pytest.mark.django_db
+def test_battery_model_list_stock_counts_single_query(
+    api_client, admin_user, wholesaler_user, django_assert_num_queries
+):
+    api_client.force_authenticate(user=admin_user)
+    for idx in range(5):
+        model = BatteryModel.objects.create(
+            name=f'Lithovolt 12V {idx}',
+            sku=f'LV-12V-Q{idx}',
+            warranty_months=12,
+        )
+        SerialNumber.create_batch(model, 4)
+        serial = SerialNumber.objects.filter(battery_model=model).first()
+        serial.allocate_to(wholesaler_user)
+
+    url = reverse('battery-model-list')
+    # One COUNT for pagination plus one grouped query for the page.
+    with django_assert_num_queries(2):
+        response = api_client.get(url)
+
+    assert response.status_code == 200
+    for item in response.data['results']:
+        assert item['total_stock'] == 4
+        assert item['available_stock'] == 3
+        assert item['allocated_stock'] == 1
+        assert item['sold_stock'] == 0
+
+
+@pytest.mark.django_db
+def test_stock_summary_tracks_serial_transitions(api_client, admin_user, wholesaler_user):
+    api_client.force_authenticate(user=admin_user)
+    model = BatteryModel.objects.create(name='Lithovolt 24V 50Ah', sku='LV-24V-050')
+    SerialNumber.create_batch(model, 5)
+
+    response = api_client.post(
+        reverse('stock-allocation-list'),
+        {'battery_model_id': model.id, 'wholesaler_id': wholesaler_user.id, 'quantity': 3},
+        format='json'
+    )
+    assert response.status_code == 201
+
+    consumer = User.objects.create_user(email='buyer@test.com', first_name='Buyer')
+    SerialNumber.objects.filter(allocated_to=wholesaler_user).first().mark_sold(consumer)
+
+    totals = StockSummary.objects.get(battery_model=model, wholesaler__isnull=True)
+    assert (totals.total_count, totals.available_count, totals.allocated_count, totals.sold_count) == (5, 2, 2, 1)
+    held = StockSummary.objects.get(battery_model=model, wholesaler=wholesaler_user)
+    assert (held.total_count, held.allocated_count, held.sold_count) == (3, 2, 1)
+
+
+@pytest.mark.django_db
+def test_rebuild_stock_summary_command(wholesaler_user):
+    model = BatteryModel.objects.create(name='Lithovolt 24V 60Ah', sku='LV-24V-060')
+    SerialNumber.create_batch(model, 4)
+    SerialNumber.objects.filter(battery_model=model).first().allocate_to(wholesaler_user)
+    StockSummary.objects.filter(battery_model=model).update(available_count=99)
+    SerialNumber.objects.filter(battery_model=model, status=SerialNumber.Status.AVAILABLE).first().delete()
+
+    call_command('rebuild_stock_summary')
+
+    totals = StockSummary.objects.get(battery_model=model, wholesaler__isnull=True)
+    assert (totals.total_count, totals.available_count, totals.allocated_count) == (3, 2, 1)
+    assert StockSummary.objects.get(battery_model=model, wholesaler=wholesaler_user).allocated_count == 1
+
+
+@pytest.mark.django_db
+def test_allocation_query_uses_index_scan():
+    model = BatteryModel.objects.create(name='Lithovolt 12V 200Ah', sku='LV-12V-200')
+    SerialNumber.create_batch(model, 20)
+    queryset = SerialNumber.objects.filter(
+        battery_model=model,
+        status=SerialNumber.Status.AVAILABLE
+    ).order_by('created_at')[:5]
+
+    if connection.vendor == 'postgresql':
+        # Tiny test tables make a sequential scan cheaper; rule it out.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        assert 'Index' in plan and 'Seq Scan' not in plan
+    else:
+        plan = queryset.explain()
+        assert 'USING INDEX serial_' in plan or 'USING COVERING INDEX serial_' in plan
+
+
+@pytest.mark.django_db
+def test_generate_serials_skips_existing_numbers(monkeypatch):
+    model = BatteryModel.objects.create(name='Lithovolt 48V 100Ah', sku='LV-48V-100')
+    monkeypatch.setattr('apps.inventory.services.generate_serial_suffix', lambda length: 'X' * length)
+    # A legacy serial that collides with the first sequence value.
+    SerialNumber.objects.create(battery_model=model, serial_number='LV0000000001XXXXXX')
+
+    created = generate_serials(model, 25, prefix='LV', chunk_size=10)
+
+    assert created == 25
+    assert SerialNumber.objects.filter(battery_model=model).count() == 26
+    assert SerialNumber.objects.filter(serial_number='LV0000000026XXXXXX').exists()
+    assert SerialSequence.objects.get(prefix='LV').last_value == 26
+    totals = StockSummary.objects.get(battery_model=model, wholesaler__isnull=True)
+    assert totals.available_count == 26
+
+
+@pytest.mark.django_db
+def test_generated_serials_are_not_sequential():
+    model = BatteryModel.objects.create(name='Lithovolt 48V 120Ah', sku='LV-48V-120')
+
+    assert SerialNumber.create_batch(model, 20) == 20
+
+    serials = list(model.serial_numbers.order_by('serial_number').values_list('serial_number', flat=True))
+    assert all(re.fullmatch(r'LV\d{10}[2-9A-HJ-NP-Z]{6}', serial) for serial in serials)
+    assert [serial[:12] for serial in serials] == [f'LV{value:010d}' for value in range(1, 21)]
+    assert len({serial[12:] for serial in serials}) > 1
+
+
+@pytest.mark.django_db
+def test_bulk_allocation_reports_each_line(
+    api_client, admin_user, wholesaler_user, django_assert_max_num_queries
+):
+    api_client.force_authenticate(user=admin_user)
+    second = User.objects.create_user(email='second@test.com', first_name='W2', role='WHOLESALER')
+    model_a = BatteryModel.objects.create(name='Lithovolt 12V 120Ah', sku='LV-12V-120')
+    model_b = BatteryModel.objects.create(name='Lithovolt 12V 150Ah', sku='LV-12V-150')
+    SerialNumber.create_batch(model_a, 6)
+    SerialNumber.create_batch(model_b, 2)
+
+    payload = {'allocations': [
+        {'battery_model_id': model_a.id, 'wholesaler_id': wholesaler_user.id, 'quantity': 2},
+        {'battery_model_id': model_b.id, 'wholesaler_id': second.id, 'quantity': 5},
+        {'battery_model_id': model_a.id, 'wholesaler_id': second.id, 'quantity': 3},
+        {'battery_model_id': model_a.id, 'wholesaler_id': admin_user.id, 'quantity': 1},
+        {'battery_model_id': 999999, 'wholesaler_id': second.id, 'quantity': 1},
+    ]}
+    with django_assert_max_num_queries(25):
+        response = api_client.post(reverse('stock-allocation-bulk'), payload, format='json')
+
+    assert response.status_code == 200
+    assert (response.data['allocated'], response.data['failed']) == (2, 3)
+    assert [line['status'] for line in response.data['results']] == [
+        'allocated', 'error', 'allocated', 'error', 'error'
+    ]
+    assert response.data['results'][1]['error'] == 'Not enough available stock to allocate'
+    bulk_allocation = StockAllocation.objects.get(id=response.data['results'][2]['allocation_id'])
+    assert bulk_allocation.quantity == 3
+    assert bulk_allocation.serial_ranges.get().serial_count == 3
+    assert SerialNumber.objects.filter(battery_model=model_b, status=SerialNumber.Status.AVAILABLE).count() == 2
+
+    totals = StockSummary.objects.get(battery_model=model_a, wholesaler__isnull=True)
+    assert (totals.available_count, totals.allocated_count) == (1, 5)
+    held = StockSummary.objects.get(battery_model=model_a, wholesaler=second)
+    assert (held.total_count, held.allocated_count) == (3, 3)
+
+
+
+@pytest.mark.django_db
+def test_bulk_allocation_query_count_does_not_grow_with_lines(api_client, admin_user, wholesaler_user):
+    api_client.force_authenticate(user=admin_user)
+    second = User.objects.create_user(email='second@test.com', first_name='W2', role='WHOLESALER')
+    model = BatteryModel.objects.create(name='Lithovolt 12V 200Ah', sku='LV-12V-200')
+    SerialNumber.create_batch(model, 40)
+
+    def allocate(line_count):
+        payload = {'allocations': [
+            {
+                'battery_model_id': model.id,
+                'wholesaler_id': (wholesaler_user, second)[index % 2].id,
+                'quantity': 1,
+            }
+            for index in range(line_count)
+        ]}
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse('stock-allocation-bulk'), payload, format='json')
+        assert response.data['allocated'] == line_count
+        return len(queries)
+
+    allocate(2)  # creates the per-wholesaler StockSummary rows
+    assert allocate(2) == allocate(10)
+    assert SerialNumber.objects.filter(allocated_to=wholesaler_user).count() == 7
+    assert SerialNumber.objects.filter(allocated_to=second).count() == 7
+    held = StockSummary.objects.get(battery_model=model, wholesaler=second)
+    assert held.allocated_count == 7
+
+
+@pytest.mark.django_db
+def test_allocation_serials_are_listed_from_range_ledger(api_client, admin_user, wholesaler_user):
+    api_client.force_authenticate(user=admin_user)
+    model = BatteryModel.objects.create(name='Lithovolt 12V 180Ah', sku='LV-12V-180')
+    SerialNumber.create_batch(model, 30)
+    serials = list(SerialNumber.objects.filter(battery_model=model).order_by('id'))
+    other = User.objects.create_user(email='other@test.com', first_name='O', role='WHOLESALER')
+    serials[9].allocate_to(other)
+
+    response = api_client.post(
+        reverse('stock-allocation-list'),
+        {'battery_model_id': model.id, 'wholesaler_id': wholesaler_user.id, 'quantity': 25},
+        format='json'
+    )
+    assert response.status_code == 201
+    allocation = StockAllocation.objects.get(id=response.data['id'])
+    assert list(allocation.serial_ranges.values_list('start_serial_id', 'end_serial_id', 'serial_count')) == [
+        (serials[0].id, serials[8].id, 9),
+        (serials[10].id, serials[25].id, 16),
+    ]
+
+    url = reverse('stock-allocation-serials', args=[allocation.id])
+    api_client.force_authenticate(user=wholesaler_user)
+    response = api_client.get(url, {'page': 2})
+
+    assert response.status_code == 200
+    assert response.data['count'] == 25
+    assert [row['id'] for row in response.data['results']] == [serial.id for serial in serials[21:26]]
+    assert all(row['allocated_to'] == wholesaler_user.id for row in response.data['results'])
+
+
+
+@pytest.mark.django_db
+def test_serial_list_cursor_pagination(api_client, admin_user, django_assert_num_queries):
+    api_client.force_authenticate(user=admin_user)
+    model = BatteryModel.objects.create(name='Lithovolt 12V 90Ah', sku='LV-12V-090')
+    SerialNumber.create_batch(model, 5)
+    # Ties on created_at must still page deterministically by id.
+    SerialNumber.objects.filter(battery_model=model).update(created_at=model.created_at)
+    expected = list(SerialNumber.objects.order_by('-id').values_list('id', flat=True))
+
+    seen = []
+    url = reverse('serial-number-list') + '?pagination=cursor&page_size=2'
+    pages = []
+    while url:
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+        assert response.status_code == 200
+        assert 'count' not in response.data
+        pages.append(response.data)
+        seen.extend(row['id'] for row in response.data['results'])
+        url = response.data['next']
+
+    assert seen == expected
+    assert pages[0]['previous'] is None
+    previous = api_client.get(pages[-1]['previous'])
+    assert [row['id'] for row in previous.data['results']] == expected[2:4]
+
+    legacy = api_client.get(reverse('serial-number-list'))
+    assert legacy.data['count'] == 5
+
+
+requires_row_locks = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='SKIP LOCKED allocation needs a backend with row-level locks'
+)
+
+
+def _run_in_threads(target, count):
+    errors = []
+
+    def runner(index):
+        try:
+            target(index)
+        except Exception as exc:  # surfaced through the errors list
+            errors.append(exc)
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=runner, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return errors
+
+
+@requires_row_locks
+@pytest.mark.django_db(transaction=True)
+def test_parallel_allocations_never_share_serials():
+    model = BatteryModel.objects.create(name='Lithovolt 12V 300Ah', sku='LV-12V-300')
+    SerialNumber.create_batch(model, 60)
+    wholesalers = [
+        User.objects.create_user(email=f'parallel{idx}@test.com', first_name='W', role='WHOLESALER')
+        for idx in range(6)
+    ]
+    results = {}
+    barrier = threading.Barrier(len(wholesalers))
+
+    def allocate(index):
+        barrier.wait()
+        with transaction.atomic():
+            results[index] = allocate_serials(model.id, wholesalers[index].id, 10)
+
+    assert _run_in_threads(allocate, len(wholesalers)) == []
+
+    allocated = [serial_id for ids in results.values() for serial_id in ids]
+    assert len(allocated) == len(set(allocated)) == 60
+    for wholesaler in wholesalers:
+        assert SerialNumber.objects.filter(allocated_to=wholesaler).count() == 10
+    totals = StockSummary.objects.get(battery_model=model, wholesaler__isnull=True)
+    assert (totals.available_count, totals.allocated_count) == (0, 60)
+
+
+@requires_row_locks
+@pytest.mark.django_db(transaction=True)
+def test_allocation_skips_serials_locked_by_open_transaction():
+    model = BatteryModel.objects.create(name='Lithovolt 12V 310Ah', sku='LV-12V-310')
+    SerialNumber.create_batch(model, 10)
+    wholesaler = User.objects.create_user(email='second@test.com', first_name='W', role='WHOLESALER')
+    oldest_locked = threading.Event()
+    allocation_done = threading.Event()
+    results = {}
+
+    def worker(index):
+        if index == 0:
+            with transaction.atomic():
+                locked = SerialNumber.objects.filter(battery_model=model).order_by('created_at')
+                results['locked'] = [serial.id for serial in locked.select_for_update()[:6]]
+                oldest_locked.set()
+                # Hold the row locks; the allocation must finish meanwhile.
+                results['finished_while_locked'] = allocation_done.wait(timeout=10)
+        else:
+            oldest_locked.wait(timeout=10)
+            with transaction.atomic():
+                results['allocated'] = allocate_serials(model.id, wholesaler.id, 4)
+            with pytest.raises(InsufficientStockError):
+                with transaction.atomic():
+                    allocate_serials(model.id, wholesaler.id, 1)
+            allocation_done.set()
+
+    assert _run_in_threads(worker, 2) == []
+    assert results['finished_while_locked']
+    assert len(results['allocated']) == 4
+    assert not set(results['locked']) & set(results['allocated'])
+
+
+@requires_row_locks
+@pytest.mark.django_db(transaction=True)
+def test_rebuild_does_not_overwrite_concurrent_transitions(monkeypatch):
+    model = BatteryModel.objects.create(name='Lithovolt 12V 320Ah', sku='LV-12V-320')
+    SerialNumber.create_batch(model, 10)
+    wholesaler = User.objects.create_user(email='rebuild@test.com', first_name='W', role='WHOLESALER')
+    aggregated = threading.Event()
+    allocated = threading.Event()
+    compute = compute_stock_summaries
+
+    def compute_then_yield(*args, **kwargs):
+        counts = compute(*args, **kwargs)
+        aggregated.set()
+        # Give the allocation a chance to commit between aggregate and write.
+        allocated.wait(timeout=2)
+        return counts
+
+    monkeypatch.setattr('apps.inventory.services.compute_stock_summaries', compute_then_yield)
+
+    def worker(index):
+        if index == 0:
+            rebuild_stock_summaries([model.id])
+        else:
+            aggregated.wait(timeout=10)
+            with transaction.atomic():
+                allocate_serials(model.id, wholesaler.id, 4)
+            allocated.set()
+
+    assert _run_in_threads(worker, 2) == []
+    monkeypatch.undo()
+    assert rebuild_stock_summaries([model.id], dry_run=True) == []
+    totals = StockSummary.objects.get(battery_model=model, wholesaler__isnull=True)
+    assert (totals.available_count, totals.allocated_count) == (6, 4)
@@ -1,7 +1,6 @@
 """Inventory API views."""
 from django.db import transaction
-from django.db.models import Count, Q, F
-from django.utils import timezone
+from django.db.models import F
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -9,6 +8,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.pagination import OptionalCursorPagination
 from core.permissions import IsAdmin, IsAdminOrWholesaler, require_resource_permission
 from apps.notifications.models import NotificationLog
 from apps.notifications.services import log_and_send
@@ -16,6 +16,13 @@ from apps.notifications.tasks import send_notification_task
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from .models import BatteryModel, Accessory, SerialNumber, StockAllocation, ProductCategory, Product
+from .services import (
+	AllocatedSerials,
+	InsufficientStockError,
+	allocate_serials,
+	allocate_stock_lines,
+	record_allocation_ranges,
+)
 from .serializers import (
 	BatteryModelSerializer,
 	AccessorySerializer,
@@ -25,13 +32,14 @@ from .serializers import (
 	SerialBatchCreateSerializer,
 	StockAllocationSerializer,
 	StockAllocationCreateSerializer,
+	StockAllocationBulkCreateSerializer,
 )
 
 
 class BatteryModelViewSet(viewsets.ModelViewSet):
 	"""CRUD for battery models."""
 
-	queryset = BatteryModel.objects.all()
+	queryset = BatteryModel.objects.with_stock_summary().order_by('-created_at')
 	serializer_class = BatteryModelSerializer
 	filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
 	filterset_fields = ['is_active']
@@ -47,12 +55,7 @@ class BatteryModelViewSet(viewsets.ModelViewSet):
 	def low_stock(self, request):
 		"""List battery models below low stock threshold (admin)."""
 		threshold = request.query_params.get('threshold')
-		qs = self.queryset.annotate(
-			available_count=Count(
-				'serial_numbers',
-				filter=Q(serial_numbers__status=SerialNumber.Status.AVAILABLE)
-			)
-		)
+		qs = self.queryset
 		if threshold is not None:
 			qs = qs.filter(available_count__lte=int(threshold))
 		else:
@@ -64,12 +67,7 @@ class BatteryModelViewSet(viewsets.ModelViewSet):
 	def notify_low_stock(self, request):
 		"""Send low stock alerts to admin users."""
 		threshold = request.data.get('threshold')
-		qs = self.queryset.annotate(
-			available_count=Count(
-				'serial_numbers',
-				filter=Q(serial_numbers__status=SerialNumber.Status.AVAILABLE)
-			)
-		)
+		qs = self.queryset
 		if threshold is not None:
 			qs = qs.filter(available_count__lte=int(threshold))
 		else:
@@ -119,6 +117,7 @@ class SerialNumberViewSet(viewsets.ReadOnlyModelViewSet):
 
 	queryset = SerialNumber.objects.select_related('battery_model')
 	serializer_class = SerialNumberSerializer
+	pagination_class = OptionalCursorPagination
 	filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
 	filterset_fields = ['status', 'battery_model']
 	search_fields = ['serial_number']
@@ -147,11 +146,11 @@ class SerialNumberViewSet(viewsets.ReadOnlyModelViewSet):
 		quantity = serializer.validated_data['quantity']
 		prefix = serializer.validated_data.get('prefix', 'LV')
 
-		created_serials = SerialNumber.create_batch(battery_model, quantity, prefix)
+		created_count = SerialNumber.create_batch(battery_model, quantity, prefix)
 		return Response(
 			{
 				'message': 'Serial numbers generated successfully',
-				'count': len(created_serials)
+				'count': created_count
 			},
 			status=status.HTTP_201_CREATED
 		)
@@ -216,7 +215,7 @@ class StockAllocationViewSet(viewsets.ModelViewSet):
 	ordering_fields = ['created_at', 'quantity']
 
 	def get_permissions(self):
-		if self.action in ['create', 'update', 'partial_update', 'destroy']:
+		if self.action in ['create', 'bulk', 'update', 'partial_update', 'destroy']:
 			return [IsAdmin()]
 		return [IsAdminOrWholesaler()]
 
@@ -231,6 +230,8 @@ class StockAllocationViewSet(viewsets.ModelViewSet):
 	def get_serializer_class(self):
 		if self.action == 'create':
 			return StockAllocationCreateSerializer
+		if self.action == 'bulk':
+			return StockAllocationBulkCreateSerializer
 		return StockAllocationSerializer
 
 	@transaction.atomic
@@ -244,26 +245,14 @@ class StockAllocationViewSet(viewsets.ModelViewSet):
 		quantity = serializer.validated_data['quantity']
 		notes = serializer.validated_data.get('notes', '')
 
-		available_serials = SerialNumber.objects.select_for_update().filter(
-			battery_model=battery_model,
-			status=SerialNumber.Status.AVAILABLE
-		).order_by('created_at')
-
-		if available_serials.count() < quantity:
+		try:
+			serial_ids = allocate_serials(battery_model.id, wholesaler_id, quantity)
+		except InsufficientStockError:
 			return Response(
 				{'error': 'Not enough available stock to allocate'},
 				status=status.HTTP_400_BAD_REQUEST
 			)
 
-		serials_to_allocate = available_serials[:quantity]
-
-		updated_ids = list(serials_to_allocate.values_list('id', flat=True))
-		SerialNumber.objects.filter(id__in=updated_ids).update(
-			status=SerialNumber.Status.ALLOCATED,
-			allocated_to_id=wholesaler_id,
-			allocated_at=timezone.now()
-		)
-
 		allocation = StockAllocation.objects.create(
 			battery_model=battery_model,
 			wholesaler_id=wholesaler_id,
@@ -271,6 +260,32 @@ class StockAllocationViewSet(viewsets.ModelViewSet):
 			quantity=quantity,
 			notes=notes
 		)
+		record_allocation_ranges([(allocation, serial_ids)])
 
 		output_serializer = StockAllocationSerializer(allocation)
-		return Response(output_serializer.data, status=status.HTTP_201_CREATED)
\ No newline at end of file
+		return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+
+	@action(detail=False, methods=['post'])
+	def bulk(self, request):
+		"""Allocate many model/wholesaler lines in one transaction."""
+		serializer = self.get_serializer(data=request.data)
+		serializer.is_valid(raise_exception=True)
+
+		try:
+			results = allocate_stock_lines(serializer.validated_data['allocations'], request.user)
+		except InsufficientStockError as exc:
+			return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+		allocated = sum(1 for result in results if result['status'] == 'allocated')
+		return Response({
+			'allocated': allocated,
+			'failed': len(results) - allocated,
+			'results': results,
+		})
+
+	@action(detail=True, methods=['get'])
+	def serials(self, request, pk=None):
+		"""List the serial numbers taken by an allocation, page by page."""
+		allocation = self.get_object()
+		page = self.paginate_queryset(AllocatedSerials(allocation))
+		serializer = SerialNumberSerializer(page, many=True)
+		return self.get_paginated_response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="notificationlog",
+            index=models.Index(
+                fields=["created_at", "id"], name="notification_created_id_idx"
+            ),
+        ),
+    ]
@@ -39,6 +39,10 @@ class NotificationLog(TimeStampedModel):
 	class Meta:
 		db_table = 'notification_logs'
 		ordering = ['-created_at']
+		indexes = [
+			# Keyset pagination walks (created_at, id) newest first.
+			models.Index(fields=['created_at', 'id'], name='notification_created_id_idx'),
+		]
 
 	def __str__(self):
 		recipient = self.recipient_email or self.recipient_phone or 'Unknown'
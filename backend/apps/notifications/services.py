@@ -2,6 +2,8 @@
 from django.conf import settings
 from django.core.mail import send_mail
 
+from core.prometheus import record_notification_outcome
+
 from .models import NotificationLog, NotificationSetting
 
 
@@ -90,11 +92,13 @@ def log_and_send(
         log.status = NotificationLog.Status.SKIPPED
         log.error_message = 'Email notifications disabled'
         log.save(update_fields=['status', 'error_message'])
+        record_notification_outcome(log.channel, log.status)
         return log
     if channel == NotificationLog.Channel.SMS and not sms_enabled:
         log.status = NotificationLog.Status.SKIPPED
         log.error_message = 'SMS notifications disabled'
         log.save(update_fields=['status', 'error_message'])
+        record_notification_outcome(log.channel, log.status)
         return log
 
     if channel == NotificationLog.Channel.EMAIL:
@@ -108,6 +112,7 @@ def log_and_send(
         log.status = NotificationLog.Status.FAILED
         log.error_message = error
     log.save(update_fields=['status', 'error_message'])
+    record_notification_outcome(log.channel, log.status)
     return log
 
 
@@ -7,6 +7,7 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.pagination import OptionalCursorPagination
 from core.permissions import IsAdmin
 from .models import NotificationLog
 from .serializers import NotificationLogSerializer, SendNotificationSerializer
@@ -20,6 +21,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = NotificationLog.objects.all()
     serializer_class = NotificationLogSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    pagination_class = OptionalCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['channel', 'status']
     search_fields = ['recipient_email', 'recipient_phone', 'subject']
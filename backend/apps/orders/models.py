@@ -39,6 +39,10 @@ class Order(TimeStampedModel):
 	class Meta:
 		db_table = 'orders'
 		ordering = ['-created_at']
+		indexes = [
+			# Keyset pagination walks (created_at, id) newest first.
+			models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+		]
 
 	def __str__(self):
 		return f'Order {self.id} ({self.status})'
@@ -110,6 +110,29 @@ def test_export_orders_csv(api_client, admin_user, wholesaler_user):
     assert response['Content-Type'].startswith('text/csv')
 
 
+@pytest.mark.django_db
+def test_export_orders_streams_totals_in_one_query(
+    api_client, admin_user, wholesaler_user, battery_model, django_assert_num_queries
+):
+    api_client.force_authenticate(user=admin_user)
+    accessory = Accessory.objects.create(name='Terminal Kit', sku='LV-ACC-01', price=10)
+    for quantity in (1, 2, 3):
+        order = Order.objects.create(consumer=wholesaler_user)
+        order.items.create(product_type='BATTERY_MODEL', battery_model=battery_model, quantity=quantity)
+        order.items.create(product_type='ACCESSORY', accessory=accessory, quantity=10)
+    Order.objects.create(consumer=wholesaler_user, wholesaler=wholesaler_user)
+
+    response = api_client.get(reverse('order-export'))
+    assert response.streaming
+    with django_assert_num_queries(1):
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+    assert lines[0].endswith(',total_items')
+    totals = [line.rsplit(',', 1)[1] for line in lines[1:]]
+    assert totals == ['0', '13', '12', '11']
+    assert lines[1].split(',')[2] == wholesaler_user.email
+
+
 @pytest.mark.django_db
 def test_invoice_pdf(api_client, wholesaler_user, battery_model):
     order = Order.objects.create(consumer=wholesaler_user)
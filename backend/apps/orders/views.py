@@ -1,10 +1,9 @@
 """Order API views."""
-import csv
 from io import BytesIO
 
 from django.db import transaction, models
+from django.db.models import Prefetch
 from django.http import HttpResponse
-from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -12,9 +11,12 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.pagination import OptionalCursorPagination
 from core.permissions import IsAdmin
+from core.utils import streaming_csv_response
 from apps.inventory.models import BatteryModel, Accessory, Product
 
+from .exports import ORDER_EXPORT_HEADER, filter_orders_for_export, order_export_rows
 from .models import Order, OrderItem
 from .serializers import (
     OrderSerializer,
@@ -28,9 +30,12 @@ from reportlab.pdfgen import canvas
 class OrderViewSet(viewsets.ModelViewSet):
     """Order request endpoints."""
 
-    queryset = Order.objects.select_related('consumer', 'wholesaler').prefetch_related('items')
+    queryset = Order.objects.select_related('consumer', 'wholesaler').prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.select_related('battery_model', 'accessory', 'product'))
+    )
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['id']
@@ -196,39 +201,5 @@ class OrderViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
     def export(self, request):
         """Export orders as CSV (admin only)."""
-        status = request.query_params.get('status')
-        date_from_raw = request.query_params.get('from')
-        date_to_raw = request.query_params.get('to')
-        date_from = parse_date(date_from_raw) if date_from_raw else None
-        date_to = parse_date(date_to_raw) if date_to_raw else None
-
-        queryset = self.queryset
-        if status:
-            queryset = queryset.filter(status=status)
-        if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="orders.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            'id', 'consumer_email', 'wholesaler_email', 'status',
-            'created_at', 'accepted_at', 'fulfilled_at', 'total_items'
-        ])
-
-        for order in queryset:
-            writer.writerow([
-                order.id,
-                order.consumer.email,
-                order.wholesaler.email if order.wholesaler else '',
-                order.status,
-                order.created_at.isoformat(),
-                order.accepted_at.isoformat() if order.accepted_at else '',
-                order.fulfilled_at.isoformat() if order.fulfilled_at else '',
-                order.total_items
-            ])
-
-        return response
+        queryset = filter_orders_for_export(request.query_params)
+        return streaming_csv_response(ORDER_EXPORT_HEADER, order_export_rows(queryset), 'orders.csv')
@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from .models import MetricRollup, RollupCheckpoint, RollupDirtyDay
+
+
+@admin.register(MetricRollup)
+class MetricRollupAdmin(admin.ModelAdmin):
+    list_display = ['metric', 'day', 'dimension', 'value']
+    list_filter = ['metric']
+
+
+@admin.register(RollupCheckpoint)
+class RollupCheckpointAdmin(admin.ModelAdmin):
+    list_display = ['metric', 'processed_through', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(RollupDirtyDay)
+class RollupDirtyDayAdmin(admin.ModelAdmin):
+    list_display = ['metric', 'day']
+    list_filter = ['metric']
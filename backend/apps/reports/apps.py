@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+class ReportsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.reports'
+
+    def ready(self):
+        """Register signals when app is ready."""
+        import apps.reports.signals  # noqa
@@ -0,0 +1,85 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("WARRANTIES_ISSUED", "Warranties issued"),
+                            ("ORDERS_BY_STATUS", "Orders by status"),
+                            ("SERIALS_SOLD_BY_MODEL", "Serials sold by battery model"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("dimension", models.CharField(blank=True, default="", max_length=50)),
+                ("value", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "metric_rollups",
+                "ordering": ["metric", "day", "dimension"],
+            },
+        ),
+        migrations.CreateModel(
+            name="RollupCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("WARRANTIES_ISSUED", "Warranties issued"),
+                            ("ORDERS_BY_STATUS", "Orders by status"),
+                            ("SERIALS_SOLD_BY_MODEL", "Serials sold by battery model"),
+                        ],
+                        max_length=30,
+                        unique=True,
+                    ),
+                ),
+                ("processed_through", models.DateField()),
+            ],
+            options={
+                "db_table": "metric_rollup_checkpoints",
+                "ordering": ["metric"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="metricrollup",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "day", "dimension"),
+                name="metric_rollup_bucket_unique",
+            ),
+        ),
+    ]
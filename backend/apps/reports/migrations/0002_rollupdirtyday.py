@@ -0,0 +1,49 @@
+# Generated by Django 5.0.1 on 2026-10-18 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupDirtyDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "metric",
+                    models.CharField(
+                        choices=[
+                            ("WARRANTIES_ISSUED", "Warranties issued"),
+                            ("ORDERS_BY_STATUS", "Orders by status"),
+                            ("SERIALS_SOLD_BY_MODEL", "Serials sold by battery model"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("day", models.DateField()),
+            ],
+            options={
+                "db_table": "metric_rollup_dirty_days",
+                "ordering": ["metric", "day"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="rollupdirtyday",
+            constraint=models.UniqueConstraint(
+                fields=("metric", "day"), name="metric_rollup_dirty_day_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+"""Rollup tables backing the metrics time series."""
+from django.db import models
+
+from core.models import TimeStampedModel
+
+
+class MetricRollup(models.Model):
+	"""Daily count for one metric, optionally split by a dimension."""
+
+	class Metric(models.TextChoices):
+		WARRANTIES_ISSUED = 'WARRANTIES_ISSUED', 'Warranties issued'
+		ORDERS_BY_STATUS = 'ORDERS_BY_STATUS', 'Orders by status'
+		SERIALS_SOLD_BY_MODEL = 'SERIALS_SOLD_BY_MODEL', 'Serials sold by battery model'
+
+	metric = models.CharField(max_length=30, choices=Metric.choices)
+	day = models.DateField()
+	# Order status or battery model id; blank for undivided metrics.
+	dimension = models.CharField(max_length=50, blank=True, default='')
+	value = models.PositiveIntegerField(default=0)
+
+	class Meta:
+		db_table = 'metric_rollups'
+		ordering = ['metric', 'day', 'dimension']
+		constraints = [
+			models.UniqueConstraint(
+				fields=['metric', 'day', 'dimension'],
+				name='metric_rollup_bucket_unique'
+			),
+		]
+
+	def __str__(self):
+		return f'{self.metric} {self.day} {self.dimension}: {self.value}'
+
+
+class RollupCheckpoint(TimeStampedModel):
+	"""Last day a metric's rollups were computed through."""
+
+	metric = models.CharField(max_length=30, choices=MetricRollup.Metric.choices, unique=True)
+	processed_through = models.DateField()
+
+	class Meta:
+		db_table = 'metric_rollup_checkpoints'
+		ordering = ['metric']
+
+	def __str__(self):
+		return f'{self.metric} through {self.processed_through}'
+
+
+class RollupDirtyDay(models.Model):
+	"""A past day whose rollup changed after it left the lookback window."""
+
+	metric = models.CharField(max_length=30, choices=MetricRollup.Metric.choices)
+	day = models.DateField()
+
+	class Meta:
+		db_table = 'metric_rollup_dirty_days'
+		ordering = ['metric', 'day']
+		constraints = [
+			models.UniqueConstraint(fields=['metric', 'day'], name='metric_rollup_dirty_day_unique'),
+		]
+
+	def __str__(self):
+		return f'{self.metric} {self.day}'
@@ -0,0 +1,32 @@
+"""Serializers for metrics time series."""
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import MetricRollup
+
+
+class TimeseriesQuerySerializer(serializers.Serializer):
+    """Query parameters for the metrics time series."""
+
+    metric = serializers.ChoiceField(choices=MetricRollup.Metric.choices)
+    granularity = serializers.ChoiceField(choices=['day', 'week', 'month'], default='day')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def to_internal_value(self, data):
+        data = {
+            'metric': (data.get('metric') or '').upper(),
+            'granularity': data.get('granularity', 'day'),
+            **({'date_from': data['from']} if data.get('from') else {}),
+            **({'date_to': data['to']} if data.get('to') else {}),
+        }
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        attrs.setdefault('date_to', timezone.localdate())
+        attrs.setdefault('date_from', attrs['date_to'] - timedelta(days=30))
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError('from must be on or before to')
+        return attrs
@@ -0,0 +1,135 @@
+"""Incremental metric rollups and the time-series queries over them."""
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from apps.inventory.models import SerialNumber
+from apps.orders.models import Order
+from apps.warranty.models import Warranty
+
+from .models import MetricRollup, RollupCheckpoint, RollupDirtyDay
+
+RollupSource = namedtuple('RollupSource', ['queryset', 'date_field', 'dimension_field'])
+
+ROLLUP_SOURCES = {
+	MetricRollup.Metric.WARRANTIES_ISSUED: RollupSource(
+		lambda: Warranty.objects.all(), 'created_at', None
+	),
+	MetricRollup.Metric.ORDERS_BY_STATUS: RollupSource(
+		lambda: Order.objects.all(), 'created_at', 'status'
+	),
+	MetricRollup.Metric.SERIALS_SOLD_BY_MODEL: RollupSource(
+		lambda: SerialNumber.objects.filter(sold_at__isnull=False), 'sold_at', 'battery_model_id'
+	),
+}
+
+PERIOD_FUNCTIONS = {
+	'week': TruncWeek,
+	'month': TruncMonth,
+}
+
+
+def _day_start(day):
+	return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def compute_daily_counts(metric, start_day, end_day):
+	"""Count source rows per local day (and dimension) between two dates, inclusive."""
+	source = ROLLUP_SOURCES[metric]
+	field = source.date_field
+	dimension = source.dimension_field
+	rows = (
+		source.queryset()
+		.order_by()
+		.filter(**{
+			f'{field}__gte': _day_start(start_day),
+			f'{field}__lt': _day_start(end_day + timedelta(days=1)),
+		})
+		.annotate(bucket=TruncDate(field))
+		.values(*(['bucket', dimension] if dimension else ['bucket']))
+		.annotate(count=Count('pk'))
+	)
+	for row in rows:
+		yield row['bucket'], str(row[dimension]) if dimension else '', row['count']
+
+
+def mark_rollup_days_dirty(metric, days):
+	"""Have the next rollup run recompute `days` even if they are outside the lookback."""
+	RollupDirtyDay.objects.bulk_create(
+		[RollupDirtyDay(metric=metric, day=day) for day in set(days)],
+		ignore_conflicts=True
+	)
+
+
+def _rebuild_days(metric, start_day, end_day):
+	MetricRollup.objects.filter(metric=metric, day__gte=start_day, day__lte=end_day).delete()
+	MetricRollup.objects.bulk_create([
+		MetricRollup(metric=metric, day=day, dimension=dimension, value=count)
+		for day, dimension, count in compute_daily_counts(metric, start_day, end_day)
+	])
+
+
+def update_metric_rollups(metric, today=None):
+	"""Recompute a metric's daily buckets since its checkpoint.
+
+	Days from the checkpoint minus REPORTS_ROLLUP_LOOKBACK_DAYS up to today
+	are rebuilt, plus any older day marked dirty (for instance the creation
+	day of an order whose status changed), so a run costs the same however
+	much history exists. Returns the first day of the recomputed window.
+	"""
+	today = today or timezone.localdate()
+	lookback = timedelta(days=getattr(settings, 'REPORTS_ROLLUP_LOOKBACK_DAYS', 3))
+	source = ROLLUP_SOURCES[metric]
+
+	with transaction.atomic():
+		checkpoint = RollupCheckpoint.objects.select_for_update().filter(metric=metric).first()
+		# Read the marks before counting, so a change committed in between is
+		# either counted now or left marked for the next run.
+		dirty = dict(
+			RollupDirtyDay.objects.filter(metric=metric, day__lte=today).values_list('pk', 'day')
+		)
+		if checkpoint:
+			start_day = checkpoint.processed_through - lookback
+		else:
+			first = source.queryset().aggregate(first=Min(source.date_field))['first']
+			start_day = timezone.localdate(first) if first else today
+		start_day = min(start_day, today)
+
+		for day in sorted(day for day in set(dirty.values()) if day < start_day):
+			_rebuild_days(metric, day, day)
+		_rebuild_days(metric, start_day, today)
+		RollupDirtyDay.objects.filter(pk__in=list(dirty)).delete()
+		RollupCheckpoint.objects.update_or_create(metric=metric, defaults={'processed_through': today})
+	return start_day
+
+
+def update_all_metric_rollups(today=None):
+	"""Bring every metric's rollups up to date."""
+	return {
+		metric: update_metric_rollups(metric, today=today)
+		for metric in ROLLUP_SOURCES
+	}
+
+
+def metric_timeseries(metric, start_day, end_day, granularity='day'):
+	"""Return [{'period', 'dimension', 'value'}] from the rollup table."""
+	rollups = MetricRollup.objects.filter(metric=metric, day__gte=start_day, day__lte=end_day)
+	if granularity in PERIOD_FUNCTIONS:
+		rows = (
+			rollups.order_by()
+			.annotate(period=PERIOD_FUNCTIONS[granularity]('day'))
+			.values_list('period', 'dimension')
+			.annotate(total=Sum('value'))
+			.order_by('period', 'dimension')
+		)
+	else:
+		rows = rollups.order_by('day', 'dimension').values_list('day', 'dimension', 'value')
+	return [
+		{'period': period.isoformat(), 'dimension': dimension, 'value': value}
+		for period, dimension, value in rows
+	]
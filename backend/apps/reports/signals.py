@@ -0,0 +1,30 @@
+"""
+Signals that mark past rollup days dirty when the rows counted on them
+change after the lookback window has moved on.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.orders.models import Order
+from apps.warranty.models import Warranty
+from .models import MetricRollup
+from .services import mark_rollup_days_dirty
+
+
+@receiver(post_save, sender=Order)
+def mark_order_day_dirty(sender, instance, created=False, update_fields=None, **kwargs):
+	"""Orders are bucketed by creation day under their current status."""
+	if created or (update_fields is not None and 'status' not in update_fields):
+		return
+	mark_rollup_days_dirty(MetricRollup.Metric.ORDERS_BY_STATUS, [timezone.localdate(instance.created_at)])
+
+
+@receiver(post_delete, sender=Order)
+def mark_deleted_order_day_dirty(sender, instance, **kwargs):
+	mark_rollup_days_dirty(MetricRollup.Metric.ORDERS_BY_STATUS, [timezone.localdate(instance.created_at)])
+
+
+@receiver(post_delete, sender=Warranty)
+def mark_deleted_warranty_day_dirty(sender, instance, **kwargs):
+	mark_rollup_days_dirty(MetricRollup.Metric.WARRANTIES_ISSUED, [timezone.localdate(instance.created_at)])
@@ -0,0 +1,9 @@
+"""Celery tasks for metric rollups."""
+from celery import shared_task
+
+
+@shared_task
+def update_metric_rollups_task():
+    from .services import update_all_metric_rollups
+
+    return {metric: day.isoformat() for metric, day in update_all_metric_rollups().items()}
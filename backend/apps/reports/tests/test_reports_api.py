@@ -0,0 +1,118 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import User
+from apps.inventory.models import BatteryModel, SerialNumber
+from apps.orders.models import Order
+from apps.reports.models import MetricRollup, RollupDirtyDay
+from apps.reports.services import update_all_metric_rollups
+from apps.reports.tasks import update_metric_rollups_task
+
+
+@pytest.fixture()
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture()
+def admin_user(db):
+    return User.objects.create_superuser(
+        email='admin@test.com',
+        password='adminpass123',
+        first_name='Admin'
+    )
+
+
+def _at(day):
+    return timezone.make_aware(datetime.combine(day, time(12)))
+
+
+def _order_on(consumer, day, status=Order.Status.PENDING):
+    order = Order.objects.create(consumer=consumer, status=status)
+    Order.objects.filter(id=order.id).update(created_at=_at(day))
+    return order
+
+
+@pytest.mark.django_db
+def test_rollups_only_recompute_recent_buckets(admin_user, settings):
+    settings.REPORTS_ROLLUP_LOOKBACK_DAYS = 2
+    today = timezone.localdate()
+    _order_on(admin_user, today - timedelta(days=10))
+    recent_order = _order_on(admin_user, today - timedelta(days=1))
+    update_all_metric_rollups(today=today)
+
+    # Nothing marks day -10 dirty, so an out-of-band edit to its bucket survives.
+    MetricRollup.objects.filter(
+        metric=MetricRollup.Metric.ORDERS_BY_STATUS, day=today - timedelta(days=10)
+    ).update(value=7)
+    recent_order.mark_accepted()
+    _order_on(admin_user, today)
+    update_all_metric_rollups(today=today)
+
+    rollups = {
+        (row.day, row.dimension): row.value
+        for row in MetricRollup.objects.filter(metric=MetricRollup.Metric.ORDERS_BY_STATUS)
+    }
+    assert rollups == {
+        (today - timedelta(days=10), 'PENDING'): 7,
+        (today - timedelta(days=1), 'ACCEPTED'): 1,
+        (today, 'PENDING'): 1,
+    }
+
+
+@pytest.mark.django_db
+def test_status_change_recomputes_creation_day_outside_lookback(admin_user, settings):
+    settings.REPORTS_ROLLUP_LOOKBACK_DAYS = 2
+    today = timezone.localdate()
+    old_order = _order_on(admin_user, today - timedelta(days=30))
+    cancelled_order = _order_on(admin_user, today - timedelta(days=20))
+    update_all_metric_rollups(today=today)
+
+    old_order.refresh_from_db()
+    old_order.mark_fulfilled()
+    cancelled_order.refresh_from_db()
+    cancelled_order.delete()
+    update_all_metric_rollups(today=today + timedelta(days=1))
+
+    rollups = {
+        (row.day, row.dimension): row.value
+        for row in MetricRollup.objects.filter(metric=MetricRollup.Metric.ORDERS_BY_STATUS)
+    }
+    assert rollups == {(today - timedelta(days=30), 'FULFILLED'): 1}
+    assert not RollupDirtyDay.objects.exists()
+
+
+@pytest.mark.django_db
+def test_timeseries_endpoint_rolls_days_into_weeks(api_client, admin_user):
+    api_client.force_authenticate(user=admin_user)
+    today = timezone.localdate()
+    monday = today - timedelta(days=today.weekday() + 14)
+    model = BatteryModel.objects.create(name='Lithovolt 12V 100Ah', sku='LV-12V-100')
+    SerialNumber.create_batch(model, 4)
+    for serial, offset in zip(SerialNumber.objects.filter(battery_model=model), (0, 1, 2, 8)):
+        SerialNumber.objects.filter(id=serial.id).update(
+            status=SerialNumber.Status.SOLD,
+            sold_at=_at(monday + timedelta(days=offset))
+        )
+    update_metric_rollups_task()
+
+    response = api_client.get(reverse('admin-metrics-timeseries'), {
+        'metric': 'serials_sold_by_model',
+        'granularity': 'week',
+        'from': (monday - timedelta(days=7)).isoformat(),
+        'to': today.isoformat(),
+    })
+
+    assert response.status_code == 200
+    assert response.data['processed_through'] == today
+    assert response.data['results'] == [
+        {'period': monday.isoformat(), 'dimension': str(model.id), 'value': 3},
+        {'period': (monday + timedelta(days=7)).isoformat(), 'dimension': str(model.id), 'value': 1},
+    ]
+
+    invalid = api_client.get(reverse('admin-metrics-timeseries'), {'metric': 'nope'})
+    assert invalid.status_code == 400
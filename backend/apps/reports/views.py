@@ -0,0 +1,32 @@
+"""Metrics time-series API views."""
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.permissions import IsAdmin
+from .models import RollupCheckpoint
+from .serializers import TimeseriesQuerySerializer
+from .services import metric_timeseries
+
+
+class MetricsTimeseriesView(APIView):
+    """Daily, weekly or monthly metric series read from the rollup tables."""
+
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def get(self, request):
+        serializer = TimeseriesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        checkpoint = RollupCheckpoint.objects.filter(metric=params['metric']).first()
+        return Response({
+            'metric': params['metric'],
+            'granularity': params['granularity'],
+            'from': params['date_from'],
+            'to': params['date_to'],
+            'processed_through': checkpoint.processed_through if checkpoint else None,
+            'results': metric_timeseries(
+                params['metric'], params['date_from'], params['date_to'], params['granularity']
+            ),
+        })
@@ -1,8 +1,11 @@
-from django.core.management.base import BaseCommand
-from django.utils import timezone
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
 
 from apps.users.models import User
 from apps.inventory.models import BatteryModel, Accessory, SerialNumber, StockAllocation
+from apps.inventory.services import allocate_serials, record_allocation_ranges
+from core.seeding import SEED_UNTIL, ScaleSeeder
 
 
 class Command(BaseCommand):
@@ -17,6 +20,18 @@ class Command(BaseCommand):
         parser.add_argument('--accessories', type=int, default=2)
         parser.add_argument('--serials-per-model', type=int, default=10)
         parser.add_argument('--allocate-per-model', type=int, default=5)
+        parser.add_argument(
+            '--scale', type=int,
+            help='Generate this many serials plus matching users, orders, warranties, claims and '
+                 'notification logs with bulk inserts. The per-kind count options are ignored.'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for --scale.')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert for --scale.')
+        parser.add_argument('--days', type=int, default=365, help='Spread --scale activity over this many days.')
+        parser.add_argument(
+            '--until', type=date.fromisoformat, default=SEED_UNTIL,
+            help=f'Last day (YYYY-MM-DD) of --scale activity; defaults to {SEED_UNTIL.isoformat()}.'
+        )
 
     def handle(self, *args, **options):
         admin_email = options['admin_email']
@@ -38,6 +53,21 @@ class Command(BaseCommand):
         else:
             self.stdout.write('Admin user already exists')
 
+        if options['scale'] is not None:
+            if options['scale'] < 1 or options['batch_size'] < 1 or options['days'] < 1:
+                raise CommandError('--scale, --batch-size and --days must be positive')
+            ScaleSeeder(
+                options['scale'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                days=options['days'],
+                until=options['until'],
+                admin=admin,
+                log=self.stdout.write,
+            ).run()
+            self.stdout.write(self.style.SUCCESS('Seed data complete'))
+            return
+
         wholesalers = []
         for idx in range(options['wholesaler_count']):
             email = f'wholesaler{idx + 1}@lithovolt.com.au'
@@ -113,26 +143,24 @@ class Command(BaseCommand):
         wholesaler = wholesalers[0] if wholesalers else None
         if wholesaler:
             for model in battery_models:
-                available = SerialNumber.objects.filter(
-                    battery_model=model,
-                    status=SerialNumber.Status.AVAILABLE
-                ).order_by('created_at')
-                allocate_qty = min(options['allocate_per_model'], available.count())
+                allocate_qty = min(
+                    options['allocate_per_model'],
+                    SerialNumber.objects.filter(
+                        battery_model=model,
+                        status=SerialNumber.Status.AVAILABLE
+                    ).count()
+                )
                 if allocate_qty == 0:
                     continue
-                allocate_ids = list(available[:allocate_qty].values_list('id', flat=True))
-                SerialNumber.objects.filter(id__in=allocate_ids).update(
-                    status=SerialNumber.Status.ALLOCATED,
-                    allocated_to=wholesaler,
-                    allocated_at=timezone.now()
-                )
-                StockAllocation.objects.create(
+                serial_ids = allocate_serials(model.id, wholesaler.id, allocate_qty)
+                allocation = StockAllocation.objects.create(
                     battery_model=model,
                     wholesaler=wholesaler,
                     allocated_by=admin,
                     quantity=allocate_qty,
                     notes='Seed allocation'
                 )
+                record_allocation_ranges([(allocation, serial_ids)])
                 self.stdout.write(self.style.SUCCESS(
                     f'Allocated {allocate_qty} serials of {model.sku} to {wholesaler.email}'
                 ))
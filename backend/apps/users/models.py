@@ -61,6 +61,9 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_verified = models.BooleanField(default=False)
+    # Bumped when role or active status changes; tokens carrying an older
+    # value are rejected.
+    token_version = models.PositiveIntegerField(default=0)
     
     # Profile fields
     company_name = models.CharField(max_length=200, blank=True, null=True)
@@ -93,6 +96,18 @@ class User(AbstractBaseUser, PermissionsMixin, TimeStampedModel):
         """Return the short name of the user."""
         return self.first_name
     
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        """Load every deferred field at once when one of them is first read.
+
+        Users rebuilt from the authentication cache only carry the fields
+        authorization needs; this keeps the rest to a single query.
+        """
+        if fields is not None:
+            deferred_fields = self.get_deferred_fields()
+            if deferred_fields.intersection(fields):
+                fields = deferred_fields.union(fields)
+        super().refresh_from_db(using, fields, **kwargs)
+    
     @property
     def is_admin(self):
         """Check if user is admin."""
@@ -157,6 +157,8 @@ class RoleSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_staff_count(self, obj):
+        if hasattr(obj, 'active_staff_count'):
+            return obj.active_staff_count
         return obj.staff_users.filter(is_active=True).count()
 
 
@@ -2,7 +2,8 @@ import pytest
 from django.urls import reverse
 from rest_framework.test import APIClient
 
-from apps.users.models import User, WholesalerApplication
+from apps.users.models import User, WholesalerApplication, Role, Permission, StaffUser
+from core.permissions import has_resource_permission
 
 
 @pytest.fixture()
@@ -125,3 +126,48 @@ def test_admin_approves_wholesaler_application(api_client, admin_user, consumer_
     assert application.status == WholesalerApplication.Status.APPROVED
     consumer_user.refresh_from_db()
     assert consumer_user.role == 'WHOLESALER'
+
+
+@pytest.fixture()
+def staff_member(db):
+    user = User.objects.create_user(email='staff@test.com', first_name='Staff', role='CONSUMER')
+    role = Role.objects.create(name='SUPPORT')
+    Permission.objects.create(role=role, resource='WARRANTY_CLAIMS', action='VIEW')
+    StaffUser.objects.create(user=user, role=role)
+    return user
+
+
+@pytest.mark.django_db
+def test_resource_permission_checks_use_cached_matrix(staff_member, consumer_user, django_assert_num_queries):
+    assert has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
+
+    with django_assert_num_queries(0):
+        assert has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
+        assert not has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'APPROVE')
+        assert not has_resource_permission(consumer_user, 'WARRANTY_CLAIMS', 'VIEW')
+
+
+@pytest.mark.django_db
+def test_resource_permission_matrix_follows_role_changes(staff_member, django_capture_on_commit_callbacks):
+    role = Role.objects.get(name='SUPPORT')
+    assert not has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'APPROVE')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Permission.objects.create(role=role, resource='WARRANTY_CLAIMS', action='APPROVE')
+    assert has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'APPROVE')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        StaffUser.objects.filter(user=staff_member).get().delete()
+    assert not has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
+
+
+@pytest.mark.django_db
+def test_resource_permission_matrix_expires_without_a_shared_version(staff_member, settings):
+    assert has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
+
+    # Another process revokes the grant; its version bump never reaches this cache.
+    Permission.objects.filter(resource='WARRANTY_CLAIMS').update(action='APPROVE')
+    assert has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
+
+    settings.PERMISSION_MATRIX_MAX_AGE = 0
+    assert not has_resource_permission(staff_member, 'WARRANTY_CLAIMS', 'VIEW')
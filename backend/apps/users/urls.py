@@ -6,10 +6,11 @@ from .views import (
 )
 
 router = DefaultRouter()
-router.register(r'', UserViewSet, basename='user')
 router.register(r'roles', RoleViewSet, basename='role')
 router.register(r'permissions', PermissionViewSet, basename='permission')
 router.register(r'staff', StaffUserViewSet, basename='staff-user')
+# Registered last: the user detail route would otherwise match roles/, staff/, ...
+router.register(r'', UserViewSet, basename='user')
 
 wholesaler_router = DefaultRouter()
 wholesaler_router.register(r'', WholesalerApplicationViewSet, basename='wholesaler-application')
@@ -6,6 +6,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.db.models import Count, Q
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
@@ -156,7 +157,9 @@ class WholesalerApplicationViewSet(viewsets.ModelViewSet):
 class RoleViewSet(viewsets.ModelViewSet):
     """ViewSet for managing roles for staff users."""
     
-    queryset = Role.objects.prefetch_related('permissions', 'staff_users')
+    queryset = Role.objects.prefetch_related('permissions').annotate(
+        active_staff_count=Count('staff_users', filter=Q(staff_users__is_active=True))
+    ).order_by('name')
     serializer_class = RoleSerializer
     permission_classes = [IsAdmin]
     filter_backends = [SearchFilter, OrderingFilter]
@@ -7,3 +7,6 @@ class WarrantyConfig(AppConfig):
     def ready(self):
         """Register signals when app is ready."""
         import apps.warranty.signals  # noqa
+        from .services import check_warranty_asset_settings
+
+        check_warranty_asset_settings()
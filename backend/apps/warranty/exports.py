@@ -0,0 +1,54 @@
+"""Warranty CSV export rows."""
+from django.utils.dateparse import parse_date
+
+from .models import Warranty
+
+WARRANTY_EXPORT_HEADER = [
+	'warranty_number', 'serial_number', 'battery_model', 'consumer_email',
+	'status', 'start_date', 'end_date', 'issued_by', 'created_at'
+]
+WARRANTY_EXPORT_CHUNK_SIZE = 2000
+
+
+def filter_warranties_for_export(params):
+	"""Apply the export filters (status, from, to) to the warranties queryset."""
+	queryset = Warranty.objects.all()
+	if params.get('status'):
+		queryset = queryset.filter(status=params['status'])
+	date_from = parse_date(params['from']) if params.get('from') else None
+	date_to = parse_date(params['to']) if params.get('to') else None
+	if date_from:
+		queryset = queryset.filter(created_at__date__gte=date_from)
+	if date_to:
+		queryset = queryset.filter(created_at__date__lte=date_to)
+	return queryset
+
+
+def warranty_export_rows(queryset=None):
+	"""Yield CSV rows for warranties using a single joined query.
+
+	Serial, battery model and user columns are read through values_list()
+	joins, so the query count stays constant however many rows are exported.
+	"""
+	if queryset is None:
+		queryset = Warranty.objects.all()
+	rows = queryset.order_by('-created_at', '-id').values_list(
+		'warranty_number', 'serial_number__serial_number',
+		'serial_number__battery_model__name', 'consumer__email', 'status',
+		'start_date', 'end_date', 'issued_by__email', 'created_at'
+	)
+	for (
+		warranty_number, serial_number, battery_model, consumer_email, status,
+		start_date, end_date, issued_by_email, created_at
+	) in rows.iterator(chunk_size=WARRANTY_EXPORT_CHUNK_SIZE):
+		yield [
+			warranty_number,
+			serial_number,
+			battery_model,
+			consumer_email or '',
+			status,
+			start_date.isoformat(),
+			end_date.isoformat() if end_date else '',
+			issued_by_email or '',
+			created_at.isoformat(),
+		]
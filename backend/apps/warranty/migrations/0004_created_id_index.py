@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 13:47
+
+from django.db import migrations, models
+
+from core.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("warranty", "0003_enhance_warrantyclaim_workflow"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name="warranty",
+            index=models.Index(
+                fields=["created_at", "id"], name="warranty_created_id_idx"
+            ),
+        ),
+    ]
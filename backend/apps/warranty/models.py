@@ -57,6 +57,10 @@ class Warranty(TimeStampedModel):
 	class Meta:
 		db_table = 'warranties'
 		ordering = ['-created_at']
+		indexes = [
+			# Keyset pagination walks (created_at, id) newest first.
+			models.Index(fields=['created_at', 'id'], name='warranty_created_id_idx'),
+		]
 
 	def __str__(self):
 		return self.warranty_number
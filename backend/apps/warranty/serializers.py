@@ -1,5 +1,6 @@
 """Serializers for warranty APIs."""
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from .models import Warranty, WarrantyClaim, WarrantyClaimAttachment
@@ -51,6 +52,16 @@ class WarrantyIssueSerializer(serializers.Serializer):
         return attrs
 
 
+class WarrantyBulkIssueSerializer(serializers.Serializer):
+    """Issue warranties for many sold serials, e.g. an end-of-day sales sheet."""
+
+    warranties = WarrantyIssueSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.WARRANTY_ISSUE_BULK_MAX_ROWS
+    )
+
+
 class WarrantyClaimSerializer(serializers.Serializer):
     """Consumer claim/activation by serial or QR."""
 
@@ -86,6 +97,16 @@ class WarrantyPublicSerializer(serializers.ModelSerializer):
         ]
 
 
+class WarrantyBulkVerifySerializer(serializers.Serializer):
+    """Serial numbers to verify in one request."""
+
+    serial_numbers = serializers.ListField(
+        child=serializers.CharField(max_length=50),
+        allow_empty=False,
+        max_length=settings.WARRANTY_VERIFY_BULK_MAX_SERIALS
+    )
+
+
 class WarrantyClaimModelSerializer(serializers.ModelSerializer):
     """Serializer for claim model (future workflow)."""
 
@@ -135,13 +156,20 @@ class WarrantyClaimDetailSerializer(serializers.ModelSerializer):
         return items
     
     def get_status_history(self, obj):
-        """Get all status transitions for this claim."""
-        from .models import ClaimStatusHistory
-        history = ClaimStatusHistory.objects.filter(claim=obj).values(
-            'id', 'from_status', 'to_status', 'changed_by__first_name', 'changed_by__last_name',
-            'notes', 'created_at'
-        ).order_by('-created_at')
-        return list(history)
+        """Get all status transitions for this claim, newest first."""
+        history = sorted(obj.status_history.all(), key=lambda entry: entry.created_at, reverse=True)
+        return [
+            {
+                'id': entry.id,
+                'from_status': entry.from_status,
+                'to_status': entry.to_status,
+                'changed_by__first_name': entry.changed_by.first_name if entry.changed_by else None,
+                'changed_by__last_name': entry.changed_by.last_name if entry.changed_by else None,
+                'notes': entry.notes,
+                'created_at': entry.created_at,
+            }
+            for entry in history
+        ]
 
     class Meta:
         model = WarrantyClaim
@@ -0,0 +1,284 @@
+"""Warranty service helpers for batch issuance and asset backfill."""
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from core.background import dispatch_task
+from core.dashboard import invalidate_admin_metrics
+from core.utils import generate_warranty_number
+from apps.inventory.models import SerialNumber
+from apps.inventory.services import record_serial_transition
+from apps.notifications.tasks import send_warranty_confirmation_task
+from apps.authentication.backends import invalidate_cached_users
+from apps.users.models import UserProfile
+
+from .models import Warranty
+from .tasks import generate_warranty_assets_task
+from .verification import invalidate_verifications
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_BACKFILL_FIELDS = ('email', 'phone', 'first_name', 'last_name')
+
+
+class _ConsumerResolver:
+	"""Match rows to consumers the way get_or_create_consumer does, for a whole batch.
+
+	Existing users are loaded with one query. Missing contact details are
+	backfilled on matched users, and users that do not exist yet are built
+	once and shared by every row with the same email or phone.
+	"""
+
+	def __init__(self, rows):
+		emails = {row['consumer_email'] for row in rows if row.get('consumer_email')}
+		phones = {row['consumer_phone'] for row in rows if row.get('consumer_phone')}
+		self.by_email = {}
+		self.by_phone = {}
+		self.updated = {}
+		self.created = []
+		if emails or phones:
+			for user in User.objects.filter(Q(email__in=emails) | Q(phone__in=phones)).order_by('id'):
+				self._remember(user)
+
+	def _remember(self, user):
+		if user.email:
+			self.by_email.setdefault(user.email, user)
+		if user.phone:
+			self.by_phone.setdefault(user.phone, user)
+
+	def resolve(self, row):
+		email = row.get('consumer_email')
+		phone = row.get('consumer_phone')
+		user = None
+		if email:
+			user = self.by_email.get(email)
+		if user is None and phone:
+			user = self.by_phone.get(phone)
+
+		if user is None:
+			user = User(
+				email=User.objects.normalize_email(email) if email else None,
+				phone=phone,
+				first_name=row.get('consumer_first_name') or 'Consumer',
+				last_name=row.get('consumer_last_name') or '',
+				role='CONSUMER'
+			)
+			user.set_unusable_password()
+			self.created.append(user)
+		else:
+			values = {
+				'email': email,
+				'phone': phone,
+				'first_name': row.get('consumer_first_name'),
+				'last_name': row.get('consumer_last_name'),
+			}
+			for field in CONSUMER_BACKFILL_FIELDS:
+				if values[field] and not getattr(user, field):
+					setattr(user, field, values[field])
+					if user.pk is not None:
+						self.updated[user.pk] = user
+		self._remember(user)
+		return user
+
+	def save(self):
+		"""Write backfilled and new consumers; new ones get their UserProfile too."""
+		if self.updated:
+			User.objects.bulk_update(list(self.updated.values()), CONSUMER_BACKFILL_FIELDS)
+			# bulk_update skips the post_save signal that drops cached auth users.
+			invalidate_cached_users({user.pk: user.token_version for user in self.updated.values()})
+			# Backfilled names show up in public verification payloads.
+			invalidate_verifications(
+				Warranty.objects.filter(consumer_id__in=self.updated).values_list(
+					'serial_number__serial_number', flat=True
+				)
+			)
+		if self.created:
+			User.objects.bulk_create(self.created)
+			# bulk_create skips the post_save receivers that add the profile
+			# and drop the admin metrics' user counts.
+			UserProfile.objects.bulk_create([UserProfile(user=user) for user in self.created])
+			invalidate_admin_metrics()
+
+
+def issue_warranties(rows, issued_by, verify_url_for):
+	"""Issue warranties for many (serial, consumer contact) rows at once.
+
+	Serials, their existing warranties and the consumers are each loaded
+	with one query; new consumers, profiles and warranties are written with
+	bulk_create, the serials with one bulk_update and the stock counters
+	once per (battery model, previous status, wholesaler). QR/PDF assets
+	and confirmations are dispatched per warranty once the transaction
+	commits. verify_url_for(serial_number) builds the URL printed on the
+	QR code; assets whose job is lost are retried by
+	generate_missing_warranty_assets.
+
+	Rows follow WarrantyIssueSerializer. A row is reported as "issued",
+	"exists" (the serial already has a warranty, as the single issue
+	endpoint returns it) or "error"; errors do not stop the other rows.
+	Returns one result dict per row, in input order.
+	"""
+	serial_numbers = {row['serial_number'] for row in rows}
+	results = [None] * len(rows)
+	pending = []
+
+	with transaction.atomic():
+		serials = {
+			serial.serial_number: serial
+			for serial in SerialNumber.objects
+			.select_for_update(of=('self',))
+			.select_related('battery_model', 'warranty')
+			.filter(serial_number__in=serial_numbers)
+			.order_by('id')
+		}
+
+		seen = set()
+		for index, row in enumerate(rows):
+			result = {'row': index, 'serial_number': row['serial_number']}
+			results[index] = result
+			serial = serials.get(row['serial_number'])
+			if serial is None:
+				result.update(status='error', error='Serial number not found')
+				continue
+			if serial.serial_number in seen:
+				result.update(status='error', error='Serial number appears more than once in this batch')
+				continue
+			seen.add(serial.serial_number)
+			if issued_by.is_wholesaler and serial.allocated_to_id != issued_by.id:
+				result.update(status='error', error='Serial not allocated to this wholesaler')
+				continue
+			existing = getattr(serial, 'warranty', None)
+			if existing is not None:
+				result.update(status='exists', warranty_number=existing.warranty_number)
+				continue
+			pending.append((result, row, serial))
+
+		if not pending:
+			return results
+
+		consumers = _ConsumerResolver([row for _, row, _ in pending])
+		pending = [(result, row, serial, consumers.resolve(row)) for result, row, serial in pending]
+		consumers.save()
+
+		sold_at = timezone.now()
+		transitions = defaultdict(int)
+		warranties = []
+		for result, row, serial, consumer in pending:
+			transitions[(serial.battery_model_id, serial.status, serial.allocated_to_id)] += 1
+			serial.status = SerialNumber.Status.SOLD
+			serial.sold_to = consumer
+			serial.sold_at = sold_at
+			warranty = Warranty(
+				warranty_number=generate_warranty_number(),
+				serial_number=serial,
+				consumer=consumer,
+				issued_by=issued_by,
+				notes=row.get('notes', '')
+			)
+			warranty.ensure_dates()
+			warranties.append(warranty)
+
+		SerialNumber.objects.bulk_update(
+			[serial for _, _, serial, _ in pending],
+			['status', 'sold_to', 'sold_at']
+		)
+		for (battery_model_id, from_status, wholesaler_id), count in sorted(
+			transitions.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or 0)
+		):
+			record_serial_transition(
+				battery_model_id,
+				from_status,
+				SerialNumber.Status.SOLD,
+				count=count,
+				from_wholesaler_id=wholesaler_id,
+				to_wholesaler_id=wholesaler_id
+			)
+		Warranty.objects.bulk_create(warranties)
+
+		# bulk_create skips the post_save signals that normally do these.
+		invalidate_admin_metrics()
+		invalidate_verifications(serial.serial_number for _, _, serial, _ in pending)
+
+		followups = []
+		for (result, row, serial, consumer), warranty in zip(pending, warranties):
+			result.update(
+				status='issued',
+				warranty_number=warranty.warranty_number,
+				consumer_id=consumer.id
+			)
+			followups.append((warranty.id, verify_url_for(serial.serial_number)))
+		transaction.on_commit(lambda: dispatch_warranty_followups(followups))
+
+	return results
+
+
+def dispatch_warranty_followups(followups):
+	"""Queue asset generation and confirmation for each (warranty_id, verify_url)."""
+	for warranty_id, verify_url in followups:
+		dispatch_task(generate_warranty_assets_task, warranty_id, verify_url)
+		dispatch_task(send_warranty_confirmation_task, warranty_id)
+
+
+def check_warranty_asset_settings():
+	"""
+	Refuse ASYNC_TASKS_ENABLED without WARRANTY_VERIFY_BASE_URL.
+
+	The periodic asset sweep runs outside any request, so it has no host
+	to build QR code URLs from; without the setting it would silently
+	leave warranties whose asset job was lost without a certificate.
+	"""
+	if getattr(settings, 'ASYNC_TASKS_ENABLED', False) and not getattr(settings, 'WARRANTY_VERIFY_BASE_URL', ''):
+		raise ImproperlyConfigured(
+			'ASYNC_TASKS_ENABLED needs WARRANTY_VERIFY_BASE_URL for the warranty asset sweep.'
+		)
+
+
+def generate_missing_warranty_assets(limit=None, min_age=None):
+	"""Generate QR codes and certificates for warranties that still have none.
+
+	Asset jobs are queued once, after the issuing transaction commits, so a
+	job lost to a worker restart would leave the warranty without a
+	certificate. This sweep, run periodically, is what makes that work
+	durable: it retries warranties older than `min_age` seconds (so jobs
+	still in the queue are left alone), oldest first and at most `limit`
+	per run. QR codes point at WARRANTY_VERIFY_BASE_URL, which
+	check_warranty_asset_settings requires when tasks run asynchronously;
+	without it the sweep does nothing. Returns the ids it generated assets for.
+	"""
+	base_url = getattr(settings, 'WARRANTY_VERIFY_BASE_URL', '').rstrip('/')
+	if not base_url:
+		logger.warning('WARRANTY_VERIFY_BASE_URL is not set; skipping the warranty asset sweep')
+		return []
+	limit = limit or getattr(settings, 'WARRANTY_ASSET_SWEEP_BATCH_SIZE', 200)
+	if min_age is None:
+		min_age = getattr(settings, 'WARRANTY_ASSET_SWEEP_MIN_AGE', 600)
+
+	warranties = (
+		Warranty.objects
+		.select_related('serial_number')
+		.filter(Q(certificate_file='') | Q(certificate_file__isnull=True))
+		.filter(created_at__lte=timezone.now() - timedelta(seconds=min_age))
+		.order_by('created_at')[:limit]
+	)
+	generated = []
+	for warranty in warranties:
+		verify_url = base_url + reverse(
+			'warranty-verify', kwargs={'serial_number': warranty.serial_number.serial_number}
+		)
+		try:
+			warranty.generate_assets(verify_url)
+			warranty.save(update_fields=['qr_code_image', 'certificate_file', 'updated_at'])
+		except Exception:
+			logger.exception('Could not generate assets for warranty %s', warranty.id)
+			continue
+		generated.append(warranty.id)
+	return generated
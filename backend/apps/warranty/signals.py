@@ -1,11 +1,40 @@
 """
-Signals for warranty app to handle notifications on claim status changes.
+Signals for warranty app to handle notifications on claim status changes
+and keep cached public verifications fresh.
 """
-from django.db.models.signals import post_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
+from apps.inventory.models import SerialNumber
 from apps.notifications.models import NotificationLog
-from .models import WarrantyClaim
+from .models import Warranty, WarrantyClaim
+from .verification import invalidate_verifications
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Warranty)
+@receiver(post_delete, sender=Warranty)
+def invalidate_warranty_verification(sender, instance, **kwargs):
+    """Drop the cached public verification of the warranty's serial."""
+    if Warranty.serial_number.is_cached(instance):
+        serial_numbers = [instance.serial_number.serial_number]
+    else:
+        serial_numbers = SerialNumber.objects.filter(pk=instance.serial_number_id).values_list(
+            'serial_number', flat=True
+        )
+    invalidate_verifications(serial_numbers)
+
+
+@receiver(post_save, sender=User)
+def invalidate_consumer_verifications(sender, instance, created, update_fields=None, **kwargs):
+    """Public verifications show the consumer's name, so renames drop them."""
+    if created or (update_fields is not None and not {'first_name', 'last_name'} & set(update_fields)):
+        return
+    invalidate_verifications(
+        instance.warranties.values_list('serial_number__serial_number', flat=True)
+    )
 
 
 @receiver(post_save, sender=WarrantyClaim)
@@ -12,3 +12,10 @@ def generate_warranty_assets_task(warranty_id, verify_url):
     warranty.generate_assets(verify_url)
     warranty.save()
     return warranty.id
+
+
+@shared_task
+def generate_missing_warranty_assets_task():
+    from .services import generate_missing_warranty_assets
+
+    return generate_missing_warranty_assets()
@@ -1,11 +1,25 @@
+import json
+from datetime import timedelta
+
 import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from django.test import override_settings
 from rest_framework.test import APIClient
 
-from apps.users.models import User
+from apps.authentication.backends import user_cache_key
+from apps.users.models import User, UserProfile
 from apps.inventory.models import BatteryModel, SerialNumber
+from apps.inventory.services import rebuild_stock_summaries
+from apps.notifications.models import NotificationLog
 from apps.warranty.models import Warranty
+from apps.warranty.services import _ConsumerResolver, check_warranty_asset_settings
+from apps.warranty.tasks import generate_missing_warranty_assets_task
+from apps.warranty.throttles import WarrantyVerifyRateThrottle
 
 
 @pytest.fixture()
@@ -127,6 +141,87 @@ def test_verify_warranty(api_client, battery_model, wholesaler_user):
     assert response.data['warranty_number'] == warranty.warranty_number
 
 
+@pytest.mark.django_db
+def test_verify_warranty_is_cached_and_supports_conditional_get(
+    api_client, battery_model, wholesaler_user, django_assert_num_queries
+):
+    cache.clear()
+    serial = SerialNumber.objects.create(
+        battery_model=battery_model,
+        serial_number='LV0000000004',
+        status=SerialNumber.Status.SOLD,
+        sold_to=wholesaler_user
+    )
+    warranty = Warranty.objects.create(serial_number=serial, consumer=wholesaler_user)
+    url = reverse('warranty-verify', kwargs={'serial_number': serial.serial_number})
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert response['Last-Modified']
+    assert 'public' in response['Cache-Control'] and 'max-age=' in response['Cache-Control']
+
+    with django_assert_num_queries(0):
+        assert api_client.get(url).data == response.data
+        not_modified = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == 304
+    assert not_modified['ETag'] == etag
+    assert api_client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+    # Saving the warranty or renaming its consumer drops the cached payload.
+    warranty.status = Warranty.Status.VOID
+    warranty.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data['status'] == Warranty.Status.VOID
+    assert response['ETag'] != etag
+
+    wholesaler_user.first_name = 'Renamed'
+    wholesaler_user.save()
+    assert api_client.get(url).data['consumer_name'].startswith('Renamed')
+
+
+@pytest.mark.django_db
+def test_verify_warranty_caches_unknown_serials_until_issued(api_client, battery_model, wholesaler_user):
+    cache.clear()
+    serial = SerialNumber.objects.create(
+        battery_model=battery_model,
+        serial_number='LV0000000005',
+        status=SerialNumber.Status.SOLD,
+        sold_to=wholesaler_user
+    )
+    url = reverse('warranty-verify', kwargs={'serial_number': serial.serial_number})
+    response = api_client.get(url)
+    assert response.status_code == 404
+    assert 'max-age=' in response['Cache-Control']
+
+    Warranty.objects.create(serial_number=serial, consumer=wholesaler_user)
+    assert api_client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_verify_warranty_throttles_only_cache_misses(api_client, battery_model, wholesaler_user, monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(WarrantyVerifyRateThrottle, 'get_rate', lambda self: '2/min')
+    serial = SerialNumber.objects.create(
+        battery_model=battery_model,
+        serial_number='LV0000000006',
+        status=SerialNumber.Status.SOLD,
+        sold_to=wholesaler_user
+    )
+    Warranty.objects.create(serial_number=serial, consumer=wholesaler_user)
+    url = reverse('warranty-verify', kwargs={'serial_number': serial.serial_number})
+
+    etag = api_client.get(url)['ETag']
+    for _ in range(3):
+        assert api_client.get(url).status_code == 200
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    unknown = reverse('warranty-verify', kwargs={'serial_number': 'LV-UNKNOWN-1'})
+    assert api_client.get(unknown).status_code == 404
+    assert api_client.get(unknown).status_code == 404
+    assert api_client.get(reverse('warranty-verify', kwargs={'serial_number': 'LV-UNKNOWN-2'})).status_code == 429
+
 @pytest.mark.django_db
 def test_export_warranties_csv(api_client, admin_user, battery_model):
     api_client.force_authenticate(user=admin_user)
@@ -144,6 +239,36 @@ def test_export_warranties_csv(api_client, admin_user, battery_model):
     assert response['Content-Type'].startswith('text/csv')
 
 
+def _create_warranties(battery_model, issuer, consumer, count, offset):
+    for index in range(offset, offset + count):
+        serial = SerialNumber.objects.create(
+            battery_model=battery_model,
+            serial_number=f'LV{index:010d}',
+            status=SerialNumber.Status.SOLD
+        )
+        Warranty.objects.create(serial_number=serial, consumer=consumer, issued_by=issuer)
+
+
+@pytest.mark.django_db
+def test_export_warranties_query_count_is_constant(
+    api_client, admin_user, wholesaler_user, consumer_user, battery_model, django_assert_num_queries
+):
+    api_client.force_authenticate(user=admin_user)
+    url = reverse('warranty-export')
+
+    for count, offset in ((3, 100), (27, 200)):
+        _create_warranties(battery_model, wholesaler_user, consumer_user, count, offset)
+        response = api_client.get(url)
+        assert response.streaming
+        with django_assert_num_queries(1):
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == Warranty.objects.count() + 1
+
+    first = lines[1].split(',')
+    assert first[2:4] == [battery_model.name, consumer_user.email]
+    assert first[7] == wholesaler_user.email
+
+
 @pytest.mark.django_db
 def test_create_warranty_claim(api_client, consumer_user, battery_model):
     serial = SerialNumber.objects.create(
@@ -164,3 +289,234 @@ def test_create_warranty_claim(api_client, consumer_user, battery_model):
 
     assert response.status_code == 201
     assert response.data['status'] == 'PENDING'
+
+
+def _create_sold_serials(battery_model, wholesaler, consumer, count, with_warranty=True):
+    serials = []
+    for index in range(count):
+        serial = SerialNumber.objects.create(
+            battery_model=battery_model,
+            serial_number=f'LVB{index:09d}',
+            status=SerialNumber.Status.SOLD,
+            allocated_to=wholesaler,
+            sold_to=consumer
+        )
+        if with_warranty:
+            Warranty.objects.create(serial_number=serial, consumer=consumer)
+        serials.append(serial.serial_number)
+    return serials
+
+
+@pytest.mark.django_db
+def test_bulk_verify_reports_every_serial_in_one_query(
+    api_client, battery_model, wholesaler_user, consumer_user, django_assert_num_queries
+):
+    verified = _create_sold_serials(battery_model, wholesaler_user, consumer_user, 3)
+    unsold = SerialNumber.objects.create(
+        battery_model=battery_model,
+        serial_number='LVB999999999',
+        status=SerialNumber.Status.ALLOCATED,
+        allocated_to=wholesaler_user
+    )
+    elsewhere = SerialNumber.objects.create(battery_model=battery_model, serial_number='LVB888888888')
+    api_client.force_authenticate(user=wholesaler_user)
+    payload = {'serial_numbers': [
+        verified[1], 'UNKNOWN-1', unsold.serial_number, elsewhere.serial_number, *verified, verified[0]
+    ]}
+
+    with django_assert_num_queries(1):
+        response = api_client.post(reverse('warranty-verify-bulk'), payload, format='json')
+
+    assert response.status_code == 200
+    assert response.data['count'] == 6
+    statuses = {result['serial']: result['status'] for result in response.data['results']}
+    # Serials held by someone else look unknown to a wholesaler.
+    assert statuses == {
+        **dict.fromkeys(verified, 'verified'),
+        unsold.serial_number: 'no_warranty',
+        'UNKNOWN-1': 'not_found',
+        elsewhere.serial_number: 'not_found',
+    }
+    result = response.data['results'][0]
+    assert result['warranty']['serial'] == result['serial']
+    assert result['warranty']['battery_model_sku'] == battery_model.sku
+    assert result['warranty']['consumer_name'] == consumer_user.get_full_name()
+
+
+@pytest.mark.django_db
+@override_settings(WARRANTY_VERIFY_BULK_STREAM_THRESHOLD=2)
+def test_bulk_verify_streams_large_requests(api_client, battery_model, wholesaler_user, consumer_user, admin_user):
+    verified = _create_sold_serials(battery_model, wholesaler_user, consumer_user, 3)
+    api_client.force_authenticate(user=admin_user)
+
+    response = api_client.post(
+        reverse('warranty-verify-bulk'), {'serial_numbers': [*verified, 'UNKNOWN-1']}, format='json'
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    body = json.loads(b''.join(response.streaming_content))
+    assert body['count'] == 4
+    assert [result['status'] for result in body['results']] == ['verified'] * 3 + ['not_found']
+
+
+@pytest.mark.django_db
+def test_bulk_verify_is_for_partners_only_and_bounded(api_client, consumer_user, wholesaler_user, settings):
+    url = reverse('warranty-verify-bulk')
+    assert api_client.post(url, {'serial_numbers': ['LV1']}, format='json').status_code == 401
+    api_client.force_authenticate(user=consumer_user)
+    assert api_client.post(url, {'serial_numbers': ['LV1']}, format='json').status_code == 403
+
+    api_client.force_authenticate(user=wholesaler_user)
+    assert api_client.post(url, {'serial_numbers': []}, format='json').status_code == 400
+    too_many = [f'LV{index}' for index in range(settings.WARRANTY_VERIFY_BULK_MAX_SERIALS + 1)]
+    assert api_client.post(url, {'serial_numbers': too_many}, format='json').status_code == 400
+
+
+def _allocate_serials(battery_model, wholesaler, count, prefix='LVI'):
+    serials = SerialNumber.objects.bulk_create([
+        SerialNumber(
+            battery_model=battery_model,
+            serial_number=f'{prefix}{index:09d}',
+            status=SerialNumber.Status.ALLOCATED,
+            allocated_to=wholesaler
+        )
+        for index in range(count)
+    ])
+    rebuild_stock_summaries()
+    return [serial.serial_number for serial in serials]
+
+
+@pytest.mark.django_db
+def test_bulk_issue_reports_per_row_outcomes(api_client, battery_model, wholesaler_user, consumer_user, admin_user):
+    serials = _allocate_serials(battery_model, wholesaler_user, 4)
+    other_wholesaler = User.objects.create_user(email='other@test.com', first_name='Other', role='WHOLESALER')
+    foreign = SerialNumber.objects.create(
+        battery_model=battery_model,
+        serial_number='LVX000000001',
+        status=SerialNumber.Status.ALLOCATED,
+        allocated_to=other_wholesaler
+    )
+    existing = Warranty.objects.create(serial_number=SerialNumber.objects.get(serial_number=serials[3]))
+    consumer_user.phone = '+919777777777'
+    consumer_user.save()
+    cache.set(user_cache_key(consumer_user.id, consumer_user.token_version), 'cached before the backfill')
+
+    rows = [
+        {'serial_number': serials[0], 'consumer_email': 'New.Buyer@Test.com', 'consumer_first_name': 'New'},
+        {'serial_number': serials[1], 'consumer_email': 'new.buyer@test.com', 'consumer_phone': '9666666666'},
+        {'serial_number': serials[2], 'consumer_phone': '9777777777', 'consumer_last_name': 'Known'},
+        {'serial_number': serials[3], 'consumer_email': 'late@test.com'},
+        {'serial_number': serials[0], 'consumer_email': 'again@test.com'},
+        {'serial_number': 'UNKNOWN-1', 'consumer_email': 'ghost@test.com'},
+        {'serial_number': foreign.serial_number, 'consumer_email': 'foreign@test.com'},
+    ]
+    api_client.force_authenticate(user=wholesaler_user)
+    response = api_client.post(reverse('warranty-issue-bulk'), {'warranties': rows}, format='json')
+
+    assert response.status_code == 200
+    assert (response.data['issued'], response.data['existing'], response.data['failed']) == (3, 1, 3)
+    assert [result['status'] for result in response.data['results']] == [
+        'issued', 'issued', 'issued', 'exists', 'error', 'error', 'error'
+    ]
+    assert response.data['results'][3]['warranty_number'] == existing.warranty_number
+
+    # Rows sharing a contact share one new consumer, with its profile and backfilled phone.
+    buyer = User.objects.get(email='new.buyer@test.com')
+    assert buyer.phone == '+919666666666'
+    assert UserProfile.objects.filter(user=buyer).exists()
+    assert response.data['results'][1]['consumer_id'] == buyer.id
+    consumer_user.refresh_from_db()
+    assert response.data['results'][2]['consumer_id'] == consumer_user.id
+    assert consumer_user.last_name == 'Known'
+    assert cache.get(user_cache_key(consumer_user.id, consumer_user.token_version)) is None
+
+    issued = SerialNumber.objects.filter(serial_number__in=serials[:3])
+    assert set(issued.values_list('status', flat=True)) == {SerialNumber.Status.SOLD}
+    assert Warranty.objects.filter(serial_number__in=issued, issued_by=wholesaler_user).count() == 3
+    assert not Warranty.objects.filter(serial_number=foreign).exists()
+    assert rebuild_stock_summaries(dry_run=True) == []
+
+    api_client.force_authenticate(user=consumer_user)
+    assert api_client.post(reverse('warranty-issue-bulk'), {'warranties': rows}, format='json').status_code == 403
+    api_client.force_authenticate(user=admin_user)
+    assert api_client.post(reverse('warranty-issue-bulk'), {'warranties': []}, format='json').status_code == 400
+
+
+@pytest.mark.django_db
+def test_bulk_issue_query_count_does_not_grow_with_rows(api_client, battery_model, wholesaler_user):
+    serials = _allocate_serials(battery_model, wholesaler_user, 12)
+    api_client.force_authenticate(user=wholesaler_user)
+
+    def issue(batch):
+        rows = [{'serial_number': serial, 'consumer_email': f'buyer-{serial}@test.com'} for serial in batch]
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(reverse('warranty-issue-bulk'), {'warranties': rows}, format='json')
+        assert response.data['issued'] == len(batch)
+        return len(queries)
+
+    assert issue(serials[:2]) == issue(serials[2:])
+
+
+@pytest.mark.django_db
+def test_bulk_issue_dispatches_assets_and_confirmations(
+    api_client, battery_model, wholesaler_user, monkeypatch, settings, tmp_path, django_capture_on_commit_callbacks
+):
+    settings.MEDIA_ROOT = tmp_path
+    settings.ASYNC_TASKS_ENABLED = False
+    monkeypatch.setattr('core.background.run_in_background', lambda func, *args, **kwargs: func(*args, **kwargs))
+    serials = _allocate_serials(battery_model, wholesaler_user, 2)
+    rows = [{'serial_number': serial, 'consumer_email': f'buyer-{serial}@test.com'} for serial in serials]
+    api_client.force_authenticate(user=wholesaler_user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(reverse('warranty-issue-bulk'), {'warranties': rows}, format='json')
+
+    assert response.data['issued'] == 2
+    for warranty in Warranty.objects.filter(serial_number__serial_number__in=serials):
+        assert warranty.certificate_file and warranty.qr_code_image
+        assert NotificationLog.objects.filter(metadata__warranty_id=warranty.id).exists()
+
+
+@pytest.mark.django_db
+def test_asset_sweep_generates_missing_certificates(battery_model, wholesaler_user, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    serials = _allocate_serials(battery_model, wholesaler_user, 2)
+    stale, recent = [
+        Warranty.objects.create(serial_number=SerialNumber.objects.get(serial_number=serial))
+        for serial in serials
+    ]
+    Warranty.objects.filter(id=stale.id).update(created_at=timezone.now() - timedelta(hours=1))
+
+    settings.WARRANTY_VERIFY_BASE_URL = ''
+    assert generate_missing_warranty_assets_task() == []
+
+    settings.WARRANTY_VERIFY_BASE_URL = 'https://api.example.com/'
+    assert generate_missing_warranty_assets_task() == [stale.id]
+    stale.refresh_from_db()
+    recent.refresh_from_db()
+    assert stale.certificate_file and stale.qr_code_image
+    assert not recent.certificate_file
+    assert generate_missing_warranty_assets_task() == []
+
+
+@pytest.mark.django_db
+def test_consumers_created_in_bulk_drop_admin_metrics(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr('apps.warranty.services.invalidate_admin_metrics', lambda: invalidated.append(True))
+    resolver = _ConsumerResolver([{'consumer_email': 'bulk.buyer@test.com'}])
+    resolver.resolve({'consumer_email': 'bulk.buyer@test.com'})
+    resolver.save()
+
+    assert invalidated
+    assert UserProfile.objects.filter(user__email='bulk.buyer@test.com').exists()
+
+
+def test_async_tasks_require_a_warranty_verify_base_url(settings):
+    settings.ASYNC_TASKS_ENABLED = True
+    settings.WARRANTY_VERIFY_BASE_URL = ''
+    with pytest.raises(ImproperlyConfigured):
+        check_warranty_asset_settings()
+
+    settings.WARRANTY_VERIFY_BASE_URL = 'https://api.example.com'
+    check_warranty_asset_settings()
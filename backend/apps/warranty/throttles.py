@@ -0,0 +1,26 @@
+"""Throttles for the public warranty endpoints."""
+from rest_framework.throttling import UserRateThrottle
+
+from .verification import cached_verification
+
+
+class WarrantyVerifyRateThrottle(UserRateThrottle):
+	"""Per user or IP, with its own rate so QR scans at retail events are not held to the anon rate.
+
+	Only scans that miss the verification cache, and so reach the database,
+	are counted. Cache hits, 304s included, skip the throttle's cache round
+	trips; the entry read here is kept on the request for the view.
+	"""
+	scope = 'warranty_verify'
+
+	def allow_request(self, request, view):
+		serial_number = view.kwargs.get('serial_number')
+		request.cached_verification = cached_verification(serial_number) if serial_number else None
+		if request.cached_verification is not None:
+			return True
+		return super().allow_request(request, view)
+
+
+class WarrantyBulkVerifyRateThrottle(UserRateThrottle):
+	"""Per user, for bulk verification requests that each check thousands of serials."""
+	scope = 'warranty_verify_bulk'
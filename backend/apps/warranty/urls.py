@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import WarrantyViewSet, WarrantyClaimViewSet, verify_warranty
+from .views import WarrantyViewSet, WarrantyClaimViewSet, verify_warranty, verify_warranties_bulk
 
 router = DefaultRouter()
 router.register(r'claims', WarrantyClaimViewSet, basename='warranty-claim')
@@ -9,5 +9,6 @@ router.register(r'', WarrantyViewSet, basename='warranty')
 
 urlpatterns = [
 	path('', include(router.urls)),
+	path('verify/bulk/', verify_warranties_bulk, name='warranty-verify-bulk'),
 	path('verify/<str:serial_number>/', verify_warranty, name='warranty-verify'),
 ]
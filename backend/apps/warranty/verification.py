@@ -0,0 +1,117 @@
+"""
+Cached public warranty verification.
+
+Every QR scan hits verify_warranty, so the serialized payload is cached
+per serial number, together with its ETag and Last-Modified values, for
+WARRANTY_VERIFY_CACHE_SECONDS. Unknown serials are cached too, so bursts
+of scans for a serial without a warranty stay off the database.
+
+Saving or deleting a Warranty, or renaming its consumer, drops the entry.
+Battery model renames show up once the entry expires.
+
+Bulk verification skips the cache and resolves every serial with one
+joined query instead.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.http import quote_etag
+
+from apps.inventory.models import SerialNumber
+from .models import Warranty
+from .serializers import WarrantyPublicSerializer
+
+NOT_FOUND = 'not-found'
+
+
+def verification_cache_key(serial_number):
+	digest = hashlib.md5(serial_number.encode()).hexdigest()
+	return f'warranty-verify:{digest}'
+
+
+def build_verification(serial_number):
+	"""Load and serialize the warranty for `serial_number`, or None if there is none."""
+	warranty = (
+		Warranty.objects
+		.select_related('serial_number__battery_model', 'consumer')
+		.filter(serial_number__serial_number=serial_number)
+		.first()
+	)
+	if warranty is None:
+		return None
+
+	data = WarrantyPublicSerializer(warranty).data
+	body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+	modified = [warranty.updated_at, warranty.serial_number.battery_model.updated_at]
+	if warranty.consumer is not None:
+		modified.append(warranty.consumer.updated_at)
+	return {
+		'data': data,
+		# Weak, since the same payload may be rendered as JSON or the browsable API.
+		'etag': 'W/' + quote_etag(hashlib.md5(body.encode()).hexdigest()),
+		'last_modified': max(modified).timestamp(),
+	}
+
+
+def cached_verification(serial_number):
+	"""Return the cache entry for `serial_number` (NOT_FOUND included), or None on a miss."""
+	return cache.get(verification_cache_key(serial_number))
+
+
+def get_verification(serial_number, cached=None):
+	"""Return the cached verification for `serial_number`, building it on a miss.
+
+	Pass `cached` when the entry was already read with cached_verification.
+	"""
+	key = verification_cache_key(serial_number)
+	verification = cached if cached is not None else cache.get(key)
+	if verification is None:
+		verification = build_verification(serial_number) or NOT_FOUND
+		cache.set(key, verification, getattr(settings, 'WARRANTY_VERIFY_CACHE_SECONDS', 300))
+	return None if verification == NOT_FOUND else verification
+
+
+def invalidate_verifications(serial_numbers):
+	"""Drop cached verifications now and again once the transaction commits."""
+	keys = [verification_cache_key(serial_number) for serial_number in serial_numbers]
+	if not keys:
+		return
+	cache.delete_many(keys)
+	transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def iter_bulk_verifications(serial_numbers, allocated_to=None):
+	"""
+	Yield one result per distinct serial number, from a single IN query.
+
+	Known serials come first, ordered by serial number, with status
+	"verified" and the public warranty payload, or "no_warranty" when the
+	serial has not been sold with one. Unknown serials follow in input
+	order with status "not_found"; with `allocated_to`, so do serials not
+	allocated to that user.
+	"""
+	pending = dict.fromkeys(serial_numbers)
+	serials = (
+		SerialNumber.objects
+		.filter(serial_number__in=list(pending))
+		.select_related('battery_model', 'warranty__consumer')
+		.order_by('serial_number')
+	)
+	if allocated_to is not None:
+		serials = serials.filter(allocated_to=allocated_to)
+	for serial in serials.iterator(chunk_size=1000):
+		del pending[serial.serial_number]
+		try:
+			warranty = serial.warranty
+		except ObjectDoesNotExist:
+			yield {'serial': serial.serial_number, 'status': 'no_warranty', 'warranty': None}
+			continue
+		yield {'serial': serial.serial_number, 'status': 'verified', 'warranty': WarrantyPublicSerializer(warranty).data}
+
+	for serial_number in pending:
+		yield {'serial': serial_number, 'status': 'not_found', 'warranty': None}
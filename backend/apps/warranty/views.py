@@ -1,38 +1,44 @@
 """Warranty API views."""
-import csv
 
 from django.conf import settings
 from django.db import transaction
-from django.http import FileResponse, HttpResponse
+from django.db.models import Prefetch
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from django.utils import timezone
-from django.utils.dateparse import parse_date
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 
 from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+from core.pagination import OptionalCursorPagination
 from core.permissions import IsAdmin, IsAdminOrWholesaler
-from core.utils import format_phone_number
+from core.utils import format_phone_number, streaming_csv_response, streaming_json_response
 from apps.inventory.models import SerialNumber
 from django.contrib.auth import get_user_model
 
-from .models import Warranty, WarrantyClaim, WarrantyClaimAttachment
+from .exports import WARRANTY_EXPORT_HEADER, filter_warranties_for_export, warranty_export_rows
+from .models import ClaimStatusHistory, Warranty, WarrantyClaim, WarrantyClaimAttachment
 from .serializers import (
     WarrantySerializer,
     WarrantyIssueSerializer,
+    WarrantyBulkIssueSerializer,
     WarrantyClaimSerializer,
-    WarrantyPublicSerializer,
+    WarrantyBulkVerifySerializer,
     WarrantyClaimCreateSerializer,
     WarrantyClaimDetailSerializer,
 )
 from apps.notifications.services import send_warranty_confirmation
 from apps.notifications.tasks import send_warranty_confirmation_task
+from .services import issue_warranties
 from .tasks import generate_warranty_assets_task
+from .throttles import WarrantyBulkVerifyRateThrottle, WarrantyVerifyRateThrottle
+from .verification import get_verification, iter_bulk_verifications
 
 User = get_user_model()
 
@@ -79,9 +85,10 @@ def get_or_create_consumer(email=None, phone=None, first_name=None, last_name=No
 class WarrantyViewSet(viewsets.ReadOnlyModelViewSet):
     """View warranties by role and issue/claim actions."""
 
-    queryset = Warranty.objects.select_related('serial_number', 'consumer', 'issued_by')
+    queryset = Warranty.objects.select_related('serial_number__battery_model', 'consumer', 'issued_by')
     serializer_class = WarrantySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['warranty_number', 'serial_number__serial_number']
@@ -123,10 +130,7 @@ class WarrantyViewSet(viewsets.ReadOnlyModelViewSet):
         consumer, _ = get_or_create_consumer(email, phone, first_name, last_name)
 
         if serial.status != SerialNumber.Status.SOLD:
-            serial.status = SerialNumber.Status.SOLD
-            serial.sold_to = consumer
-            serial.sold_at = timezone.now()
-            serial.save(update_fields=['status', 'sold_to', 'sold_at'])
+            serial.mark_sold(consumer)
 
         warranty = Warranty.objects.create(
             serial_number=serial,
@@ -176,10 +180,7 @@ class WarrantyViewSet(viewsets.ReadOnlyModelViewSet):
 
         consumer, _ = get_or_create_consumer(email, phone, first_name, last_name)
 
-        serial.status = SerialNumber.Status.SOLD
-        serial.sold_to = consumer
-        serial.sold_at = timezone.now()
-        serial.save(update_fields=['status', 'sold_to', 'sold_at'])
+        serial.mark_sold(consumer)
 
         warranty = Warranty.objects.create(
             serial_number=serial,
@@ -204,6 +205,29 @@ class WarrantyViewSet(viewsets.ReadOnlyModelViewSet):
 
         return Response(WarrantySerializer(warranty).data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'], url_path='issue/bulk', permission_classes=[IsAdminOrWholesaler])
+    def issue_bulk(self, request):
+        """Issue warranties for many sold serials in one request (admin/wholesaler)."""
+        serializer = WarrantyBulkIssueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = issue_warranties(
+            serializer.validated_data['warranties'],
+            request.user,
+            lambda serial_number: request.build_absolute_uri(
+                reverse('warranty-verify', kwargs={'serial_number': serial_number})
+            )
+        )
+        counts = {outcome: 0 for outcome in ('issued', 'exists', 'error')}
+        for result in results:
+            counts[result['status']] += 1
+        return Response({
+            'issued': counts['issued'],
+            'existing': counts['exists'],
+            'failed': counts['error'],
+            'results': results,
+        })
+
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def certificate(self, request, pk=None):
         """Download warranty certificate PDF."""
@@ -215,49 +239,21 @@ class WarrantyViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
     def export(self, request):
         """Export warranties as CSV (admin only)."""
-        status_param = request.query_params.get('status')
-        date_from_raw = request.query_params.get('from')
-        date_to_raw = request.query_params.get('to')
-        date_from = parse_date(date_from_raw) if date_from_raw else None
-        date_to = parse_date(date_to_raw) if date_to_raw else None
-
-        queryset = self.queryset
-        if status_param:
-            queryset = queryset.filter(status=status_param)
-        if date_from:
-            queryset = queryset.filter(created_at__date__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(created_at__date__lte=date_to)
-
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="warranties.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            'warranty_number', 'serial_number', 'battery_model', 'consumer_email',
-            'status', 'start_date', 'end_date', 'issued_by', 'created_at'
-        ])
-
-        for warranty in queryset:
-            writer.writerow([
-                warranty.warranty_number,
-                warranty.serial_number.serial_number,
-                warranty.battery_model.name,
-                warranty.consumer.email if warranty.consumer else '',
-                warranty.status,
-                warranty.start_date.isoformat(),
-                warranty.end_date.isoformat() if warranty.end_date else '',
-                warranty.issued_by.email if warranty.issued_by else '',
-                warranty.created_at.isoformat(),
-            ])
-
-        return response
+        queryset = filter_warranties_for_export(request.query_params)
+        return streaming_csv_response(
+            WARRANTY_EXPORT_HEADER, warranty_export_rows(queryset), 'warranties.csv'
+        )
 
 
 class WarrantyClaimViewSet(viewsets.ModelViewSet):
     """Warranty claim workflow APIs with status transitions."""
 
-    queryset = WarrantyClaim.objects.select_related('warranty', 'consumer', 'warranty__serial_number', 'assigned_to', 'reviewed_by').prefetch_related('attachments')
+    queryset = WarrantyClaim.objects.select_related(
+        'warranty', 'consumer', 'warranty__serial_number', 'assigned_to', 'reviewed_by'
+    ).prefetch_related(
+        'attachments',
+        Prefetch('status_history', queryset=ClaimStatusHistory.objects.select_related('changed_by')),
+    )
     serializer_class = WarrantyClaimDetailSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
@@ -378,11 +374,52 @@ class WarrantyClaimViewSet(viewsets.ModelViewSet):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([WarrantyVerifyRateThrottle])
 def verify_warranty(request, serial_number):
-    """Public warranty verification endpoint."""
-    warranty = get_object_or_404(
-        Warranty.objects.select_related('serial_number', 'consumer', 'serial_number__battery_model'),
-        serial_number__serial_number=serial_number
+    """
+    Public warranty verification endpoint.
+
+    Served from the verification cache, with ETag/Last-Modified for
+    conditional GETs and public Cache-Control so a CDN can absorb bursts.
+    Only cache misses count against the throttle.
+    """
+    max_age = getattr(settings, 'WARRANTY_VERIFY_MAX_AGE', 60)
+    verification = get_verification(serial_number, cached=getattr(request, 'cached_verification', None))
+    if verification is None:
+        response = Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        patch_cache_control(response, public=True, max_age=max_age)
+        return response
+
+    response = get_conditional_response(
+        request,
+        etag=verification['etag'],
+        last_modified=int(verification['last_modified']),
+        response=Response(verification['data']),
     )
-    serializer = WarrantyPublicSerializer(warranty)
-    return Response(serializer.data)
+    response['ETag'] = verification['etag']
+    response['Last-Modified'] = http_date(verification['last_modified'])
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAdminOrWholesaler])
+@throttle_classes([WarrantyBulkVerifyRateThrottle])
+def verify_warranties_bulk(request):
+    """
+    Verify many serial numbers at once, e.g. a whole pallet.
+
+    Every serial is resolved by one joined query. Wholesalers only see
+    serials allocated to them; any other serial is reported as not found.
+    Large requests are streamed so the response starts before every
+    result is serialized.
+    """
+    serializer = WarrantyBulkVerifySerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    serial_numbers = list(dict.fromkeys(serializer.validated_data['serial_numbers']))
+
+    allocated_to = request.user if request.user.is_wholesaler else None
+    results = iter_bulk_verifications(serial_numbers, allocated_to=allocated_to)
+    if len(serial_numbers) > settings.WARRANTY_VERIFY_BULK_STREAM_THRESHOLD:
+        return streaming_json_response(results, count=len(serial_numbers))
+    return Response({'count': len(serial_numbers), 'results': list(results)})
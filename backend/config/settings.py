@@ -35,16 +35,20 @@ INSTALLED_APPS = [
     'storages',
     
     # Local apps
+    'core',
     'apps.users',
     'apps.authentication',
     'apps.inventory',
     'apps.orders',
     'apps.warranty',
     'apps.notifications',
+    'apps.exports',
+    'apps.reports',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.RequestLoggingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -116,6 +120,8 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 # Media files
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Files only served through authenticated views (e.g. exports); never exposed as media.
+PRIVATE_MEDIA_ROOT = config('PRIVATE_MEDIA_ROOT', default=str(BASE_DIR / 'private_media'))
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -126,7 +132,7 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authentication.backends.PreloadedUserJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -138,6 +144,8 @@ REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_RATES': {
         'anon': config('REST_THROTTLE_ANON', default='60/min'),
         'user': config('REST_THROTTLE_USER', default='600/min'),
+        'warranty_verify': config('REST_THROTTLE_WARRANTY_VERIFY', default='300/min'),
+        'warranty_verify_bulk': config('REST_THROTTLE_WARRANTY_VERIFY_BULK', default='30/min'),
     },
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -164,6 +172,12 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
 }
 
+# Seconds to cache the user loaded for a JWT; 0 loads it on every request.
+AUTH_USER_CACHE_SECONDS = config('AUTH_USER_CACHE_SECONDS', default=0, cast=int)
+# Authorize from the role/permission claims in access tokens instead of loading the user.
+# Needs a shared cache (CACHE_URL); startup fails otherwise.
+JWT_STATELESS_AUTH = config('JWT_STATELESS_AUTH', default=False, cast=bool)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -187,6 +201,45 @@ NOTIFICATIONS_SMS_ENABLED = config('NOTIFICATIONS_SMS_ENABLED', default=False, c
 NOTIFICATIONS_FROM_EMAIL = config('NOTIFICATIONS_FROM_EMAIL', default=DEFAULT_FROM_EMAIL)
 NOTIFICATIONS_SMS_PROVIDER = config('NOTIFICATIONS_SMS_PROVIDER', default='none')
 ASYNC_TASKS_ENABLED = config('ASYNC_TASKS_ENABLED', default=False, cast=bool)
+BACKGROUND_TASK_WORKERS = config('BACKGROUND_TASK_WORKERS', default=2, cast=int)
+EXPORT_JOB_REUSE_SECONDS = config('EXPORT_JOB_REUSE_SECONDS', default=300, cast=int)
+EXPORT_JOB_STALE_SECONDS = config('EXPORT_JOB_STALE_SECONDS', default=120, cast=int)
+STOCK_ALLOCATION_BULK_MAX_LINES = config('STOCK_ALLOCATION_BULK_MAX_LINES', default=20000, cast=int)
+
+# Cache
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+WARRANTY_VERIFY_CACHE_SECONDS = config('WARRANTY_VERIFY_CACHE_SECONDS', default=300, cast=int)
+WARRANTY_VERIFY_MAX_AGE = config('WARRANTY_VERIFY_MAX_AGE', default=60, cast=int)
+WARRANTY_VERIFY_BULK_MAX_SERIALS = config('WARRANTY_VERIFY_BULK_MAX_SERIALS', default=5000, cast=int)
+WARRANTY_VERIFY_BULK_STREAM_THRESHOLD = config('WARRANTY_VERIFY_BULK_STREAM_THRESHOLD', default=500, cast=int)
+WARRANTY_ISSUE_BULK_MAX_ROWS = config('WARRANTY_ISSUE_BULK_MAX_ROWS', default=2000, cast=int)
+# Longest a process keeps its staff permission matrix without reloading it.
+PERMISSION_MATRIX_MAX_AGE = config('PERMISSION_MATRIX_MAX_AGE', default=30, cast=int)
+ADMIN_METRICS_CACHE_SECONDS = config('ADMIN_METRICS_CACHE_SECONDS', default=60, cast=int)
+ADMIN_METRICS_REFRESH_SECONDS = config('ADMIN_METRICS_REFRESH_SECONDS', default=30, cast=int)
+REPORTS_ROLLUP_INTERVAL_SECONDS = config('REPORTS_ROLLUP_INTERVAL_SECONDS', default=900, cast=int)
+REPORTS_ROLLUP_LOOKBACK_DAYS = config('REPORTS_ROLLUP_LOOKBACK_DAYS', default=3, cast=int)
+# Periodic retry of warranty QR/PDF generation whose queued job was lost.
+# QR codes printed by the sweep point at WARRANTY_VERIFY_BASE_URL (the public
+# API origin, e.g. https://api.example.com). It is required when
+# ASYNC_TASKS_ENABLED is on; startup fails without it.
+WARRANTY_VERIFY_BASE_URL = config('WARRANTY_VERIFY_BASE_URL', default='')
+WARRANTY_ASSET_SWEEP_SECONDS = config('WARRANTY_ASSET_SWEEP_SECONDS', default=300, cast=int)
+WARRANTY_ASSET_SWEEP_MIN_AGE = config('WARRANTY_ASSET_SWEEP_MIN_AGE', default=600, cast=int)
+WARRANTY_ASSET_SWEEP_BATCH_SIZE = config('WARRANTY_ASSET_SWEEP_BATCH_SIZE', default=200, cast=int)
 
 # Celery Settings
 CELERY_BROKER_URL = config('REDIS_URL', default='redis://localhost:6379/0')
@@ -195,6 +248,20 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'refresh-admin-metrics': {
+        'task': 'core.tasks.refresh_admin_metrics_task',
+        'schedule': ADMIN_METRICS_REFRESH_SECONDS,
+    },
+    'update-metric-rollups': {
+        'task': 'apps.reports.tasks.update_metric_rollups_task',
+        'schedule': REPORTS_ROLLUP_INTERVAL_SECONDS,
+    },
+    'generate-missing-warranty-assets': {
+        'task': 'apps.warranty.tasks.generate_missing_warranty_assets_task',
+        'schedule': WARRANTY_ASSET_SWEEP_SECONDS,
+    },
+}
 
 # AWS S3 Settings (Optional)
 USE_S3 = config('USE_S3', default=False, cast=bool)
@@ -239,6 +306,17 @@ WEB_LANDING_URL = config(
 )
 
 # Logging
+# Request logging thresholds (see core.middleware.RequestLoggingMiddleware)
+REQUEST_LOG_SLOW_MS = config('REQUEST_LOG_SLOW_MS', default=1000, cast=int)
+REQUEST_LOG_MAX_QUERIES = config('REQUEST_LOG_MAX_QUERIES', default=50, cast=int)
+REQUEST_LOG_SLOWEST_QUERIES = config('REQUEST_LOG_SLOWEST_QUERIES', default=5, cast=int)
+
+# Prometheus (set PROMETHEUS_MULTIPROC_DIR in the environment for multi-process servers)
+# /metrics is refused unless the scraper sends this bearer token or connects
+# from one of the allowed addresses.
+PROMETHEUS_METRICS_TOKEN = config('PROMETHEUS_METRICS_TOKEN', default='')
+PROMETHEUS_METRICS_ALLOWED_IPS = config('PROMETHEUS_METRICS_ALLOWED_IPS', default='', cast=Csv())
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -6,7 +6,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from core.prometheus import metrics_view
 from core.views import AdminMetricsView, AppDownloadRedirectView
+from apps.reports.views import MetricsTimeseriesView
 
 urlpatterns = [
     # Admin
@@ -19,7 +21,11 @@ urlpatterns = [
 
     # Admin Metrics
     path('api/admin/metrics/', AdminMetricsView.as_view(), name='admin-metrics'),
+    path('api/admin/metrics/timeseries/', MetricsTimeseriesView.as_view(), name='admin-metrics-timeseries'),
     
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='prometheus-metrics'),
+
     # Smart Download Redirect (QR code endpoint for device detection)
     path('download/app/', AppDownloadRedirectView.as_view(), name='app-download-redirect'),
     
@@ -30,6 +36,7 @@ urlpatterns = [
     path('api/orders/', include('apps.orders.urls')),
     path('api/warranty/', include('apps.warranty.urls')),
     path('api/notifications/', include('apps.notifications.urls')),
+    path('api/exports/', include('apps.exports.urls')),
 ]
 
 # Serve media files in development
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        """Register signals, serializer timing and task metrics when app is ready."""
+        import core.signals  # noqa
+        from core.instrumentation import install_serializer_timing
+        from core.prometheus import connect_celery_signals
+
+        install_serializer_timing()
+        connect_celery_signals()
@@ -0,0 +1,43 @@
+"""
+In-process background execution for when Celery is disabled.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+_executor = None
+
+
+def get_executor():
+    """Return the process-wide thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 2),
+            thread_name_prefix='background-task'
+        )
+    return _executor
+
+
+def _run_with_own_connections(func, args, kwargs):
+    try:
+        return func(*args, **kwargs)
+    finally:
+        # Worker threads hold their own DB connections; don't leak them.
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Run func on the background thread pool and return its Future."""
+    return get_executor().submit(_run_with_own_connections, func, args, kwargs)
+
+
+def dispatch_task(task, *args, **kwargs):
+    """
+    Queue a Celery task, or run it on the thread pool when
+    ASYNC_TASKS_ENABLED is off so the request still returns immediately.
+    """
+    if getattr(settings, 'ASYNC_TASKS_ENABLED', False):
+        return task.delay(*args, **kwargs)
+    return run_in_background(task, *args, **kwargs)
@@ -0,0 +1,254 @@
+"""
+Benchmarks for the hot API paths.
+
+Each scenario is one request sent through the Django test client with a
+real JWT, timed end to end, with its SQL queries counted. Scenarios that
+write run inside a transaction that is rolled back after every
+iteration, so the dataset stays at the seeded size and runs are
+repeatable. Results are plain dicts that serialize to JSON and can be
+compared against a stored baseline.
+"""
+import json
+import math
+import time
+
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.instrumentation import QueryRecorder, RequestStats
+
+# Serials sent per verify_warranty_bulk request.
+BULK_VERIFY_SIZE = 500
+
+
+class Scenario:
+    """A single request to benchmark."""
+
+    def __init__(self, name, method, url, data=None, user=None, writes=False):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.data = data
+        self.user = user
+        self.writes = writes
+
+
+class _Rollback(Exception):
+    pass
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms, query_counts, statuses):
+    return {
+        'iterations': len(latencies_ms),
+        'p50_ms': round(percentile(latencies_ms, 50), 3),
+        'p95_ms': round(percentile(latencies_ms, 95), 3),
+        'mean_ms': round(sum(latencies_ms) / len(latencies_ms), 3),
+        'max_ms': round(max(latencies_ms), 3),
+        'queries_per_request': round(sum(query_counts) / len(query_counts), 2),
+        'max_queries': max(query_counts),
+        'statuses': sorted(set(statuses)),
+    }
+
+
+def build_client(user=None):
+    client = APIClient()
+    if user is not None:
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+def send(client, scenario):
+    if scenario.method == 'GET':
+        response = client.get(scenario.url)
+    else:
+        response = client.generic(scenario.method, scenario.url, json.dumps(scenario.data or {}), 'application/json')
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def run_once(client, scenario):
+    """Return (latency_ms, query_count, status_code) for one request."""
+    stats = RequestStats(keep_slowest=0)
+    with connection.execute_wrapper(QueryRecorder(stats)):
+        start = time.perf_counter()
+        response = send(client, scenario)
+        latency_ms = (time.perf_counter() - start) * 1000
+    return latency_ms, stats.query_count, response.status_code
+
+
+def run_scenario(scenario, iterations, warmup=1):
+    client = build_client(scenario.user)
+    latencies, queries, statuses = [], [], []
+    for index in range(warmup + iterations):
+        if scenario.writes:
+            try:
+                with transaction.atomic():
+                    result = run_once(client, scenario)
+                    raise _Rollback
+            except _Rollback:
+                pass
+        else:
+            result = run_once(client, scenario)
+        if index >= warmup:
+            latencies.append(result[0])
+            queries.append(result[1])
+            statuses.append(result[2])
+    return summarize(latencies, queries, statuses)
+
+
+def run_benchmarks(scenarios, iterations, warmup=1, on_result=None):
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, iterations, warmup=warmup)
+        if on_result:
+            on_result(scenario.name, results[scenario.name])
+    return results
+
+
+def load_fixtures():
+    """
+    Pick the rows the scenarios act on from a seeded database.
+
+    Needs an admin and at least two serials allocated to an active
+    wholesaler. If no warranty exists yet, one of them is sold and given a
+    warranty so verify_warranty has something to find.
+    """
+    from apps.inventory.models import SerialNumber
+    from apps.users.models import User
+    from apps.warranty.models import Warranty
+
+    admin = User.objects.filter(role='ADMIN', is_active=True).order_by('id').first()
+    open_serial = (
+        SerialNumber.objects
+        .filter(
+            status=SerialNumber.Status.ALLOCATED,
+            allocated_to__is_active=True,
+            warranty__isnull=True,
+        )
+        .select_related('allocated_to', 'battery_model')
+        .order_by('id')
+        .first()
+    )
+    if admin is None or open_serial is None:
+        raise ValueError('Benchmarks need an admin and serials allocated to a wholesaler; run seed_data first.')
+
+    warranty = Warranty.objects.select_related('serial_number').order_by('id').first()
+    if warranty is None:
+        sold_serial = (
+            SerialNumber.objects
+            .filter(status=SerialNumber.Status.ALLOCATED, warranty__isnull=True)
+            .exclude(pk=open_serial.pk)
+            .order_by('id')
+            .first()
+        )
+        if sold_serial is None:
+            raise ValueError('Benchmarks need at least two allocated serials; run seed_data first.')
+        consumer = User.objects.filter(role='CONSUMER').order_by('id').first()
+        sold_serial.mark_sold(consumer)
+        warranty = Warranty.objects.create(
+            serial_number=sold_serial,
+            consumer=consumer,
+            issued_by=sold_serial.allocated_to,
+            notes='Benchmark fixture'
+        )
+
+    return {
+        'admin': admin,
+        'wholesaler': open_serial.allocated_to,
+        'battery_model': open_serial.battery_model,
+        'open_serial': open_serial.serial_number,
+        'warranty_serial': warranty.serial_number.serial_number,
+        'bulk_serials': list(
+            SerialNumber.objects.order_by('id').values_list('serial_number', flat=True)[:BULK_VERIFY_SIZE]
+        ),
+    }
+
+
+def build_scenarios(fixtures):
+    """
+    Scenarios for the hot paths. fixtures holds the rows they act on:
+    admin, wholesaler, battery_model, warranty_serial (a serial with a
+    warranty), open_serial (a serial allocated to the wholesaler but
+    not sold) and bulk_serials (serials for bulk verification).
+    """
+    admin = fixtures['admin']
+    wholesaler = fixtures['wholesaler']
+    open_serial = fixtures['open_serial']
+    return [
+        Scenario(
+            'verify_warranty', 'GET',
+            reverse('warranty-verify', kwargs={'serial_number': fixtures['warranty_serial']}),
+        ),
+        Scenario(
+            'verify_warranty_bulk', 'POST', reverse('warranty-verify-bulk'),
+            data={'serial_numbers': fixtures['bulk_serials']}, user=wholesaler,
+        ),
+        Scenario(
+            'warranty_issue', 'POST', reverse('warranty-issue'),
+            data={'serial_number': open_serial, 'consumer_email': 'bench-issue@lithovolt.com.au'},
+            user=wholesaler, writes=True,
+        ),
+        Scenario(
+            'warranty_claim', 'POST', reverse('warranty-claim'),
+            data={'serial_number': open_serial, 'consumer_email': 'bench-claim@lithovolt.com.au'},
+            writes=True,
+        ),
+        Scenario(
+            'stock_allocation', 'POST', reverse('stock-allocation-list'),
+            data={'battery_model_id': fixtures['battery_model'].id, 'wholesaler_id': wholesaler.id, 'quantity': 10},
+            user=admin, writes=True,
+        ),
+        Scenario(
+            'order_create', 'POST', reverse('order-list'),
+            data={'items': [{
+                'product_type': 'BATTERY_MODEL',
+                'battery_model_id': fixtures['battery_model'].id,
+                'quantity': 5,
+            }]},
+            user=wholesaler, writes=True,
+        ),
+        Scenario('list_serials', 'GET', reverse('serial-number-list'), user=admin),
+        Scenario('list_battery_models', 'GET', reverse('battery-model-list'), user=admin),
+        Scenario('list_orders', 'GET', reverse('order-list'), user=admin),
+        Scenario('list_warranties', 'GET', reverse('warranty-list'), user=admin),
+        Scenario('list_notifications', 'GET', reverse('notification-list'), user=admin),
+        Scenario('export_orders', 'GET', reverse('order-export'), user=admin),
+        Scenario('export_warranties', 'GET', reverse('warranty-export'), user=admin),
+    ]
+
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """
+    Compare results against a baseline run with the same layout.
+
+    A scenario regresses when its p95 latency grows by more than
+    tolerance (a fraction) or when it issues more queries per request.
+    Returns a list of human-readable regression messages.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        limit = previous['p95_ms'] * (1 + tolerance)
+        if current['p95_ms'] > limit:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f}ms > {previous['p95_ms']:.1f}ms baseline (+{tolerance:.0%})"
+            )
+        if current['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f"{name}: {current['queries_per_request']} queries/request > "
+                f"{previous['queries_per_request']} baseline"
+            )
+    return regressions
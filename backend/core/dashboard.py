@@ -0,0 +1,84 @@
+"""
+Admin dashboard metrics with a shared cache.
+
+Metrics are computed with one grouped query per table and cached for
+ADMIN_METRICS_CACHE_SECONDS. A periodic task refreshes the cached copy so
+polling dashboards rarely reach the database, and writes to the counted
+models drop it so changes show up on the next poll (see core.signals for
+the counts that only refresh on that schedule).
+
+The refresh and the invalidation only reach other processes through a
+shared cache (CACHE_URL); with the per-process fallback each process
+keeps its own copy for up to ADMIN_METRICS_CACHE_SECONDS.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+ADMIN_METRICS_CACHE_KEY = 'admin-metrics'
+
+
+def count_by(queryset, field, keys):
+    """
+    Count rows per value of `field` with a single GROUP BY query.
+
+    Every key in `keys` is present in the result, with 0 for values that
+    have no rows; values outside `keys` are ignored.
+    """
+    counts = dict.fromkeys(keys, 0)
+    rows = queryset.order_by().values_list(field).annotate(count=Count('pk'))
+    for value, count in rows:
+        if value in counts:
+            counts[value] = count
+    return counts
+
+
+def compute_admin_metrics():
+    """Compute the dashboard metrics straight from the database."""
+    from apps.users.models import User
+    from apps.inventory.models import BatteryModel, StockSummary
+    from apps.orders.models import Order
+    from apps.warranty.models import Warranty
+    from apps.notifications.models import NotificationLog
+
+    serial_totals = StockSummary.objects.filter(wholesaler__isnull=True).aggregate(
+        AVAILABLE=Sum('available_count'),
+        ALLOCATED=Sum('allocated_count'),
+        SOLD=Sum('sold_count'),
+    )
+    return {
+        'users_by_role': count_by(User.objects.all(), 'role', ('ADMIN', 'WHOLESALER', 'CONSUMER')),
+        'battery_models': BatteryModel.objects.count(),
+        'serials_by_status': {
+            status: serial_totals[status] or 0
+            for status in ('AVAILABLE', 'ALLOCATED', 'SOLD')
+        },
+        'orders_by_status': count_by(Order.objects.all(), 'status', Order.Status.values),
+        'warranties_by_status': count_by(Warranty.objects.all(), 'status', Warranty.Status.values),
+        'notifications_by_status': count_by(
+            NotificationLog.objects.all(), 'status', NotificationLog.Status.values
+        ),
+        'generated_at': timezone.now().isoformat(),
+    }
+
+
+def refresh_admin_metrics():
+    """Recompute the metrics and store them in the cache."""
+    metrics = compute_admin_metrics()
+    cache.set(ADMIN_METRICS_CACHE_KEY, metrics, getattr(settings, 'ADMIN_METRICS_CACHE_SECONDS', 60))
+    return metrics
+
+
+def get_admin_metrics():
+    """Return cached metrics, computing them on a miss."""
+    metrics = cache.get(ADMIN_METRICS_CACHE_KEY)
+    if metrics is None:
+        metrics = refresh_admin_metrics()
+    return metrics
+
+
+def invalidate_admin_metrics():
+    """Drop the cached metrics once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(ADMIN_METRICS_CACHE_KEY))
@@ -0,0 +1,92 @@
+"""
+Per-request performance counters: SQL queries, DB time and serializer time.
+"""
+import heapq
+import itertools
+import time
+from contextvars import ContextVar
+
+_current_stats = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    """Counters collected while a single request is handled."""
+
+    def __init__(self, keep_slowest=5):
+        self.query_count = 0
+        self.db_time_ms = 0.0
+        self.serializer_time_ms = 0.0
+        self.keep_slowest = keep_slowest
+        self._slowest = []
+        self._sequence = itertools.count()
+        self._serializer_depth = 0
+
+    def record_query(self, sql, duration_ms):
+        self.query_count += 1
+        self.db_time_ms += duration_ms
+        if self.keep_slowest <= 0:
+            return
+        entry = (duration_ms, next(self._sequence), sql)
+        if len(self._slowest) < self.keep_slowest:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    @property
+    def slowest_queries(self):
+        """(duration_ms, sql) pairs, slowest first."""
+        return [(duration, sql) for duration, _, sql in sorted(self._slowest, reverse=True)]
+
+
+class QueryRecorder:
+    """connection.execute_wrapper callable that times every query."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.record_query(sql, (time.perf_counter() - start) * 1000)
+
+
+def start_request_stats(keep_slowest=5):
+    """Start collecting stats for the current request; returns (stats, token)."""
+    stats = RequestStats(keep_slowest=keep_slowest)
+    return stats, _current_stats.set(stats)
+
+
+def stop_request_stats(token):
+    _current_stats.reset(token)
+
+
+def install_serializer_timing():
+    """
+    Time DRF serializer output (`serializer.data`) for the current request.
+
+    Only the outermost `.data` access is timed, so nested serializers that
+    call `.data` themselves are not counted twice. Queries issued lazily
+    while serializing count towards both serializer and DB time.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, 'is_timed', False):
+        return
+
+    def timed_data(serializer):
+        stats = _current_stats.get()
+        if stats is None or stats._serializer_depth:
+            return original.fget(serializer)
+        stats._serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original.fget(serializer)
+        finally:
+            stats._serializer_depth -= 1
+            stats.serializer_time_ms += (time.perf_counter() - start) * 1000
+
+    timed_data.is_timed = True
+    BaseSerializer.data = property(timed_data)
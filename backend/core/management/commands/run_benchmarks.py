@@ -0,0 +1,115 @@
+import json
+import platform
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.benchmarks import build_scenarios, compare_to_baseline, load_fixtures, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the hot API paths against the configured database. '
+        'Seeds it with seed_data --scale at each --scale (total serials), so point it at a disposable database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=int, nargs='+', default=[10000],
+                            help='Total serial counts to benchmark at, e.g. 10000 100000 1000000.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed passed to seed_data --scale.')
+        parser.add_argument('--skip-seed', action='store_true', help='Benchmark the data already in the database.')
+        parser.add_argument('--iterations', type=int, default=30)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--only', nargs='+', default=None, help='Scenario names to run.')
+        parser.add_argument('--output', help='Write the JSON results to this file instead of stdout.')
+        parser.add_argument('--baseline', help='JSON results of a previous run to compare against.')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Allowed p95 growth over the baseline, as a fraction.')
+        parser.add_argument('--fail-on-regression', action='store_true')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('Refusing to seed and benchmark with DEBUG off; pass --force if this database is disposable.')
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        report = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+            },
+            'scales': {},
+        }
+
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            MEDIA_ROOT=media_root,
+            ASYNC_TASKS_ENABLED=False,
+        ), mock.patch.object(SimpleRateThrottle, 'get_rate', lambda throttle: None):
+            # Throttle rates are read when DRF is imported, so override_settings
+            # cannot lift them; a None rate turns every throttle off for the run.
+            for scale in sorted(options['scale']):
+                report['scales'][str(scale)] = self.run_scale(scale, options)
+
+        regressions = []
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                baseline = json.load(handle)
+            for scale, results in report['scales'].items():
+                previous = baseline.get('scales', {}).get(scale)
+                if previous:
+                    regressions.extend(
+                        f'[{scale}] {message}'
+                        for message in compare_to_baseline(results, previous, options['tolerance'])
+                    )
+            report['regressions'] = regressions
+
+        payload = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(payload + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+        for message in regressions:
+            self.stderr.write(self.style.WARNING(f'Regression: {message}'))
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} benchmark regression(s) against {options["baseline"]}')
+
+    def run_scale(self, scale, options):
+        if not options['skip_seed']:
+            self.stderr.write(f'Seeding {scale} serials...')
+            call_command('seed_data', scale=scale, seed=options['seed'], stdout=self.stderr)
+
+        try:
+            fixtures = load_fixtures()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        scenarios = build_scenarios(fixtures)
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if scenario.name in options['only']]
+
+        def report_progress(name, result):
+            self.stderr.write(
+                f"[{scale}] {name}: p50={result['p50_ms']}ms p95={result['p95_ms']}ms "
+                f"queries={result['queries_per_request']}"
+            )
+
+        return run_benchmarks(
+            scenarios,
+            options['iterations'],
+            warmup=options['warmup'],
+            on_result=report_progress,
+        )
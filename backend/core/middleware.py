@@ -1,27 +1,77 @@
 """Middleware for request logging."""
 import time
 import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from core.instrumentation import QueryRecorder, start_request_stats, stop_request_stats
+from core.prometheus import observe_request
 
 
 logger = logging.getLogger('lithovolt.request')
 
 
 class RequestLoggingMiddleware:
-    """Log basic request info and duration."""
+    """
+    Log each request with its duration, SQL query count, DB time,
+    serializer time and response size, and feed the Prometheus request
+    metrics.
+
+    Queries are counted through connection.execute_wrapper, so this works
+    with DEBUG off. Requests over REQUEST_LOG_SLOW_MS or
+    REQUEST_LOG_MAX_QUERIES are logged at WARNING with the slowest queries.
+    Queries run while a streaming response is consumed are not counted.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        start_time = time.time()
-        response = self.get_response(request)
-        duration_ms = (time.time() - start_time) * 1000
+        stats, token = start_request_stats(
+            keep_slowest=getattr(settings, 'REQUEST_LOG_SLOWEST_QUERIES', 5)
+        )
+        start_time = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(QueryRecorder(stats)))
+                response = self.get_response(request)
+        finally:
+            stop_request_stats(token)
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        observe_request(request, response, duration_ms, stats.query_count)
+        self.log_request(request, response, stats, duration_ms)
+        return response
 
-        logger.info(
-            '%s %s %s %.2fms',
+    def log_request(self, request, response, stats, duration_ms):
+        if response.streaming:
+            response_size = response.get('Content-Length', 'streaming')
+        else:
+            response_size = len(response.content)
+
+        message = '%s %s %s %.2fms queries=%d db=%.2fms serializer=%.2fms size=%s'
+        args = [
             request.method,
             request.path,
             response.status_code,
-            duration_ms
-        )
-        return response
+            duration_ms,
+            stats.query_count,
+            stats.db_time_ms,
+            stats.serializer_time_ms,
+            response_size,
+        ]
+
+        slow_ms = getattr(settings, 'REQUEST_LOG_SLOW_MS', 1000)
+        max_queries = getattr(settings, 'REQUEST_LOG_MAX_QUERIES', 50)
+        if duration_ms < slow_ms and stats.query_count <= max_queries:
+            logger.info(message, *args)
+            return
+
+        sql_length = getattr(settings, 'REQUEST_LOG_SQL_LENGTH', 500)
+        for query_ms, sql in stats.slowest_queries:
+            message += '\n  %.2fms %s'
+            args.extend([query_ms, sql[:sql_length]])
+        logger.warning(message, *args)
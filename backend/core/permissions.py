@@ -1,9 +1,18 @@
 """
 Permissions for role-based access control.
 """
-from rest_framework import permissions
+import threading
+import time
+import uuid
 from functools import wraps
 
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import permissions
+
+PERMISSION_MATRIX_VERSION_KEY = 'permission-matrix-version'
+
 
 class IsAdmin(permissions.BasePermission):
     """
@@ -51,6 +60,92 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         return obj.user == request.user or (hasattr(obj, 'owner') and obj.owner == request.user)
 
 
+class PermissionMatrix:
+    """
+    Snapshot of every staff role's (resource, action) grants and of which
+    users are staff, loaded with two queries.
+    """
+
+    def __init__(self, grants, staff):
+        self.grants = grants  # role_id -> frozenset of (resource, action)
+        self.staff = staff  # user_id -> (is_active, role_id)
+
+    @classmethod
+    def load(cls):
+        from apps.users.models import Permission, StaffUser
+
+        grants = {}
+        for role_id, resource, action in Permission.objects.values_list('role_id', 'resource', 'action'):
+            grants.setdefault(role_id, set()).add((resource, action))
+        staff = {
+            user_id: (is_active, role_id)
+            for user_id, is_active, role_id in StaffUser.objects.values_list('user_id', 'is_active', 'role_id')
+        }
+        return cls({role_id: frozenset(pairs) for role_id, pairs in grants.items()}, staff)
+
+    def allows(self, user_id, resource, action):
+        is_active, role_id = self.staff.get(user_id, (False, None))
+        if not is_active or role_id is None:
+            return False
+        return (resource, action) in self.grants.get(role_id, ())
+
+
+_matrix_lock = threading.Lock()
+_matrix = {'version': None, 'matrix': None, 'loaded_at': 0.0}
+
+
+def _matrix_is_fresh(version):
+    max_age = getattr(settings, 'PERMISSION_MATRIX_MAX_AGE', 30)
+    return (
+        _matrix['matrix'] is not None
+        and _matrix['version'] == version
+        and time.monotonic() - _matrix['loaded_at'] < max_age
+    )
+
+
+def get_permission_matrix():
+    """
+    Return this process's PermissionMatrix, reloading it when the version
+    key has moved since it was loaded or the copy is older than
+    PERMISSION_MATRIX_MAX_AGE seconds.
+
+    With a shared cache (CACHE_URL) the version key reaches every process,
+    so changes apply everywhere on the next check. With the per-process
+    default cache only the process that made the change sees the new
+    version; the others pick it up once their copy expires.
+    """
+    version = cache.get(PERMISSION_MATRIX_VERSION_KEY)
+    if version is None:
+        cache.add(PERMISSION_MATRIX_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(PERMISSION_MATRIX_VERSION_KEY)
+    if _matrix_is_fresh(version):
+        return _matrix['matrix']
+    with _matrix_lock:
+        if not _matrix_is_fresh(version):
+            # Read the version before loading, so a change made during the
+            # load leaves this copy stale and it is reloaded next time.
+            _matrix['loaded_at'] = time.monotonic()
+            _matrix['matrix'] = PermissionMatrix.load()
+            _matrix['version'] = version
+        return _matrix['matrix']
+
+
+def invalidate_permission_matrix():
+    """
+    Move the matrix version so processes sharing the cache reload on their
+    next check.
+
+    Bumped straight away, so checks later in the same transaction see the
+    change, and again on commit, so other processes cannot keep a copy
+    loaded before the change was visible to them.
+    """
+    def bump():
+        cache.set(PERMISSION_MATRIX_VERSION_KEY, uuid.uuid4().hex, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
 # Resource-based permission checking utilities
 def has_resource_permission(user, resource, action):
     """
@@ -67,24 +162,14 @@ def has_resource_permission(user, resource, action):
     # Admin has all permissions
     if user.role == 'ADMIN':
         return True
-    
-    # Staff members check their permissions
-    if hasattr(user, 'staff_profile'):
-        staff_profile = user.staff_profile
-        if not staff_profile.is_active:
-            return False
-        
-        if staff_profile.role:
-            # Check if staff has permission
-            from users.models import Permission
-            has_perm = Permission.objects.filter(
-                role=staff_profile.role,
-                resource=resource,
-                action=action
-            ).exists()
-            return has_perm
-    
-    return False
+
+    # Stateless JWT users carry their staff grants in the token.
+    grants = getattr(user, 'token_permissions', None)
+    if grants is not None:
+        return f'{resource}:{action}' in grants
+
+    # Staff members are looked up in the cached matrix, so no queries here.
+    return get_permission_matrix().allows(user.pk, resource, action)
 
 
 def require_resource_permission(resource, action):
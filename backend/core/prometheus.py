@@ -0,0 +1,124 @@
+"""
+Prometheus metrics for the API, Celery tasks and notifications.
+
+Metrics live in the default prometheus_client registry. When
+PROMETHEUS_MULTIPROC_DIR is set (it must be set before the process starts
+and point at an empty, shared directory), every worker process writes its
+samples there and the /metrics view aggregates them, so the numbers are
+correct behind gunicorn or with several Celery workers.
+"""
+import hmac
+import os
+import time
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'lithovolt_http_request_duration_seconds',
+    'HTTP request latency by view and status.',
+    ['view', 'method', 'status'],
+)
+REQUEST_DB_QUERIES = Histogram(
+    'lithovolt_http_request_db_queries',
+    'SQL queries issued per HTTP request.',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+TASK_DURATION = Histogram(
+    'lithovolt_celery_task_duration_seconds',
+    'Celery task run time by task and final state.',
+    ['task', 'state'],
+)
+NOTIFICATIONS_SENT = Counter(
+    'lithovolt_notifications_total',
+    'Notification send outcomes by channel and status.',
+    ['channel', 'status'],
+)
+
+UNRESOLVED_VIEW = '<unresolved>'
+
+# Start times of running tasks. A task whose postrun never fires (worker
+# killed, lost signal) would stay here forever, so the oldest entries are
+# dropped beyond this many.
+MAX_TRACKED_TASKS = 1000
+
+_task_started_at = {}
+
+
+def view_label(request):
+    """Label a request by DRF view class and action, never by raw path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNRESOLVED_VIEW
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name or UNRESOLVED_VIEW
+    actions = getattr(match.func, 'actions', None) or {}
+    action = actions.get(request.method.lower())
+    return f'{view_class.__name__}.{action}' if action else view_class.__name__
+
+
+def observe_request(request, response, duration_ms, query_count):
+    view = view_label(request)
+    REQUEST_LATENCY.labels(view, request.method, str(response.status_code)).observe(duration_ms / 1000)
+    REQUEST_DB_QUERIES.labels(view).observe(query_count)
+
+
+def record_notification_outcome(channel, status):
+    NOTIFICATIONS_SENT.labels(channel, status).inc()
+
+
+def task_prerun_handler(task_id=None, task=None, **kwargs):
+    _task_started_at[task_id] = time.perf_counter()
+    while len(_task_started_at) > MAX_TRACKED_TASKS:
+        _task_started_at.pop(next(iter(_task_started_at)), None)
+
+
+def task_postrun_handler(task_id=None, task=None, state=None, **kwargs):
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is None or task is None:
+        return
+    TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started_at)
+
+
+def connect_celery_signals():
+    from celery.signals import task_postrun, task_prerun
+
+    task_prerun.connect(task_prerun_handler, weak=False, dispatch_uid='prometheus-task-prerun')
+    task_postrun.connect(task_postrun_handler, weak=False, dispatch_uid='prometheus-task-postrun')
+
+
+def _metrics_access_allowed(request):
+    token = getattr(settings, 'PROMETHEUS_METRICS_TOKEN', '')
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    # REMOTE_ADDR only: X-Forwarded-For is set by the client.
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'PROMETHEUS_METRICS_ALLOWED_IPS', ())
+
+
+def metrics_view(request):
+    """Expose metrics in the Prometheus text format.
+
+    Scrapers must either send PROMETHEUS_METRICS_TOKEN as a bearer token or
+    connect from an address in PROMETHEUS_METRICS_ALLOWED_IPS. With neither
+    configured, every request is refused.
+    """
+    if not _metrics_access_allowed(request):
+        return HttpResponseForbidden()
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        output = generate_latest(registry)
+    else:
+        output = generate_latest()
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
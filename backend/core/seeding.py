@@ -0,0 +1,373 @@
+"""
+Production-scale synthetic data for local performance work.
+
+ScaleSeeder fills the database with bulk inserts, one chunk at a time, so
+memory stays bounded by the batch size and not by the volume. Every row
+is derived from (seed, kind, index) and timestamps fall in the `days`
+days before `until` (SEED_UNTIL by default), so the same --seed, --scale
+and --until give the same data on any day and any database, and
+re-running with a larger --scale only adds the rows that are missing.
+"""
+import random
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from core.dashboard import invalidate_admin_metrics
+from core.utils import calculate_warranty_expiry, format_serial_number, generate_serial_suffix
+
+
+SEED_UNTIL = date(2026, 1, 1)
+SERIAL_STATUS_WEIGHTS = {'AVAILABLE': 35, 'ALLOCATED': 35, 'SOLD': 30}
+ORDER_STATUS_WEIGHTS = {'PENDING': 15, 'ACCEPTED': 20, 'REJECTED': 5, 'FULFILLED': 55, 'CANCELLED': 5}
+CLAIM_RATE = 0.03
+NOTIFICATION_FAILURE_RATE = 0.05
+# Walk through the claim workflow; the last status is the claim's current one.
+CLAIM_PATHS = [
+    ['PENDING'],
+    ['PENDING', 'UNDER_REVIEW'],
+    ['PENDING', 'UNDER_REVIEW', 'APPROVED'],
+    ['PENDING', 'UNDER_REVIEW', 'REJECTED'],
+    ['PENDING', 'UNDER_REVIEW', 'APPROVED', 'RESOLVED'],
+]
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let inserts of `model` keep the created_at/updated_at values set on them.
+
+    auto_now and auto_now_add are switched off on the model's fields, which
+    affects the whole process, so keep the block to the insert itself.
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def bulk_create_with_timestamps(model, objs):
+    """bulk_create `objs` with the timestamps set on them in the INSERT itself."""
+    with explicit_timestamps(model):
+        return model.objects.bulk_create(objs)
+
+
+def weighted_choice(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+class ScaleSeeder:
+    """
+    Generate `scale` serials and the users, stock allocations, warranties,
+    claims, orders and notification logs that go with them.
+
+    Volumes are derived from the serial count: one wholesaler per 100
+    serials, one consumer per 20, one battery model per 25,000 (2 to 40).
+    Serials are handed out in lots that share a status and wholesaler, and
+    every lot held by a wholesaler is one stock allocation. Each sold serial
+    has a warranty and a confirmation email in the notification log; a few
+    percent of warranties have a claim with its status history.
+    """
+
+    def __init__(self, scale, seed=0, batch_size=5000, days=365, until=SEED_UNTIL, admin=None, log=None):
+        self.scale = scale
+        self.seed = seed
+        self.days = days
+        self.admin = admin
+        self.log = log or (lambda message: None)
+        self.wholesaler_count = max(2, scale // 100)
+        self.consumer_count = max(5, scale // 20)
+        self.model_count = min(max(2, scale // 25000), 40)
+        self.order_count = self.wholesaler_count * 3
+        self.lot_size = min(max(scale // 1000, 5), 50)
+        # Chunks hold whole lots so a lot is never split across transactions.
+        self.batch_size = max(batch_size // self.lot_size, 1) * self.lot_size
+        self.now = timezone.make_aware(datetime.combine(until, time.min))
+        self.tag = f'seed:{seed}'
+        self.email_domain = f'seed{seed}.lithovolt.test'
+
+    def rng(self, kind, index):
+        return random.Random(f'{self.seed}:{kind}:{index}')
+
+    def random_time(self, rng, after=None):
+        start = after or self.now - timedelta(days=self.days)
+        span = max((self.now - start).total_seconds(), 0)
+        return start + timedelta(seconds=rng.uniform(0, span))
+
+    def chunks(self, start, stop):
+        for first in range(start, stop, self.batch_size):
+            yield first, min(first + self.batch_size, stop)
+
+    def run(self):
+        from apps.inventory.services import rebuild_stock_summaries
+
+        self.wholesaler_ids = self.seed_users('WHOLESALER', self.wholesaler_count, 'Wholesaler@123')
+        self.consumer_ids = self.seed_users('CONSUMER', self.consumer_count, 'Consumer@123')
+        self.consumer_index = {user_id: index for index, user_id in enumerate(self.consumer_ids)}
+        self.battery_models = self.seed_battery_models()
+        self.seed_serials()
+        self.seed_orders()
+
+        rebuild_stock_summaries([model.id for model in self.battery_models])
+        invalidate_admin_metrics()
+        self.log('Stock summaries rebuilt')
+
+    def user_email(self, role, index):
+        return f'{role.lower()}{index}@{self.email_domain}'
+
+    def seed_users(self, role, count, password):
+        from apps.users.models import User, UserProfile
+
+        users = User.objects.filter(role=role, email__endswith=f'@{self.email_domain}')
+        existing = users.count()
+        password_hash = make_password(password)
+        for start, stop in self.chunks(existing, count):
+            batch = []
+            for index in range(start, stop):
+                rng = self.rng(role, index)
+                joined = self.random_time(rng)
+                batch.append(User(
+                    email=self.user_email(role, index),
+                    password=password_hash,
+                    first_name=f'{role.title()}{index}',
+                    last_name=rng.choice(['Smith', 'Nguyen', 'Patel', 'Brown', 'Wilson', 'Taylor']),
+                    phone=f'+614{index:08d}'[:20] if role == 'CONSUMER' else None,
+                    role=role,
+                    is_verified=True,
+                    company_name=f'Battery Traders {index}' if role == 'WHOLESALER' else None,
+                    created_at=joined,
+                    updated_at=joined,
+                ))
+            with transaction.atomic():
+                created = bulk_create_with_timestamps(User, batch)
+                bulk_create_with_timestamps(UserProfile, [
+                    UserProfile(user=user, created_at=user.created_at, updated_at=user.created_at)
+                    for user in created
+                ])
+        ids = list(users.order_by('id').values_list('id', flat=True))
+        self.log(f'{role.title()}s ready: {len(ids)}')
+        return ids
+
+    def seed_battery_models(self):
+        from apps.inventory.models import BatteryModel
+
+        models = []
+        for index in range(self.model_count):
+            rng = self.rng('model', index)
+            capacity = rng.choice([50, 75, 100, 120, 150, 200])
+            voltage = rng.choice([12, 24, 48])
+            model, _ = BatteryModel.objects.get_or_create(
+                sku=f'SEED{self.seed}-{index:03d}',
+                defaults={
+                    'name': f'Lithovolt {voltage}V {capacity}Ah #{index}',
+                    'model_number': f'LV{voltage}-{capacity}-{index}',
+                    'capacity_ah': capacity,
+                    'voltage': voltage,
+                    'warranty_months': rng.choice([12, 18, 24, 36]),
+                    'description': 'Synthetic battery model',
+                    'is_active': True,
+                }
+            )
+            models.append(model)
+        self.log(f'Battery models ready: {len(models)}')
+        return models
+
+    def serial_number(self, index, suffix):
+        from apps.inventory.services import SERIAL_NUMBER_DIGITS
+
+        # Numbered per seed rather than from the shared SerialSequence, so
+        # they neither depend on nor use up the production serial range.
+        return format_serial_number(f'LVS{self.seed}-', index + 1, SERIAL_NUMBER_DIGITS, suffix)
+
+    def seed_serials(self):
+        from apps.inventory.models import SerialNumber
+
+        existing = SerialNumber.objects.filter(battery_model__sku__startswith=f'SEED{self.seed}-').count()
+        for start, stop in self.chunks(existing, self.scale):
+            with transaction.atomic():
+                self.seed_serial_chunk(start, stop)
+            self.log(f'Serials: {stop}/{self.scale}')
+
+    def seed_serial_chunk(self, start, stop):
+        from apps.inventory.models import SerialNumber, StockAllocation
+        from apps.inventory.services import SERIAL_SUFFIX_LENGTH, record_allocation_ranges
+
+        serials, lots = [], {}
+        for index in range(start, stop):
+            lot = index // self.lot_size
+            if lot not in lots:
+                rng = self.rng('lot', lot)
+                status = weighted_choice(rng, SERIAL_STATUS_WEIGHTS)
+                created = self.random_time(rng)
+                lots[lot] = {
+                    'status': status,
+                    'model': self.battery_models[lot % len(self.battery_models)],
+                    'wholesaler_id': None if status == 'AVAILABLE' else rng.choice(self.wholesaler_ids),
+                    'created_at': created,
+                    'allocated_at': None if status == 'AVAILABLE' else self.random_time(rng, after=created),
+                    'serials': [],
+                }
+            info = lots[lot]
+            rng = self.rng('serial', index)
+            sold_at = self.random_time(rng, after=info['allocated_at']) if info['status'] == 'SOLD' else None
+            suffix = generate_serial_suffix(SERIAL_SUFFIX_LENGTH, rng=self.rng('serial-suffix', index))
+            serial = SerialNumber(
+                battery_model=info['model'],
+                serial_number=self.serial_number(index, suffix),
+                status=info['status'],
+                allocated_to_id=info['wholesaler_id'],
+                allocated_at=info['allocated_at'],
+                sold_to_id=rng.choice(self.consumer_ids) if sold_at else None,
+                sold_at=sold_at,
+                created_at=info['created_at'],
+                updated_at=sold_at or info['allocated_at'] or info['created_at'],
+            )
+            serial.seed_index = index
+            serials.append(serial)
+            info['serials'].append(serial)
+
+        bulk_create_with_timestamps(SerialNumber, serials)
+
+        allocations = []
+        for info in lots.values():
+            if info['wholesaler_id'] is None:
+                continue
+            allocation = StockAllocation(
+                battery_model=info['model'],
+                wholesaler_id=info['wholesaler_id'],
+                allocated_by=self.admin,
+                quantity=len(info['serials']),
+                notes=self.tag,
+                created_at=info['allocated_at'],
+                updated_at=info['allocated_at'],
+            )
+            allocations.append((allocation, [serial.id for serial in info['serials']]))
+        bulk_create_with_timestamps(StockAllocation, [allocation for allocation, _ in allocations])
+        record_allocation_ranges(allocations)
+
+        self.seed_warranties([serial for serial in serials if serial.sold_at])
+
+    def seed_warranties(self, sold_serials):
+        from apps.notifications.models import NotificationLog
+        from apps.warranty.models import Warranty
+
+        warranties = []
+        notifications = []
+        for serial in sold_serials:
+            start_date = serial.sold_at
+            end_date = calculate_warranty_expiry(start_date, serial.battery_model.warranty_months)
+            warranty = Warranty(
+                warranty_number=f'WR{self.seed}-{serial.seed_index:010d}',
+                serial_number=serial,
+                consumer_id=serial.sold_to_id,
+                issued_by_id=serial.allocated_to_id,
+                issued_at=start_date,
+                start_date=start_date,
+                end_date=end_date,
+                status=Warranty.Status.EXPIRED if end_date < self.now else Warranty.Status.ACTIVE,
+                notes=self.tag,
+                created_at=start_date,
+                updated_at=start_date,
+            )
+            warranties.append(warranty)
+            rng = self.rng('notification', serial.seed_index)
+            failed = rng.random() < NOTIFICATION_FAILURE_RATE
+            notifications.append(NotificationLog(
+                channel=NotificationLog.Channel.EMAIL,
+                status=NotificationLog.Status.FAILED if failed else NotificationLog.Status.SENT,
+                recipient_email=self.user_email('CONSUMER', self.consumer_index[serial.sold_to_id]),
+                subject='Warranty confirmation',
+                message=f'Your warranty {warranty.warranty_number} is active.',
+                error_message='SMTP timeout' if failed else '',
+                metadata={'seed': self.seed},
+                created_at=start_date,
+                updated_at=start_date,
+            ))
+        bulk_create_with_timestamps(Warranty, warranties)
+        bulk_create_with_timestamps(NotificationLog, notifications)
+        self.seed_claims(warranties)
+
+    def seed_claims(self, warranties):
+        from apps.warranty.models import ClaimStatusHistory, WarrantyClaim
+
+        claims, paths = [], []
+        for warranty in warranties:
+            rng = self.rng('claim', warranty.warranty_number)
+            if rng.random() >= CLAIM_RATE:
+                continue
+            path = rng.choice(CLAIM_PATHS)
+            opened = self.random_time(rng, after=warranty.start_date)
+            closed = path[-1] in ('APPROVED', 'REJECTED', 'RESOLVED')
+            claims.append(WarrantyClaim(
+                warranty=warranty,
+                consumer_id=warranty.consumer_id,
+                description='Battery does not hold charge',
+                status=path[-1],
+                assigned_to=self.admin if len(path) > 1 else None,
+                reviewed_by=self.admin if closed else None,
+                resolution_date=self.now if closed else None,
+                created_at=opened,
+                updated_at=opened,
+            ))
+            paths.append((path, opened))
+        bulk_create_with_timestamps(WarrantyClaim, claims)
+
+        history = []
+        for claim, (path, opened) in zip(claims, paths):
+            for step, (from_status, to_status) in enumerate(zip(path, path[1:]), start=1):
+                changed_at = min(opened + timedelta(days=step), self.now)
+                history.append(ClaimStatusHistory(
+                    claim=claim,
+                    from_status=from_status,
+                    to_status=to_status,
+                    changed_by=self.admin,
+                    created_at=changed_at,
+                    updated_at=changed_at,
+                ))
+        bulk_create_with_timestamps(ClaimStatusHistory, history)
+
+    def seed_orders(self):
+        from apps.orders.models import Order, OrderItem
+
+        existing = Order.objects.filter(notes=self.tag).count()
+        for start, stop in self.chunks(existing, self.order_count):
+            orders, items = [], []
+            for index in range(start, stop):
+                rng = self.rng('order', index)
+                status = weighted_choice(rng, ORDER_STATUS_WEIGHTS)
+                placed = self.random_time(rng)
+                accepted = self.random_time(rng, after=placed) if status in ('ACCEPTED', 'FULFILLED') else None
+                order = Order(
+                    consumer_id=rng.choice(self.wholesaler_ids),
+                    status=status,
+                    notes=self.tag,
+                    accepted_at=accepted,
+                    fulfilled_at=self.random_time(rng, after=accepted) if status == 'FULFILLED' else None,
+                    created_at=placed,
+                    updated_at=placed,
+                )
+                orders.append(order)
+                for model in rng.sample(self.battery_models, rng.randint(1, min(3, len(self.battery_models)))):
+                    items.append(OrderItem(
+                        order=order,
+                        product_type=OrderItem.ProductType.BATTERY_MODEL,
+                        battery_model=model,
+                        quantity=rng.choice([5, 10, 20, 50]),
+                        created_at=placed,
+                        updated_at=placed,
+                    ))
+            with transaction.atomic():
+                bulk_create_with_timestamps(Order, orders)
+                bulk_create_with_timestamps(OrderItem, items)
+        self.log(f'Orders ready: {max(existing, self.order_count)}')
@@ -0,0 +1,46 @@
+"""
+Signals that keep cached dashboard metrics and the permission matrix in
+step with the data.
+"""
+from django.db.models.signals import post_delete, post_save
+
+from apps.users.models import Permission, Role, StaffUser, User
+from apps.inventory.models import BatteryModel
+from apps.orders.models import Order
+from apps.warranty.models import Warranty
+from core.dashboard import invalidate_admin_metrics
+from core.permissions import invalidate_permission_matrix
+
+# Serial counts come from StockSummary, which inventory.services updates
+# in bulk; it invalidates the metrics itself. Users are saved on every
+# login and notification logs on every send, so those counts are left to
+# ADMIN_METRICS_CACHE_SECONDS and the refresh task, except that new and
+# deleted users drop the cache.
+ADMIN_METRICS_MODELS = (BatteryModel, Order, Warranty)
+
+
+def _invalidate_admin_metrics(sender, **kwargs):
+    invalidate_admin_metrics()
+
+
+def _invalidate_admin_metrics_for_new_user(sender, created=False, **kwargs):
+    if created:
+        invalidate_admin_metrics()
+
+
+for model in ADMIN_METRICS_MODELS:
+    post_save.connect(_invalidate_admin_metrics, sender=model, dispatch_uid=f'admin-metrics-save-{model.__name__}')
+    post_delete.connect(_invalidate_admin_metrics, sender=model, dispatch_uid=f'admin-metrics-delete-{model.__name__}')
+post_save.connect(_invalidate_admin_metrics_for_new_user, sender=User, dispatch_uid='admin-metrics-save-User')
+post_delete.connect(_invalidate_admin_metrics, sender=User, dispatch_uid='admin-metrics-delete-User')
+
+PERMISSION_MATRIX_MODELS = (Role, Permission, StaffUser)
+
+
+def _invalidate_permission_matrix(sender, **kwargs):
+    invalidate_permission_matrix()
+
+
+for model in PERMISSION_MATRIX_MODELS:
+    post_save.connect(_invalidate_permission_matrix, sender=model, dispatch_uid=f'permission-matrix-save-{model.__name__}')
+    post_delete.connect(_invalidate_permission_matrix, sender=model, dispatch_uid=f'permission-matrix-delete-{model.__name__}')
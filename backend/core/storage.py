@@ -0,0 +1,43 @@
+"""
+Storage for files that must only be served through authenticated views.
+
+Exports hold consumer emails and phone numbers, so they never go to the
+public media storage: locally they live under PRIVATE_MEDIA_ROOT, which
+is not served as media, and on S3 they are written with a private ACL
+under their own prefix.
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+
+class PrivateFileSystemStorage(FileSystemStorage):
+    """FileSystemStorage rooted at PRIVATE_MEDIA_ROOT, with no public URL."""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(self._location, settings.PRIVATE_MEDIA_ROOT)
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'PRIVATE_MEDIA_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+    def url(self, name):
+        raise NotImplementedError('Private files are only served through authenticated views.')
+
+
+def private_storage():
+    """Storage for private files, chosen once when the models load."""
+    if getattr(settings, 'USE_S3', False):
+        from storages.backends.s3boto3 import S3Boto3Storage
+
+        return S3Boto3Storage(
+            location='private',
+            default_acl='private',
+            querystring_auth=True,
+            querystring_expire=300,
+            custom_domain=None,
+        )
+    return PrivateFileSystemStorage()
@@ -0,0 +1,9 @@
+"""Celery tasks for core features."""
+from celery import shared_task
+
+
+@shared_task
+def refresh_admin_metrics_task():
+    from core.dashboard import refresh_admin_metrics
+
+    return refresh_admin_metrics()['generated_at']
@@ -1,8 +1,12 @@
 """
 Utility functions for the project.
 """
+import csv
+import json
 import random
 import string
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 
 
@@ -19,6 +23,23 @@ def generate_serial_number(prefix='LV', length=10):
     return f'{prefix}{random_part}'
 
 
+# No 0/O or 1/I, so serials read off a label are not mistyped.
+SERIAL_SUFFIX_ALPHABET = '23456789ABCDEFGHJKLMNPQRSTUVWXYZ'
+
+_system_random = random.SystemRandom()
+
+
+def generate_serial_suffix(length=6, rng=None):
+    """Random suffix that keeps sequence-based serial numbers from being guessed."""
+    rng = rng or _system_random
+    return ''.join(rng.choice(SERIAL_SUFFIX_ALPHABET) for _ in range(length))
+
+
+def format_serial_number(prefix, sequence_value, length=10, suffix=''):
+    """Format a sequence value as a zero-padded serial number, followed by `suffix`."""
+    return f'{prefix}{sequence_value:0{length}d}{suffix}'
+
+
 def generate_warranty_number(prefix='WR', length=12):
     """Generate a unique warranty number."""
     random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=length))
@@ -43,3 +64,39 @@ def format_phone_number(phone):
         phone = f'+{phone}'
     
     return phone
+
+
+class _EchoBuffer:
+    """File-like object whose write() hands the value straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """Yield CSV-encoded lines for a header and an iterable of rows."""
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def streaming_csv_response(header, rows, filename):
+    """Stream rows as a CSV attachment without building it in memory."""
+    response = StreamingHttpResponse(iter_csv(header, rows), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def iter_json_results(results, **fields):
+    """Yield a JSON object holding `fields` and a "results" array, one result at a time."""
+    head = json.dumps(fields, cls=DjangoJSONEncoder)[:-1]
+    yield head + (', ' if fields else '') + '"results": ['
+    for index, result in enumerate(results):
+        yield (', ' if index else '') + json.dumps(result, cls=DjangoJSONEncoder)
+    yield ']}'
+
+
+def streaming_json_response(results, **fields):
+    """Stream a {**fields, "results": [...]} JSON body without building it in memory."""
+    return StreamingHttpResponse(iter_json_results(results, **fields), content_type='application/json')
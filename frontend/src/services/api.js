@@ -111,7 +111,8 @@ export const authAPI = {
   passwordResetRequest: (data) => api.post('/auth/password-reset', data),
   passwordResetConfirm: (data) => api.post('/auth/password-reset/confirm', data),
   refreshToken: (refresh) => api.post('/auth/refresh', { refresh }),
-  logout: () => api.post('/auth/logout'),
+  logout: (refresh) => api.post('/auth/logout', { refresh }),
+  logoutAll: () => api.post('/auth/logout/all'),
 }
 
 // User API